@@ -0,0 +1,367 @@
+import argparse
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from Indicators import add_indicators
+
+# Tunable constants of the MCDM strategy; the defaults are the values the bot always used
+DEFAULT_PARAMS = {
+    # Score weights (trend, momentum, MACD, price action) and the signal threshold
+    'ema_cross_weight': 0.4,
+    'rsi_weight': 0.3,
+    'macd_weight': 0.2,
+    'price_weight': 0.1,
+    'signal_threshold': 60,
+    # RSI thresholds widen by ATR / close * rsi_atr_scale
+    'rsi_buy_base': 40,
+    'rsi_sell_base': 60,
+    'rsi_atr_scale': 1000,
+    # Stop loss / take profit levels in multiples of ATR
+    'base_sl_atr': 1.5,
+    'high_volatility': 0.005,
+    'sl_mult_high_vol': 1.2,
+    'sl_mult_low_vol': 1.8,
+    'strong_trend': 0.7,
+    'moderate_trend': 0.3,
+    'tp_mult_strong': 2.5,
+    'tp_mult_moderate': 2.0,
+    'tp_mult_weak': 1.5,
+    'sr_buffer_atr': 0.2,
+}
+
+
+def strategy_params(params: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """DEFAULT_PARAMS with the given overrides applied."""
+    if not params:
+        return DEFAULT_PARAMS
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+    return {**DEFAULT_PARAMS, **params}
+
+
+def load_bars(path: str) -> pd.DataFrame:
+    """Load historical OHLC bars from a CSV or Parquet file."""
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    df.columns = [c.strip().lower() for c in df.columns]
+    missing = {'time', 'open', 'high', 'low', 'close'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing columns in {path}: {sorted(missing)}")
+
+    # MT5 exports epoch seconds, other sources usually ISO timestamps
+    if np.issubdtype(df['time'].dtype, np.number):
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+    else:
+        df['time'] = pd.to_datetime(df['time'])
+    return df.sort_values('time').reset_index(drop=True)
+
+
+def prepare_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Calculate indicators once and return the float64 arrays the scoring rules need,
+    including the look-back values analyze_signal reads through df.iloc.
+    """
+    if 'ATR' not in df.columns:
+        df = add_indicators(df.copy())
+    df = df.dropna(subset=['EMA50', 'EMA100', 'RSI', 'MACD_12_26_9', 'MACDs_12_26_9', 'ATR'])
+    df = df.reset_index(drop=True)
+
+    arrays = {name: df[column].to_numpy(dtype=np.float64) for name, column in [
+        ('open', 'open'), ('high', 'high'), ('low', 'low'), ('close', 'close'),
+        ('ema50', 'EMA50'), ('ema100', 'EMA100'), ('rsi', 'RSI'),
+        ('macd', 'MACD_12_26_9'), ('macd_signal', 'MACDs_12_26_9'), ('atr', 'ATR'),
+    ]}
+    # Epoch seconds stay exact in float64
+    arrays['time'] = df['time'].to_numpy(dtype='datetime64[s]').astype(np.int64).astype(np.float64)
+
+    # df.iloc[-2] in analyze_signal
+    for name in ('ema50', 'ema100', 'macd', 'macd_signal'):
+        arrays[f'prev_{name}'] = _shift(arrays[name], 1)
+
+    # df.iloc[-5] in calculate_trend_strength and rolling(20) in calculate_optimal_levels
+    arrays['ema50_back4'] = _shift(arrays['ema50'], 4)
+    bullish = (arrays['close'] > arrays['open']).astype(np.float64)
+    arrays['bull_count5'] = pd.Series(bullish).rolling(5).sum().to_numpy()
+    arrays['lows20'] = pd.Series(arrays['low']).rolling(20).min().to_numpy()
+    arrays['highs20'] = pd.Series(arrays['high']).rolling(20).max().to_numpy()
+    return arrays
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.empty_like(values)
+    shifted[:periods] = np.nan
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def score_arrays(a: Dict[str, np.ndarray],
+                 params: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized GoldTradingBot.calculate_scores for every bar."""
+    p = strategy_params(params)
+    close, atr, rsi = a['close'], a['atr'], a['rsi']
+    buy_score = np.zeros_like(close)
+    sell_score = np.zeros_like(close)
+
+    # 1. Trend Strength (40% weight) - same if/elif precedence as the live bot
+    ema_cross_weight = p['ema_cross_weight']
+    bull_cross = (a['ema50'] > a['ema100']) & (a['prev_ema50'] <= a['prev_ema100'])
+    bear_cross = ~bull_cross & (a['ema50'] < a['ema100']) & (a['prev_ema50'] >= a['prev_ema100'])
+    bull_trend = ~bull_cross & ~bear_cross & (a['ema50'] > a['ema100'])
+    bear_trend = ~bull_cross & ~bear_cross & (a['ema50'] < a['ema100'])
+    buy_score += np.where(bull_cross, 40 * ema_cross_weight, np.where(bull_trend, 20 * ema_cross_weight, 0))
+    sell_score += np.where(bear_cross, 40 * ema_cross_weight, np.where(bear_trend, 20 * ema_cross_weight, 0))
+
+    # 2. Momentum (30% weight)
+    rsi_weight = p['rsi_weight']
+    rsi_buy_threshold = p['rsi_buy_base'] - (atr / close * p['rsi_atr_scale'])
+    rsi_sell_threshold = p['rsi_sell_base'] + (atr / close * p['rsi_atr_scale'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buy_score += np.where((rsi > rsi_buy_threshold) & (rsi < 70),
+                              (rsi - rsi_buy_threshold) / (70 - rsi_buy_threshold) * 30 * rsi_weight, 0)
+        sell_score += np.where((rsi < rsi_sell_threshold) & (rsi > 30),
+                               (rsi_sell_threshold - rsi) / (rsi_sell_threshold - 30) * 30 * rsi_weight, 0)
+
+    # 3. MACD Confirmation (20% weight)
+    macd_weight = p['macd_weight']
+    macd, signal = a['macd'], a['macd_signal']
+    macd_buy_signal = (macd > signal) & (a['prev_macd'] <= a['prev_macd_signal']) & (macd > 0)
+    macd_sell_signal = (macd < signal) & (a['prev_macd'] >= a['prev_macd_signal']) & (macd < 0)
+    buy_score += np.where(macd_buy_signal, 20 * macd_weight, 0)
+    sell_score += np.where(macd_sell_signal, 20 * macd_weight, 0)
+
+    # 4. Price Action (10% weight)
+    price_weight = p['price_weight']
+    open_ = a['open']
+    bullish_candle = (close > open_) & ((close - open_) > (0.5 * atr))
+    bearish_candle = ~bullish_candle & (close < open_) & ((open_ - close) > (0.5 * atr))
+    buy_score += np.where(bullish_candle, 10 * price_weight, 0)
+    sell_score += np.where(bearish_candle, 10 * price_weight, 0)
+
+    return buy_score, sell_score
+
+
+def trend_strength_arrays(a: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized GoldTradingBot.calculate_trend_strength for every bar."""
+    close, ema50 = a['close'], a['ema50']
+    ema_slope = (ema50 - a['ema50_back4']) / 5
+    price_distance = np.abs(close - ema50) / ema50
+    # Each of the last 5 candles counts +1/-1 against the slope, so |sum| = |2 * bullish - 5|
+    trend_candles = np.abs(2 * a['bull_count5'] - 5)
+
+    trend_strength = (
+        0.4 * np.minimum(np.abs(ema_slope) / (close * 0.01), 1) +
+        0.3 * np.minimum(price_distance / 0.02, 1) +
+        0.3 * np.minimum(trend_candles / 5, 1)
+    )
+    return np.minimum(trend_strength, 1)
+
+
+def levels_arrays(a: Dict[str, np.ndarray], params: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+    """Vectorized GoldTradingBot.calculate_optimal_levels for BUY and SELL on every bar."""
+    p = strategy_params(params)
+    atr, close = a['atr'], a['close']
+    volatility_factor = atr / close
+    recent_trend_strength = trend_strength_arrays(a)
+
+    base_sl_distance = atr * p['base_sl_atr']
+    sl_multiplier = np.where(volatility_factor > p['high_volatility'], p['sl_mult_high_vol'], p['sl_mult_low_vol'])
+    tp_multiplier = np.where(recent_trend_strength > p['strong_trend'], p['tp_mult_strong'],
+                             np.where(recent_trend_strength > p['moderate_trend'], p['tp_mult_moderate'],
+                                      p['tp_mult_weak']))
+    recent_lows, recent_highs = a['lows20'], a['highs20']
+    buffer = p['sr_buffer_atr'] * atr
+
+    buy_sl = close - (base_sl_distance * sl_multiplier)
+    buy_tp = close + (base_sl_distance * tp_multiplier)
+    buy_sl = np.where(buy_sl < recent_lows, recent_lows - buffer, buy_sl)
+    buy_tp = np.where(buy_tp > recent_highs, recent_highs + buffer, buy_tp)
+
+    sell_sl = close + (base_sl_distance * sl_multiplier)
+    sell_tp = close - (base_sl_distance * tp_multiplier)
+    sell_sl = np.where(sell_sl > recent_highs, recent_highs + buffer, sell_sl)
+    sell_tp = np.where(sell_tp < recent_lows, recent_lows - buffer, sell_tp)
+
+    return {'buy_sl': buy_sl, 'buy_tp': buy_tp, 'sell_sl': sell_sl, 'sell_tp': sell_tp}
+
+
+def generate_signals(a: Dict[str, np.ndarray], params: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+    """Scores, signal (1 BUY, -1 SELL, 0 HOLD) and SL/TP levels for every bar."""
+    p = strategy_params(params)
+    buy_score, sell_score = score_arrays(a, p)
+    signal_threshold = p['signal_threshold']
+    buy = (buy_score >= signal_threshold) & (buy_score > sell_score)
+    sell = ~buy & (sell_score >= signal_threshold) & (sell_score > buy_score)
+    # analyze_signal needs a previous bar
+    buy[0] = sell[0] = False
+
+    levels = levels_arrays(a, p)
+    signal = np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    return {
+        'buy_score': buy_score,
+        'sell_score': sell_score,
+        'signal': signal,
+        'sl': np.where(buy, levels['buy_sl'], np.where(sell, levels['sell_sl'], 0.)),
+        'tp': np.where(buy, levels['buy_tp'], np.where(sell, levels['sell_tp'], 0.)),
+    }
+
+
+def _first_exits(a: Dict[str, np.ndarray], entries: np.ndarray, is_buy: np.ndarray, sl: np.ndarray,
+                 tp: np.ndarray, block: int = 16, chunk: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the first bar after each entry whose range touches SL or TP.
+    Scans forward in blocks of bars for all pending entries at once.
+    If both levels sit inside the same bar the stop loss is assumed to fill first.
+    Returns exit bar indices (-1 when still open) and a hit flag (True = take profit).
+    """
+    high, low = a['high'], a['low']
+    n = len(high)
+    exit_idx = np.full(len(entries), -1, dtype=np.int64)
+    hit_tp = np.zeros(len(entries), dtype=bool)
+
+    for start in range(0, len(entries), chunk):
+        pending = np.arange(start, min(start + chunk, len(entries)))
+        offset, width = 1, block
+        while pending.size:
+            cols = entries[pending, None] + offset + np.arange(width)[None, :]
+            in_range = cols < n
+            cols = np.minimum(cols, n - 1)
+            bar_high, bar_low = high[cols], low[cols]
+            buy = is_buy[pending, None]
+            sl_hit = np.where(buy, bar_low <= sl[pending, None], bar_high >= sl[pending, None]) & in_range
+            tp_hit = np.where(buy, bar_high >= tp[pending, None], bar_low <= tp[pending, None]) & in_range
+            any_hit = sl_hit | tp_hit
+
+            found = any_hit.any(axis=1)
+            first = any_hit.argmax(axis=1)
+            rows = pending[found]
+            exit_idx[rows] = entries[rows] + offset + first[found]
+            hit_tp[rows] = ~sl_hit[found, first[found]]
+
+            offset += width
+            width *= 2
+            pending = pending[~found & (entries[pending] + offset < n)]
+    return exit_idx, hit_tp
+
+
+def simulate_trades(a: Dict[str, np.ndarray], signals: Dict[str, np.ndarray],
+                    risk_per_trade: float = 10.0, one_position: bool = True) -> pd.DataFrame:
+    """
+    Simulate the fixed-risk trades execute_simulated_trade would open on each signal.
+    Entries fill at the signal bar close; exits fill at the SL/TP level.
+    With one_position, new signals are ignored until the open trade closes, as in run_bot_loop.
+    """
+    close = a['close']
+    signal, sl, tp = signals['signal'], signals['sl'], signals['tp']
+    entries = np.flatnonzero(signal)
+    is_buy = signal[entries] == 1
+    price = close[entries]
+    risk_per_unit = np.where(is_buy, price - sl[entries], sl[entries] - price)
+
+    # Invalid stop loss - trade not executed
+    valid = risk_per_unit > 0
+    entries, is_buy, price, risk_per_unit = entries[valid], is_buy[valid], price[valid], risk_per_unit[valid]
+    exit_idx, hit_tp = _first_exits(a, entries, is_buy, sl[entries], tp[entries])
+
+    if one_position and len(entries):
+        # Same iteration that closes a position may open the next one
+        next_k = np.maximum(np.searchsorted(entries, exit_idx, side='left'), np.arange(1, len(entries) + 1))
+        next_k[exit_idx < 0] = len(entries)
+        next_k = next_k.tolist()
+        taken = []
+        k = 0
+        while k < len(entries):
+            taken.append(k)
+            k = next_k[k]
+        taken = np.array(taken, dtype=np.int64)
+        entries, is_buy, price, risk_per_unit = entries[taken], is_buy[taken], price[taken], risk_per_unit[taken]
+        exit_idx, hit_tp = exit_idx[taken], hit_tp[taken]
+
+    units = risk_per_trade / risk_per_unit
+    closed = exit_idx >= 0
+    exit_price = np.where(hit_tp, tp[entries], sl[entries])
+    exit_price = np.where(closed, exit_price, close[-1] if len(close) else np.nan)
+    profit = np.where(is_buy, exit_price - price, price - exit_price) * units
+
+    return pd.DataFrame({
+        'entry_index': entries,
+        'exit_index': exit_idx,
+        'type': np.where(is_buy, 'BUY', 'SELL'),
+        'entry_price': price,
+        'sl': sl[entries],
+        'tp': tp[entries],
+        'units': units,
+        'exit_price': exit_price,
+        'profit': profit,
+        'result': np.where(~closed, 'open', np.where(profit > 0, 'win', 'loss')),
+    })
+
+
+def summarize(trades: pd.DataFrame, starting_balance: float = 10000.0) -> Dict[str, float]:
+    """Aggregate statistics for a trades table."""
+    closed = trades[trades['result'] != 'open']
+    profit = closed['profit'].to_numpy()
+    wins = int((profit > 0).sum())
+    losses = len(profit) - wins
+    gross_profit = profit[profit > 0].sum()
+    gross_loss = -profit[profit <= 0].sum()
+    balance = starting_balance + np.cumsum(profit)
+    peak = np.maximum.accumulate(np.concatenate([[starting_balance], balance]))
+    drawdown = (peak[1:] - balance).max() if len(balance) else 0.0
+    return {
+        'trades': len(profit),
+        'wins': wins,
+        'losses': losses,
+        'win_rate': 100 * wins / len(profit) if len(profit) else 0.0,
+        'net_profit': float(profit.sum()),
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else np.inf,
+        'max_drawdown': float(drawdown),
+        'final_balance': float(balance[-1]) if len(balance) else starting_balance,
+    }
+
+
+def run_backtest(bars, risk_per_trade: float = 10.0, one_position: bool = True,
+                 params: Optional[Dict[str, float]] = None) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float]]:
+    """
+    Backtest the live MCDM strategy over historical bars (a DataFrame or a CSV/Parquet path).
+    Returns the scored bars, the trades table and summary statistics.
+    """
+    df = load_bars(bars) if isinstance(bars, str) else bars
+    a = prepare_arrays(df)
+    signals = generate_signals(a, params)
+    trades = simulate_trades(a, signals, risk_per_trade, one_position)
+
+    scored = pd.DataFrame({
+        'time': pd.to_datetime(a['time'].astype(np.int64), unit='s'),
+        'close': a['close'],
+        'buy_score': signals['buy_score'],
+        'sell_score': signals['sell_score'],
+        'signal': pd.Series(signals['signal']).map({1: 'BUY', -1: 'SELL', 0: 'HOLD'}),
+        'sl': signals['sl'],
+        'tp': signals['tp'],
+    })
+    trades.insert(0, 'entry_time', scored['time'].to_numpy()[trades['entry_index']])
+    return scored, trades, summarize(trades)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest the Gold Trading Bot strategy on historical bars.")
+    parser.add_argument("bars", help="CSV or Parquet file with time, open, high, low, close columns")
+    parser.add_argument("--risk", type=float, default=10.0, help="Risk per trade in dollars")
+    parser.add_argument("--trades-out", help="Optional CSV path for the trades table")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scored, trades, stats = run_backtest(args.bars, risk_per_trade=args.risk)
+    elapsed = time.perf_counter() - started
+
+    print(f"Backtested {len(scored)} bars in {elapsed:.2f}s")
+    for key, value in stats.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    if args.trades_out:
+        trades.to_csv(args.trades_out, index=False)
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def save_cookies(driver, path: str) -> None:
+    """Write the driver's cookies for the current site to a JSON file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(driver.get_cookies(), file)
+
+
+def load_cookies(driver, path: str, url: str) -> bool:
+    """Open url and add the saved cookies to it. Returns False if there are none."""
+    if not os.path.exists(path):
+        return False
+    with open(path, "r") as file:
+        cookies = json.load(file)
+    driver.get(url)  # cookies can only be set for the page's domain
+    for cookie in cookies:
+        if 'expiry' in cookie:
+            cookie['expiry'] = int(cookie['expiry'])
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            pass  # cookie for another domain or already expired
+    driver.refresh()
+    return True
+
+
+class PooledDriver:
+    """A pooled WebDriver session and its usage counters."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Warm, logged-in WebDriver sessions shared by scrape jobs.
+    Sessions are created on demand up to size and handed back after each job, so
+    back-to-back jobs skip browser startup and login. The login cookies are saved
+    to cookies_path and restored into new sessions, so even a fresh browser only
+    logs in again once the saved session has expired. Sessions that fail a health
+    check, raised during a job, or reached max_uses / max_age seconds are recycled.
+    """
+
+    def __init__(self, create: Callable, login: Callable, is_logged_in: Callable, home_url: str,
+                 size: int = 2, max_uses: int = 50, max_age: float = 1800.0, cookies_path: Optional[str] = None):
+        self.create = create
+        self.login = login
+        self.is_logged_in = is_logged_in
+        self.home_url = home_url
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.cookies_path = cookies_path
+        self._idle: List[PooledDriver] = []
+        self._count = 0  # sessions alive, idle or in use
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _healthy(self, entry: PooledDriver) -> bool:
+        if entry.uses >= self.max_uses or time.monotonic() - entry.created > self.max_age:
+            return False
+        try:
+            entry.driver.current_url  # round trip to the browser
+            return True
+        except Exception:
+            return False
+
+    def _start(self) -> PooledDriver:
+        driver = self.create()
+        try:
+            restored = self.cookies_path and load_cookies(driver, self.cookies_path, self.home_url)
+            if not (restored and self.is_logged_in(driver)):
+                self.login(driver)
+                if self.cookies_path:
+                    save_cookies(driver, self.cookies_path)
+        except Exception:
+            driver.quit()
+            raise
+        return PooledDriver(driver)
+
+    def _discard(self, entry: PooledDriver) -> None:
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        with self._condition:
+            self._count -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Take a healthy idle session, or start one if the pool has room. Blocks while all are busy."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    if self._count < self.size:
+                        self._count += 1
+                    else:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("No browser session became available")
+                        self._condition.wait(remaining)
+                        continue
+            if entry is not None:
+                # Health checks talk to the browser, so they run outside the lock
+                if self._healthy(entry):
+                    entry.uses += 1
+                    return entry
+                self._discard(entry)
+                continue
+            try:
+                entry = self._start()
+            except Exception:
+                with self._condition:
+                    self._count -= 1
+                    self._condition.notify()
+                raise
+            entry.uses += 1
+            return entry
+
+    def release(self, entry: PooledDriver, broken: bool = False) -> None:
+        if broken or self._closed:
+            self._discard(entry)
+            return
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Logged-in driver for one job; it goes back to the pool afterwards."""
+        entry = self.acquire(timeout)
+        try:
+            yield entry.driver
+        except BaseException:
+            self.release(entry, broken=True)
+            raise
+        else:
+            if self.cookies_path:
+                try:
+                    save_cookies(entry.driver, self.cookies_path)  # keep refreshed session cookies
+                except Exception:
+                    pass
+            self.release(entry)
+
+    def close(self) -> None:
+        """Quit every idle session; busy ones are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._discard(entry)
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per domain, shared by every browser session: up to burst requests
+    back to back, refilled at rate requests per second. waited is the total time
+    callers have spent waiting for a slot.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 3):
+        self.rate = rate
+        self.burst = burst
+        self.waited = 0.0
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # domain -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot for url's domain. Returns the seconds waited."""
+        domain = urlparse(url).netloc or url
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(domain, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[domain] = (tokens - 1, now)
+                    self.waited += waited
+                    return waited
+                self._buckets[domain] = (tokens, now)
+                delay = (1 - tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.gridspec import GridSpec
+
+BAR_WIDTH = 0.0005  # MACD histogram bar width in days, as before
+
+
+class ChartRenderer:
+    """
+    Price/RSI/MACD chart that is built once and then only has its data swapped.
+    Every data artist is animated: a full draw renders the static layers (axes,
+    grid, guide lines, legends) and caches them as a background, and each update
+    restores that background and blits the lines, histogram and signal markers.
+    Layout and a full draw only happen when new data leaves the current axis
+    limits, which are set with headroom so that is rare.
+    """
+
+    def __init__(self, fig, canvas, symbol: str, headroom: float = 0.1):
+        self.fig = fig
+        self.canvas = canvas
+        self.headroom = headroom
+        self._background = None
+        self._limits = None  # (xmin, xmax, price_min, price_max, macd_min, macd_max)
+
+        gs = GridSpec(3, 1, height_ratios=[2, 1, 1], figure=fig)
+
+        # Price chart
+        self.ax_price = fig.add_subplot(gs[0])
+        self.ax_price.set_title(f"{symbol} Price and Moving Averages (Last 24 Hours)")
+        self.price_line, = self.ax_price.plot([], [], label='Price', color='yellow', animated=True)
+        self.ema50_line, = self.ax_price.plot([], [], label='EMA50', color='cyan', animated=True)
+        self.ema100_line, = self.ax_price.plot([], [], label='EMA100', color='magenta', animated=True)
+        self.buy_signals = self.ax_price.scatter([], [], color='green', marker='^', s=100, label='Buy Signal',
+                                                 animated=True)
+        self.sell_signals = self.ax_price.scatter([], [], color='red', marker='v', s=100, label='Sell Signal',
+                                                  animated=True)
+        self.ax_price.legend(loc='upper left')
+        self.ax_price.grid(True, alpha=0.3)
+
+        # RSI chart
+        self.ax_rsi = fig.add_subplot(gs[1], sharex=self.ax_price)
+        self.ax_rsi.set_title("RSI (14)")
+        self.rsi_line, = self.ax_rsi.plot([], [], label='RSI', color='white', animated=True)
+        self.ax_rsi.axhline(70, color='red', linestyle='--', alpha=0.5)
+        self.ax_rsi.axhline(30, color='green', linestyle='--', alpha=0.5)
+        self.ax_rsi.axhline(50, color='gray', linestyle='--', alpha=0.3)
+        self.ax_rsi.set_ylim(0, 100)
+        self.ax_rsi.grid(True, alpha=0.3)
+
+        # MACD chart
+        self.ax_macd = fig.add_subplot(gs[2], sharex=self.ax_price)
+        self.ax_macd.set_title("MACD (12,26,9)")
+        self.macd_line, = self.ax_macd.plot([], [], label='MACD', color='white', animated=True)
+        self.signal_line, = self.ax_macd.plot([], [], label='Signal', color='orange', animated=True)
+        self.macd_hist = PolyCollection([], alpha=0.5, animated=True)
+        self.ax_macd.add_collection(self.macd_hist)
+        self.ax_macd.axhline(0, color='gray', linestyle='--', alpha=0.3)
+        self.ax_macd.legend(loc='upper left')
+        self.ax_macd.grid(True, alpha=0.3)
+
+        for ax in (self.ax_price, self.ax_rsi, self.ax_macd):
+            ax.xaxis_date()
+            ax.tick_params(axis='x', labelrotation=45)
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
+
+        self.artists = [self.price_line, self.ema50_line, self.ema100_line, self.buy_signals, self.sell_signals,
+                        self.rsi_line, self.macd_hist, self.macd_line, self.signal_line]
+        self._colors = {True: to_rgba('green', 0.5), False: to_rgba('red', 0.5)}
+        # Any full draw (first show, window resize, relayout) refreshes the cached background
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self) -> None:
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+
+    def _padded(self, low: float, high: float) -> tuple:
+        pad = (high - low) * self.headroom or abs(high) * 0.001 or 1.0
+        return low - pad, high + pad
+
+    def _needs_relayout(self, x: np.ndarray, price: np.ndarray, macd: np.ndarray) -> bool:
+        if self._limits is None:
+            return True
+        xmin, xmax, pmin, pmax, mmin, mmax = self._limits
+        return (x[-1] > xmax or x[0] < xmin or price.min() < pmin or price.max() > pmax
+                or macd.min() < mmin or macd.max() > mmax)
+
+    def _relayout(self, x: np.ndarray, price: np.ndarray, macd: np.ndarray) -> None:
+        span = max(x[-1] - x[0], BAR_WIDTH)
+        xmin, xmax = x[0] - BAR_WIDTH, x[-1] + span * self.headroom
+        pmin, pmax = self._padded(price.min(), price.max())
+        mmin, mmax = self._padded(macd.min(), macd.max())
+        self.ax_price.set_xlim(xmin, xmax)
+        self.ax_price.set_ylim(pmin, pmax)
+        self.ax_macd.set_ylim(mmin, mmax)
+        self._limits = (xmin, xmax, pmin, pmax, mmin, mmax)
+        self.fig.tight_layout()
+
+    def update(self, df: pd.DataFrame, signals: Dict[str, np.ndarray], now: Optional[datetime] = None) -> bool:
+        """
+        Show the last 24 hours of df plus the given signal history columns.
+        Returns True if the update needed a full redraw, False if it was blitted.
+        """
+        now = now or datetime.now()
+        df_filtered = df[df['time'] >= now - timedelta(hours=24)]
+        if df_filtered.empty:
+            df_filtered = df  # fallback to full data if filtered empty
+        if df_filtered.empty:
+            return False
+
+        x = mdates.date2num(df_filtered['time'].to_numpy(dtype='datetime64[us]'))
+        close = df_filtered['close'].to_numpy(dtype=np.float64)
+        ema50 = df_filtered['EMA50'].to_numpy(dtype=np.float64)
+        ema100 = df_filtered['EMA100'].to_numpy(dtype=np.float64)
+        macd = df_filtered['MACD_12_26_9'].to_numpy(dtype=np.float64)
+        macd_signal = df_filtered['MACDs_12_26_9'].to_numpy(dtype=np.float64)
+        hist = df_filtered['MACDh_12_26_9'].to_numpy(dtype=np.float64)
+
+        self.price_line.set_data(x, close)
+        self.ema50_line.set_data(x, ema50)
+        self.ema100_line.set_data(x, ema100)
+        self.rsi_line.set_data(x, df_filtered['RSI'].to_numpy(dtype=np.float64))
+        self.macd_line.set_data(x, macd)
+        self.signal_line.set_data(x, macd_signal)
+
+        # Histogram bars as rectangles (n, 4, 2) built in one go
+        left, right = x - BAR_WIDTH / 2, x + BAR_WIDTH / 2
+        zeros = np.zeros_like(hist)
+        verts = np.stack([np.column_stack([left, zeros]), np.column_stack([left, hist]),
+                          np.column_stack([right, hist]), np.column_stack([right, zeros])], axis=1)
+        self.macd_hist.set_verts(verts)
+        self.macd_hist.set_facecolors(np.where((hist > 0)[:, None], self._colors[True], self._colors[False]))
+
+        # Signal markers that fall in the displayed window
+        in_window = signals['time'] >= df_filtered['time'].iloc[0].to_datetime64()
+        signal_x = mdates.date2num(signals['time'][in_window]) if in_window.any() else np.empty(0)
+        signal_price = signals['price'][in_window]
+        kind = signals['signal'][in_window]
+        for scatter, name in ((self.buy_signals, 'BUY'), (self.sell_signals, 'SELL')):
+            mask = kind == name
+            scatter.set_offsets(np.column_stack([signal_x[mask], signal_price[mask]]))
+
+        levels = np.concatenate([close, ema50, ema100, signal_price])
+        macd_levels = np.concatenate([macd, macd_signal, hist])
+        levels, macd_levels = levels[np.isfinite(levels)], macd_levels[np.isfinite(macd_levels)]
+        if self._needs_relayout(x, levels, macd_levels):
+            self._relayout(x, levels, macd_levels)
+            self.canvas.draw()  # the draw_event handler caches the background and draws the data
+            return True
+
+        if self._background is None:  # canvas not drawn yet
+            self.canvas.draw()
+            return True
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.fig.bbox)
+        return False
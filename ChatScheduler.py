@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+
+class ChatScheduler:
+    """
+    Runs LLM requests on one background asyncio loop with one shared async client,
+    so every request reuses its pooled HTTP connections. At most max_concurrent
+    requests reach the server at once and the rest wait in arrival order. A
+    request submitted with a key cancels the queued or running request with the
+    same key (e.g. a new chat message supersedes the previous generation; closing
+    the stream stops the server generating). A background request (e.g. summarizing
+    old turns) is cancelled as soon as any other request is submitted, so it never
+    holds a slot a user is waiting for. Requests that run longer than timeout
+    seconds are cancelled and fail with TimeoutError.
+    """
+
+    def __init__(self, create_client: Callable[[], Any], max_concurrent: int = 1, timeout: float = 120.0):
+        self.create_client = create_client
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self._client = None  # created on the loop, on first use
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active: Dict[str, Future] = {}
+        self._background: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="chat-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Callable[[Any], Awaitable], key: Optional[str] = None,
+               timeout: Optional[float] = None, background: bool = False) -> Future:
+        """Schedule job(client). Returns a Future; cancelling it cancels the request."""
+        future = asyncio.run_coroutine_threadsafe(self._execute(job, timeout or self.timeout), self._loop)
+        with self._lock:
+            if background:
+                self._background.add(future)
+                preempted = set()
+            else:
+                preempted, self._background = self._background, set()
+            if key is not None:
+                previous = self._active.get(key)
+                self._active[key] = future
+                if previous is not None:
+                    preempted.add(previous)
+        for request in preempted:
+            request.cancel()
+        if background:
+            future.add_done_callback(self._forget_background)
+        if key is not None:
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget_background(self, future: Future) -> None:
+        with self._lock:
+            self._background.discard(future)
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._active.get(key) is future:
+                del self._active[key]
+
+    async def _execute(self, job: Callable[[Any], Awaitable], timeout: float):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        async with self._semaphore:
+            if self._client is None:
+                self._client = self.create_client()
+            # Only time spent at the server counts towards the timeout, not time queued
+            return await asyncio.wait_for(job(self._client), timeout)
+
+    def warm_up(self) -> Future:
+        """Create the client now, so the first request doesn't pay for importing and building it."""
+        return self.submit(lambda client: asyncio.sleep(0))
+
+    def cancel(self, key: str) -> bool:
+        """Cancel the request submitted with key, if any is still queued or running."""
+        with self._lock:
+            future = self._active.get(key)
+        return future is not None and future.cancel()
+
+    def close(self) -> None:
+        """Cancel every request, close the client and stop the loop."""
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            close = getattr(self._client, 'close', None)
+            if close is not None:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,134 @@
+import threading
+from collections import namedtuple
+from typing import Callable, List, Optional
+
+# Tokenizer of the chat model served by LM Studio
+TOKENIZER_NAME = "Qwen/Qwen2.5-7B-Instruct"
+MESSAGE_OVERHEAD = 4  # chat template tokens around each message (<|im_start|>role ... <|im_end|>)
+
+Message = namedtuple("Message", ["role", "content", "tokens"])
+
+_token_counter = None
+_token_counter_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough count (about four characters per token) for when the tokenizer is unavailable."""
+    return (len(text) + 3) // 4
+
+
+def get_token_counter() -> Callable[[str], int]:
+    """
+    Load the chat model's tokenizer as a token counter (once; estimate_tokens if it
+    can't be loaded). Fetching it from the Hub can take a while, so call this in the background.
+    """
+    global _token_counter
+    with _token_counter_lock:
+        if _token_counter is None:
+            try:
+                from tokenizers import Tokenizer
+                tokenizer = Tokenizer.from_pretrained(TOKENIZER_NAME)
+                _token_counter = lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+            except Exception:
+                _token_counter = estimate_tokens
+    return _token_counter
+
+
+def token_counter() -> Callable[[str], int]:
+    """The tokenizer counter if get_token_counter has loaded it, else estimate_tokens. Never blocks."""
+    return _token_counter or estimate_tokens
+
+
+class Conversation:
+    """
+    Chat history of one session, sent to the model within a token budget.
+    Each message's token count is computed once when it is created, with count_tokens
+    or else the shared tokenizer counter (an estimate until it is loaded). context()
+    returns the system prompt, the summary of older turns and as many of the
+    latest turns as fit in max_tokens, so the prompt stays bounded however long
+    the chat runs. compact() moves turns beyond the budget out of memory and,
+    given a summarize(summary, messages) function, folds them into the summary.
+    """
+
+    def __init__(self, max_tokens: int = 3072, system_prompt: Optional[str] = None,
+                 count_tokens: Optional[Callable[[str], int]] = None,
+                 summarize: Optional[Callable[[Optional[str], List[Message]], str]] = None,
+                 keep_ratio: float = 0.5):
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self.summarize = summarize
+        self.keep_ratio = keep_ratio
+        self.system = self.message("system", system_prompt) if system_prompt else None
+        self.summary: Optional[Message] = None
+        self.summary_text: Optional[str] = None
+        self.turns: List[Message] = []
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()  # one compaction at a time
+
+    def message(self, role: str, content: str) -> Message:
+        count = self.count_tokens or token_counter()
+        return Message(role, content, count(content) + MESSAGE_OVERHEAD)
+
+    def append(self, *messages: Message) -> None:
+        with self._lock:
+            self.turns.extend(messages)
+
+    def _fixed_tokens(self) -> int:
+        return sum(message.tokens for message in (self.system, self.summary) if message)
+
+    def context(self, pending: Optional[Message] = None) -> List[dict]:
+        """
+        Messages for the next request: the fixed part and the latest turns that fit,
+        oldest first, ending with pending (always included).
+        """
+        with self._lock:
+            budget = self.max_tokens - self._fixed_tokens() - (pending.tokens if pending else 0)
+            window = []
+            for message in reversed(self.turns):
+                if message.tokens > budget:
+                    break
+                budget -= message.tokens
+                window.append(message)
+            if window and window[-1].role == "assistant":
+                window.pop()  # start the window on a user turn
+            fixed = [message for message in (self.system, self.summary) if message]
+            chosen = fixed + window[::-1] + ([pending] if pending else [])
+        return [{"role": message.role, "content": message.content} for message in chosen]
+
+    @property
+    def tokens(self) -> int:
+        """Tokens of everything still held: system prompt, summary and stored turns."""
+        with self._lock:
+            return self._fixed_tokens() + sum(message.tokens for message in self.turns)
+
+    def compact(self) -> bool:
+        """
+        Once the history exceeds max_tokens, drop the oldest turns until it is back
+        under keep_ratio of the budget, summarizing them if a summarize function is set.
+        Meant to run after a reply, off the latency path. Returns True if turns were dropped.
+        """
+        with self._compact_lock:
+            return self._compact()
+
+    def _compact(self) -> bool:
+        with self._lock:
+            limit = self.max_tokens * self.keep_ratio
+            total = self._fixed_tokens() + sum(message.tokens for message in self.turns)
+            if total <= self.max_tokens:
+                return False
+            dropped = 0
+            while dropped < len(self.turns) and total > limit:
+                total -= self.turns[dropped].tokens
+                dropped += 1
+            # Drop whole exchanges so the kept history starts on a user turn
+            while dropped < len(self.turns) and self.turns[dropped].role != "user":
+                dropped += 1
+            evicted = self.turns[:dropped]
+        # Summarizing may call the model, so new turns can still be added meanwhile
+        summary = self.summarize(self.summary_text, evicted) if self.summarize else None
+        with self._lock:
+            del self.turns[:len(evicted)]
+            if summary:
+                self.summary_text = summary
+                self.summary = self.message("system", f"Summary of the earlier conversation: {summary}")
+        return True
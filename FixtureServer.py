@@ -0,0 +1,263 @@
+import argparse
+import html
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Phrases for generated tweets, roughly a third each of positive, neutral and negative
+_PHRASES = [
+    "is going to the moon, best trade of the year!", "looks really strong today, loving it",
+    "breakout confirmed, great entry", "just closed a nice profit on", "is the best hedge right now",
+    "is moving sideways again", "opened flat this morning", "what do you think about",
+    "volume is average today", "chart update for",
+    "is crashing, terrible day", "I lost everything on", "worst setup I have seen in months",
+    "is a disaster, selling it all", "looks awful after the news",
+]
+
+_SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{query} - Search</title>
+<style>article {{ min-height: 180px; border-bottom: 1px solid #ccc; }}</style></head>
+<body><main id="timeline" data-query="{query}" data-next="{next}">{articles}</main>
+<script>
+// Infinite scroll: fetch the next page whenever the window reaches the bottom
+const timeline = document.getElementById('timeline');
+let loading = false;
+setInterval(async () => {{
+    const next = timeline.dataset.next;
+    if (loading || !next || window.innerHeight + window.scrollY < document.body.scrollHeight - 50) return;
+    loading = true;
+    const response = await fetch('/api/search?q=' + encodeURIComponent(timeline.dataset.query) + '&cursor=' + next);
+    const page = await response.json();
+    timeline.insertAdjacentHTML('beforeend', page.html);
+    timeline.dataset.next = page.next === null ? '' : page.next;
+    loading = false;
+}}, 100);
+</script></body></html>"""
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Log in</title></head><body>
+<form action="/login" method="get"><input type="hidden" name="step" value="{step}">
+<label>{label}</label> <input name="{field}" type="{kind}" autofocus></form>
+</body></html>"""
+
+# step -> (field label, input name, input type, next step), in the order login_twitter fills them
+_LOGIN_STEPS = {
+    'username': ("Phone, email or username", "text", "text", "verify"),
+    'verify': ("Enter your phone number or email address", "text", "text", "password"),
+    'password': ("Password", "password", "password", "done"),
+}
+
+
+def generate_tweets(query: str, count: int, seed: Optional[int] = None,
+                    now: Optional[datetime] = None) -> List[Dict[str, str]]:
+    """
+    Deterministic fake search results for query, newest first: snowflake-like IDs,
+    ISO timestamps 30 seconds apart and about one retweet of an earlier tweet in ten.
+    """
+    rng = random.Random(f"{query}:{seed}")
+    now = now or datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    tweets = []
+    for i in range(count):
+        if tweets and rng.random() < 0.1:
+            text = f"RT @trader{rng.randrange(100)}: {rng.choice(tweets)['text']}"
+        else:
+            text = f"{query} {rng.choice(_PHRASES)} #{rng.randrange(1000)}"
+        created = now - timedelta(seconds=30 * i)
+        tweets.append({
+            'id': str(1785000000000000000 - i * 4096),
+            'text': text,
+            'created_at': created.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        })
+    return tweets
+
+
+def render_articles(tweets: List[Dict[str, str]], lang: str = 'en') -> str:
+    """Tweets as <article> elements shaped like the live timeline's markup."""
+    return ''.join(
+        f'<article><a href="/trader/status/{tweet["id"]}"><time datetime="{tweet["created_at"]}">'
+        f'{tweet["created_at"][:10]}</time></a><div lang="{lang}">{html.escape(tweet["text"])}</div></article>'
+        for tweet in tweets)
+
+
+class FixtureServer:
+    """
+    Local stand-in for the Twitter web app, so the scraper can run end to end with no network.
+    Serves the login flow (username, verification and password steps, then an auth_token
+    cookie), /home and live search pages that load page_size more results each time the
+    window is scrolled to the bottom, answering each page after latency seconds.
+    Results come from tweets (one list served for every query, e.g. a saved fixture
+    file) or are generated per query, total results each.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, tweets: Optional[List[Dict[str, str]]] = None,
+                 total: int = 1000, page_size: int = 20, latency: float = 0.2):
+        self.tweets = tweets
+        self.total = total
+        self.page_size = page_size
+        self.latency = latency
+        self.requests = 0
+        self._results: Dict[str, List[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fixture = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def results(self, query: str) -> List[Dict[str, str]]:
+        if self.tweets is not None:
+            return self.tweets
+        with self._lock:
+            if query not in self._results:
+                self._results[query] = generate_tweets(query, self.total)
+            return self._results[query]
+
+    def page(self, query: str, cursor: int) -> dict:
+        tweets = self.results(query)
+        end = cursor + self.page_size
+        return {'tweets': tweets[cursor:end], 'next': end if end < len(tweets) else None}
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args) -> None:
+        pass  # keep benchmark output clean
+
+    def _send(self, body: str, content_type: str = 'text/html; charset=utf-8', headers: Optional[dict] = None,
+              status: int = 200) -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        fixture = self.server.fixture
+        fixture.requests += 1
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        if url.path == '/login':
+            step = params.get('step', 'username')
+            if step == 'done':
+                return self._send('', headers={'Location': '/home', 'Set-Cookie': 'auth_token=fixture; Path=/'},
+                                  status=302)
+            label, field, kind, next_step = _LOGIN_STEPS.get(step, _LOGIN_STEPS['username'])
+            return self._send(_LOGIN_PAGE.format(step=next_step, label=label, field=field, kind=kind))
+
+        if url.path == '/home':
+            return self._send('<!DOCTYPE html><html><body><main id="home">Home</main></body></html>')
+
+        if url.path == '/search':
+            query = params.get('q', '')
+            page = fixture.page(query, 0)
+            return self._send(_SEARCH_PAGE.format(
+                query=html.escape(query),
+                next='' if page['next'] is None else page['next'],
+                articles=render_articles(page['tweets'], params.get('lang', 'en'))))
+
+        if url.path == '/api/search':
+            time.sleep(fixture.latency)  # network and render delay of the live site
+            page = fixture.page(params.get('q', ''), int(params.get('cursor', 0)))
+            page['html'] = render_articles(page.pop('tweets'))
+            return self._send(json.dumps(page), 'application/json')
+
+        self._send('Not found', status=404)
+
+
+def benchmark(keyword: str, num_tweets: int, rate_limited: bool = False, **server_options) -> None:
+    """
+    Run the full scrape pipeline (login, scroll, classify) against the fixture; a
+    comma-separated keyword scrapes each one concurrently, as run_keywords_interactive does.
+    The fixture needs no politeness, so by default concurrent scrapes run without the
+    rate limiter and the timing is scrape and classify throughput alone. With rate_limited
+    they share the live site's request budget and the time spent waiting on it is reported.
+    """
+    import Browser
+    import Scrapper
+    keywords = [k.strip() for k in keyword.split(",") if k.strip()]
+    with FixtureServer(**server_options) as server, tempfile.TemporaryDirectory() as folder:
+        credentials_path = os.path.join(folder, "credentials.json")
+        with open(credentials_path, "w") as file:
+            json.dump({"username": "fixture", "password": "fixture"}, file)
+        Scrapper.BASE_URL = server.base_url
+        Scrapper.CREDENTIALS_PATH = credentials_path
+        Scrapper.COOKIES_PATH = os.path.join(folder, "cookies.json")
+        Scrapper.STORE_PATH = os.path.join(folder, "tweets.db")
+        limiter = Browser.DomainRateLimiter(Scrapper.TWITTER_RATE, Scrapper.TWITTER_BURST) if rate_limited else None
+        Scrapper.rate_limiter = limiter
+
+        started = time.perf_counter()
+        messages = []
+        def report(message):
+            messages.append((time.perf_counter() - started, message))
+            print(f"[{messages[-1][0]:7.2f}s] {message}")
+        if len(keywords) > 1:
+            Scrapper.run_keywords_interactive(keywords, num_tweets, "en", report)
+        else:
+            Scrapper.run_scraper_interactive(keywords[0], num_tweets, "en", report)
+        elapsed = time.perf_counter() - started
+        scraped = num_tweets * len(keywords)
+        print(f"{scraped} tweets in {elapsed:.2f}s ({scraped / elapsed:.1f} tweets/s, "
+              f"{server.requests} requests to the fixture)")
+        if limiter:
+            print(f"{limiter.waited:.2f}s of scraper time spent waiting on the rate limiter")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline Twitter fixture for testing and benchmarking the scraper.")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--fixture", help="JSON file with a list of {id, text, created_at} tweets to serve")
+    parser.add_argument("--total", type=int, default=1000, help="Generated results per query")
+    parser.add_argument("--page-size", type=int, default=20, help="Results loaded per scroll")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each scroll's results arrive")
+    parser.add_argument("--benchmark", metavar="KEYWORD",
+                        help="Scrape KEYWORD (or comma-separated keywords) end to end instead of serving")
+    parser.add_argument("--tweets", type=int, default=200, help="Tweets to scrape per keyword with --benchmark")
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Apply the live site's request rate limit to concurrent --benchmark scrapes")
+    args = parser.parse_args()
+
+    tweets = None
+    if args.fixture:
+        with open(args.fixture, "r", encoding="utf-8") as file:
+            tweets = json.load(file)
+    options = dict(tweets=tweets, total=args.total, page_size=args.page_size, latency=args.latency)
+    if args.benchmark:
+        benchmark(args.benchmark, args.tweets, args.rate_limit, port=0, **options)
+    else:
+        server = FixtureServer(port=args.port, **options).start()
+        print(f"Serving fixture at {server.base_url} - run the bot with LEX_TWITTER_URL={server.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.close()
@@ -0,0 +1,106 @@
+import csv
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class TimeRing:
+    """
+    Fixed-capacity, time-indexed ring buffer with one NumPy array per column.
+    Memory stays flat: once full, each append overwrites the oldest record, which
+    is first appended to spill_path (CSV) when set so the full history survives on disk.
+    Records must be appended in time order, so time range queries are binary searches
+    returning slices instead of scans. Each record gets a sequence number that stays
+    valid for update() until it is evicted.
+    """
+
+    def __init__(self, capacity: int, columns: Dict[str, object], spill_path: Optional[str] = None):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.spill_path = spill_path
+        self._time = np.zeros(capacity, dtype='datetime64[us]')
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self.first_seq = 0  # sequence number of the oldest record still in memory
+        self._next_seq = 0  # sequence number of the next record
+
+    def __len__(self) -> int:
+        return self._next_seq - self.first_seq
+
+    def append(self, time: datetime, **values) -> int:
+        """Add a record and return its sequence number."""
+        slot = self._next_seq % self.capacity
+        if len(self) == self.capacity:
+            if self.spill_path:
+                self._spill([slot])
+            self.first_seq += 1
+        self._time[slot] = np.datetime64(time, 'us')
+        for name in self.columns:
+            self._data[name][slot] = values.get(name, self._data[name].dtype.type())
+        self._next_seq += 1
+        return self._next_seq - 1
+
+    def _spill(self, slots) -> None:
+        new_file = not os.path.exists(self.spill_path)
+        with open(self.spill_path, 'a', newline='') as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(['time'] + self.columns)
+            for slot in slots:
+                writer.writerow([self._time[slot].item().isoformat()] +
+                                [self._data[name][slot].item() for name in self.columns])
+
+    def flush(self) -> None:
+        """Spill every record still in memory (e.g. on shutdown) and empty the buffer."""
+        if self.spill_path and len(self):
+            self._spill([seq % self.capacity for seq in range(self.first_seq, self._next_seq)])
+        self.first_seq = self._next_seq
+
+    def update(self, seq: int, **values) -> bool:
+        """Change fields of a record still in memory. Returns False if it was already evicted."""
+        if not self.first_seq <= seq < self._next_seq:
+            return False
+        slot = seq % self.capacity
+        for name, value in values.items():
+            self._data[name][slot] = value
+        return True
+
+    def _slice(self, first: int) -> Dict[str, np.ndarray]:
+        """Records from the first-th oldest onwards, in time order."""
+        count = len(self)
+        start = (self.first_seq + first) % self.capacity
+        end = start + (count - first)
+        if end <= self.capacity:
+            index = slice(start, end)
+            result = {'time': self._time[index].copy()}
+            result.update({name: self._data[name][index].copy() for name in self.columns})
+        else:
+            index = np.r_[start:self.capacity, 0:end - self.capacity]
+            result = {'time': self._time[index]}
+            result.update({name: self._data[name][index] for name in self.columns})
+        return result
+
+    def since(self, time: datetime) -> Dict[str, np.ndarray]:
+        """Column arrays for every record at or after time, oldest first."""
+        count = len(self)
+        start = self.first_seq % self.capacity
+        target = np.datetime64(time, 'us')
+        # Records sit in at most two sorted runs: [start, capacity) then [0, wrapped)
+        older = self._time[start:min(start + count, self.capacity)]
+        if not len(older) or older[-1] >= target:
+            first = int(np.searchsorted(older, target, side='left'))
+        else:
+            wrapped = start + count - self.capacity
+            first = len(older) + int(np.searchsorted(self._time[:max(wrapped, 0)], target, side='left'))
+        return self._slice(first)
+
+    def tail(self, n: int) -> List[dict]:
+        """The last n records as dicts, oldest first."""
+        n = min(n, len(self))
+        columns = self._slice(len(self) - n)
+        return [{name: values[i].item() for name, values in columns.items()} for i in range(n)]
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column in time order."""
+        return self._slice(0)[name]
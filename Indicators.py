@@ -0,0 +1,254 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+INDICATOR_COLUMNS = ['EMA50', 'EMA100', 'RSI', 'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9', 'ATR']
+
+
+def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Calculate indicators over the whole frame with pandas_ta (reference path)."""
+    # Only MA, RSI, and MACD
+    df['EMA50'] = ta.ema(df['close'], length=50)
+    df['EMA100'] = ta.ema(df['close'], length=100)
+    df['RSI'] = ta.rsi(df['close'], length=14)
+
+    # MACD
+    macd = ta.macd(df['close'], fast=12, slow=26, signal=9)
+    df = pd.concat([df, macd], axis=1)
+
+    # ATR for stop loss calculation
+    df['ATR'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+    return df
+
+
+class _Ewm:
+    """
+    One step of pandas ``Series.ewm(...).mean()`` (ignore_na=False).
+    Mirrors the pandas recurrence so streamed values match the vectorized ones.
+    """
+    __slots__ = ('old_wt_factor', 'new_wt', 'adjust', 'min_periods', 'weighted', 'old_wt', 'nobs')
+
+    def __init__(self, com: float, adjust: bool, min_periods: int = 0):
+        alpha = 1. / (1. + com)
+        self.old_wt_factor = 1. - alpha
+        self.new_wt = 1. if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = math.nan
+        self.old_wt = 1.
+        self.nobs = 0
+
+    def copy(self) -> '_Ewm':
+        clone = _Ewm.__new__(_Ewm)
+        for name in _Ewm.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        self.nobs += is_observation
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs >= self.min_periods else math.nan
+
+
+class _Ema:
+    """pandas_ta ``ema``: SMA seed over the first ``length`` values, then ewm(span, adjust=False)."""
+    __slots__ = ('length', 'seed', 'ewm')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.seed = []
+        self.ewm = _Ewm(com=(length - 1) / 2., adjust=False)
+
+    def copy(self) -> '_Ema':
+        clone = _Ema.__new__(_Ema)
+        clone.length = self.length
+        clone.seed = list(self.seed) if self.seed is not None else None
+        clone.ewm = self.ewm.copy()
+        return clone
+
+    def update(self, value: float) -> float:
+        if self.seed is None:
+            return self.ewm.update(value)
+        self.seed.append(value)
+        if len(self.seed) < self.length:
+            return math.nan
+        sma_nth = float(np.sum(self.seed)) / self.length
+        self.seed = None
+        return self.ewm.update(sma_nth)
+
+
+def _rma(length: int) -> _Ewm:
+    """pandas_ta ``rma``: ewm(alpha=1/length, min_periods=length) with adjust=True."""
+    return _Ewm(com=1. / (1. / length) - 1., adjust=True, min_periods=length)
+
+
+class _IndicatorState:
+    """Recursive state for EMA50, EMA100, RSI(14), MACD(12,26,9) and ATR(14)."""
+    __slots__ = ('ema50', 'ema100', 'rsi_up', 'rsi_down', 'macd_fast', 'macd_slow',
+                 'macd_signal', 'atr', 'prev_close')
+
+    def __init__(self):
+        self.ema50 = _Ema(50)
+        self.ema100 = _Ema(100)
+        self.rsi_up = _rma(14)
+        self.rsi_down = _rma(14)
+        self.macd_fast = _Ema(12)
+        self.macd_slow = _Ema(26)
+        self.macd_signal = _Ema(9)
+        self.atr = _rma(14)
+        self.prev_close = math.nan
+
+    def copy(self) -> '_IndicatorState':
+        clone = _IndicatorState.__new__(_IndicatorState)
+        for name in _IndicatorState.__slots__[:-1]:
+            setattr(clone, name, getattr(self, name).copy())
+        clone.prev_close = self.prev_close
+        return clone
+
+    def step(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        """Advance the state by one bar and return its indicator values."""
+        prev_close = self.prev_close
+        self.prev_close = close
+
+        ema50 = self.ema50.update(close)
+        ema100 = self.ema100.update(close)
+
+        # RSI - Wilder smoothing of gains and losses
+        change = close - prev_close
+        up = self.rsi_up.update(max(change, 0.) if change == change else change)
+        down = self.rsi_down.update(min(change, 0.) if change == change else change)
+        rsi = 100 * up / (up + abs(down))
+
+        # MACD - the signal line only starts once the MACD line is valid
+        macd = self.macd_fast.update(close) - self.macd_slow.update(close)
+        if macd == macd:
+            signal = self.macd_signal.update(macd)
+        else:
+            signal = math.nan
+        histogram = macd - signal
+
+        # ATR - true range smoothed with rma
+        if prev_close == prev_close:
+            high_low = high - low
+            if high_low == 0:
+                high_low += np.finfo(float).eps
+            true_range = max(abs(high_low), abs(high - prev_close), abs(prev_close - low))
+        else:
+            true_range = math.nan
+        atr = self.atr.update(true_range)
+
+        return ema50, ema100, rsi, macd, histogram, signal, atr
+
+
+class IndicatorEngine:
+    """
+    Streaming indicator engine for MT5 rates.
+    Keeps recursive state per indicator so each new or updated bar costs O(1),
+    regardless of the window size. Values match ``add_indicators`` applied to
+    every bar the engine has seen since it was seeded.
+    Bars are written into preallocated column arrays with room for another
+    window of bars, so the window only has to be moved back to the start once
+    every ``window`` bars and ``frame`` wraps the arrays without copying them.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._keep = max(window - 1, 1)  # closed bars kept before the forming one
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all bars and indicator state."""
+        self._state = _IndicatorState()  # state through the last closed bar
+        self._last_bar = None  # forming bar, may still be updated
+        self._columns = None
+        self._buffers = None  # column -> array of closed bars followed by the forming bar
+        self._end = 0  # buffer position of the forming bar
+        self._first_valid = 0  # buffer position of the first bar with every indicator set
+        self._forming_valid = False
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Open time of the most recent (forming) bar, or None before seeding."""
+        return None if self._last_bar is None else int(self._last_bar['time'])
+
+    def _allocate(self, dtype) -> None:
+        capacity = 2 * self._keep + 1
+        self._columns = list(dtype.names) + INDICATOR_COLUMNS
+        self._buffers = {name: np.empty(capacity, dtype='datetime64[ns]' if name == 'time' else dtype[name])
+                         for name in dtype.names}
+        for name in INDICATOR_COLUMNS:
+            self._buffers[name] = np.empty(capacity)
+
+    def _commit(self) -> None:
+        """Close the forming bar, moving the window back to the start of the buffers when they are full."""
+        if not self._forming_valid:
+            self._first_valid = self._end + 1
+        self._end += 1
+        if self._end == len(self._buffers['time']):
+            shift = self._end - self._keep
+            for buffer in self._buffers.values():
+                buffer[:self._keep] = buffer[shift:self._end]
+            self._end = self._keep
+            self._first_valid = max(self._first_valid - shift, 0)
+
+    def _write(self, bar, values: Tuple[float, ...]) -> None:
+        """Store bar and its indicator values as the forming bar."""
+        for name in bar.dtype.names:
+            self._buffers[name][self._end] = np.datetime64(int(bar['time']), 's') if name == 'time' else bar[name]
+        for name, value in zip(INDICATOR_COLUMNS, values):
+            self._buffers[name][self._end] = value
+        self._forming_valid = all(value == value for value in values)
+
+    def update(self, rates) -> int:
+        """
+        Ingest rates as returned by ``copy_rates_from_pos`` (oldest first).
+        Bars older than the forming bar are ignored, the forming bar is
+        recomputed and newer bars are appended. Returns the number of bars used.
+        """
+        if isinstance(rates, pd.DataFrame):
+            rates = rates.to_records(index=False)
+        if rates is None or len(rates) == 0:
+            return 0
+        if self._buffers is None:
+            self._allocate(rates.dtype)
+
+        last_time = self.last_time
+        used = 0
+        for bar in rates:
+            bar_time = int(bar['time'])
+            if last_time is not None and bar_time < last_time:
+                continue
+            if last_time is not None and bar_time > last_time:
+                # The previous forming bar is now closed - commit it
+                self._state.step(float(self._last_bar['high']), float(self._last_bar['low']),
+                                 float(self._last_bar['close']))
+                self._commit()
+            values = self._state.copy().step(float(bar['high']), float(bar['low']), float(bar['close']))
+            self._last_bar = bar
+            self._write(bar, values)
+            last_time = bar_time
+            used += 1
+        return used
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Return the current window (bars with every indicator set) as a DataFrame like
+        ``get_market_data`` used to. The frame is a view of the engine's buffers,
+        valid until the next ``update``; copy it to keep it longer or hand it to another thread.
+        """
+        if self._last_bar is None:
+            return pd.DataFrame(columns=self._columns or ['time'] + INDICATOR_COLUMNS)
+        start = max(self._end - self._keep, self._first_valid)
+        stop = self._end + 1 if self._forming_valid else self._end
+        return pd.DataFrame({name: self._buffers[name][start:stop] for name in self._columns}, copy=False)
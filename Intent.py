@@ -0,0 +1,183 @@
+import math
+import re
+import threading
+from collections import Counter, namedtuple
+from typing import Dict, List, Optional
+
+import numpy as np
+
+Route = namedtuple("Route", ["intent", "confidence", "slots"])
+
+CHAT = "chat"  # anything not confidently routed goes to the LLM
+
+# Example utterances per intent; the router is built from these
+EXAMPLES = {
+    "scrape": [
+        "scrape twitter", "run the twitter scraper", "scrape tweets about gold",
+        "get 200 tweets about bitcoin", "collect tweets on XAUUSD in english",
+        "what is twitter saying about gold", "analyze tweet sentiment for silver",
+        "twitter sentiment about the fed", "fetch the latest tweets on oil",
+        "news scraping", "scrape 50 posts about inflation in spanish",
+        "check sentiment on twitter for gold", "pull tweets for nvidia",
+        "start twitter scraping", "how do people feel about gold on twitter",
+    ],
+    "trading": [
+        "start trading", "run the trading simulation", "run trading",
+        "start the trading bot on XAUUSD", "technical analysis of gold",
+        "trade gold", "run a trading simulation for EURUSD",
+        "launch the trading bot", "start the bot with MetaTrader",
+        "open the trading chart", "simulate trades on XAUUSD",
+        "run technical analysis", "begin automated trading on silver",
+    ],
+    "sentiment_history": [
+        "sentiment history for gold", "show sentiment over time for bitcoin",
+        "how has sentiment on gold changed", "daily sentiment for silver",
+        "sentiment trend for oil", "show stored sentiment for XAUUSD",
+        "past sentiment about inflation", "sentiment over the last days for gold",
+    ],
+    CHAT: [
+        "hello", "hi there", "how are you", "thank you", "what can you do",
+        "explain rsi", "what is a moving average", "what is macd",
+        "tell me a joke", "who are you", "what is the price of gold",
+        "explain stop loss and take profit", "what does the ema crossover mean",
+        "should I buy gold now", "write a poem about the market",
+        "what is sentiment analysis", "how does the scraper work",
+    ],
+}
+
+LANGUAGES = {
+    "english": "en", "indonesian": "id", "bahasa": "id", "spanish": "es", "french": "fr",
+    "german": "de", "japanese": "ja", "chinese": "zh", "portuguese": "pt", "italian": "it",
+    "arabic": "ar", "russian": "ru", "korean": "ko", "dutch": "nl", "turkish": "tr",
+}
+SYMBOLS = {"gold": "XAUUSD", "silver": "XAGUSD", "euro": "EURUSD", "bitcoin": "BTCUSD", "oil": "USOIL"}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_COUNT = re.compile(r"\b(\d{1,4})\s*(?:tweets?|posts?)\b|\b(?:get|scrape|fetch|pull|collect)\s+(\d{1,4})\b", re.I)
+_LANG_CODE = re.compile(r"\b(?:lang(?:uage)?\s*[=:]?\s*)([a-z]{2})\b", re.I)
+_LANG_NAME = re.compile(r"\bin\s+(" + "|".join(LANGUAGES) + r")\b", re.I)
+_SYMBOL = re.compile(r"\b([A-Z]{6})\b")
+_QUOTED = re.compile(r"[\"“']([^\"”']+)[\"”']")
+_TOPIC = re.compile(r"\b(?:about|on|for|regarding)\s+", re.I)
+_SOURCE = re.compile(r"^(?:(?:twitter|tweets?|posts?)\b\s*)+", re.I)  # where to look, not what for
+# Words that end a topic: the count, the language or filler at the end of the request
+_TOPIC_END = re.compile(r"\s+(?:in\s+(?:" + "|".join(LANGUAGES) + r")|lang(?:uage)?\b|\d+\s*(?:tweets?|posts?)"
+                        r"|on\s+twitter|from\s+twitter|please|now|today)\b.*$", re.I)
+
+
+def features(text: str) -> Counter:
+    """Words plus character 3-5-grams of each word, so inflections and typos still overlap."""
+    counts = Counter()
+    for word in _WORD.findall(text.lower()):
+        counts[f"w:{word}"] += 1
+        padded = f"<{word}>"
+        for n in (3, 4, 5):
+            for i in range(len(padded) - n + 1):
+                counts[padded[i:i + n]] += 1
+    return counts
+
+
+def _topic(text: str) -> Optional[str]:
+    """
+    What follows the last about/on/for/regarding, so "sentiment on twitter about bitcoin"
+    gives "bitcoin"; an earlier one is used when the last only names Twitter ("about gold on twitter").
+    """
+    for match in reversed(list(_TOPIC.finditer(text))):
+        keyword = _SOURCE.sub("", _TOPIC_END.sub("", text[match.end():])).strip(" ?.!,")
+        if keyword:
+            return keyword
+    return None
+
+
+def extract_slots(text: str) -> Dict[str, object]:
+    """keyword, count, lang and symbol found in a request; missing ones are left out."""
+    slots = {}
+    match = _COUNT.search(text)
+    if match:
+        slots["count"] = int(match.group(1) or match.group(2))
+    match = _LANG_CODE.search(text)
+    if match:
+        slots["lang"] = match.group(1).lower()
+    else:
+        match = _LANG_NAME.search(text)
+        if match:
+            slots["lang"] = LANGUAGES[match.group(1).lower()]
+
+    match = _QUOTED.search(text)
+    keyword = match.group(1).strip() if match else _topic(text)
+    if keyword:
+        slots["keyword"] = keyword
+
+    match = _SYMBOL.search(text)
+    if match:
+        slots["symbol"] = match.group(1)
+    else:
+        for word in _WORD.findall(text.lower()):
+            if word in SYMBOLS:
+                slots["symbol"] = SYMBOLS[word]
+                break
+    return slots
+
+
+class IntentRouter:
+    """
+    TF-IDF nearest-centroid intent classifier. Each intent's example utterances are
+    turned into L2-normalized TF-IDF vectors (words and character n-grams) and averaged
+    into one centroid, so routing a message is one sparse lookup and a small
+    matrix-vector product. Messages whose best cosine similarity is below threshold,
+    or within margin of the runner-up, go to the fallback intent.
+    """
+
+    def __init__(self, examples: Dict[str, List[str]] = EXAMPLES, threshold: float = 0.25,
+                 margin: float = 0.03, fallback: str = CHAT):
+        self.threshold = threshold
+        self.margin = margin
+        self.fallback = fallback
+        self.intents = list(examples)
+        documents = [(intent, features(text)) for intent in self.intents for text in examples[intent]]
+
+        document_frequency = Counter(feature for _, counts in documents for feature in counts)
+        self.vocabulary = {feature: index for index, feature in enumerate(sorted(document_frequency))}
+        total = len(documents)
+        self.idf = np.array([math.log((1 + total) / (1 + document_frequency[feature])) + 1
+                             for feature in sorted(document_frequency)])
+
+        centroids = np.zeros((len(self.intents), len(self.vocabulary)))
+        for intent, counts in documents:
+            centroids[self.intents.index(intent)] += self._vector(counts)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = centroids / np.where(norms == 0, 1, norms)
+
+    def _vector(self, counts: Counter) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary))
+        for feature, count in counts.items():
+            index = self.vocabulary.get(feature)
+            if index is not None:
+                vector[index] = (1 + math.log(count)) * self.idf[index]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Cosine similarity of text to each intent's centroid."""
+        return dict(zip(self.intents, (self.centroids @ self._vector(features(text))).tolist()))
+
+    def route(self, text: str) -> Route:
+        """The message's intent, its similarity and the slots found in it."""
+        ranked = sorted(self.scores(text).items(), key=lambda item: item[1], reverse=True)
+        (intent, best), runner_up = ranked[0], ranked[1][1] if len(ranked) > 1 else 0.0
+        if best < self.threshold or best - runner_up < self.margin:
+            intent = self.fallback
+        return Route(intent, best, extract_slots(text) if intent != self.fallback else {})
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> IntentRouter:
+    """The router for EXAMPLES, built on first use (a few milliseconds)."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = IntentRouter()
+    return _router
@@ -1,17 +1,111 @@
 import os
+import statistics
 import threading
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import CancelledError
 import tkinter as tk
 from tkinter import messagebox, simpledialog, Canvas, Frame, Scrollbar
-from openai import OpenAI
+import ChatScheduler
+import Conversation
+import Intent
+import ResponseCache
 import Scrapper
+import SentimentServer
 
 # === ENV SETUP ===
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 
-client = OpenAI(base_url="http://localhost:1234/v1", api_key="lm-studio")
 model = "lmstudio-community/qwen2.5-7b-instruct"
+STREAM_FRAME_MS = 50  # streamed replies are redrawn at most 20 times a second
+
+# Sent first with every request and never changed, so the server can reuse its cached prefix
+SYSTEM_PROMPT = ("You are Lex, a helpful assistant for trading and market sentiment. "
+                 "Answer clearly and concisely.")
+
+# Replies to identical requests, kept for a day across restarts
+RESPONSE_CACHE_PATH = os.path.join("history", "responses.json")
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache.ResponseCache(RESPONSE_CACHE_PATH)
+    return _response_cache
+
+LLM_URL = "http://localhost:1234/v1"
+MAX_CONCURRENT_REQUESTS = 1  # one local model: parallel requests only slow each other down
+REQUEST_TIMEOUT = 120.0
+
+# The openai package takes most of a second to import, so the client is created on first use
+def create_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(base_url=LLM_URL, api_key="lm-studio")
+
+# Every LLM request goes through one event loop and one pooled client
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ChatScheduler.ChatScheduler(create_client, MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT)
+    return _scheduler
+
+# One model process shared by every scrape job, started by the first scrape so chatting
+# or trading never pays for it, and loaded in-process if it can't start
+_sentiment_started = False
+_sentiment_lock = threading.Lock()
+
+def start_sentiment_service():
+    global _sentiment_started
+    with _sentiment_lock:
+        if _sentiment_started:
+            return
+        _sentiment_started = True
+        try:
+            Scrapper.sentiment_service = SentimentServer.SentimentService()
+        except Exception as e:
+            print(f"Sentiment service unavailable, using the local model: {e}")
+            Scrapper.start_warm_up()
+
+# One streamed reply: the request appends tokens, the Tk thread draws the latest text
+class ReplyStream:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.text = ""
+        self.done = False
+        self.label = None  # bubble, opened with the first token
+        self.shown = ""
+        self.time_to_first_token = None
+        self._lock = threading.Lock()
+
+    def add(self, chunk):
+        with self._lock:
+            if not self.done:  # a stopped reply ignores tokens still in flight
+                self.text += chunk
+
+    def finish(self, note=None):
+        with self._lock:
+            if self.done:
+                return
+            if note:
+                self.text += f"\n\n{note}" if self.text else note
+            self.done = True
+
+# Why a request ended early, shown under the reply
+def stop_note(future):
+    if future.cancelled():
+        return "(Stopped)"
+    error = future.exception()
+    if isinstance(error, TimeoutError):
+        return f"Error: no reply within {REQUEST_TIMEOUT:.0f}s"
+    return f"Error: {error}" if error else None
 
 class LexandChatApp:
     def __init__(self, root):
@@ -50,8 +144,24 @@ class LexandChatApp:
                                      command=self.send_message)
         self.send_button.pack(side=tk.RIGHT, padx=(5, 10), pady=10)
 
+        # Seconds from sending a message to its first visible token, latest replies last.
+        # Each one is logged with the median of this window when its bubble opens.
+        self.first_token_times = deque(maxlen=100)
+        # Chat history sent with each message, kept within the model's context budget.
+        # Turns are only appended, and dropped in bulk by compact(), so the prompt prefix stays stable
+        self.conversation = Conversation.Conversation(system_prompt=SYSTEM_PROMPT, summarize=self.summarize_turns)
+
         self.append_bubble("🤖", "Hello! I'm Lex chatbot.\nI can help with Twitter scraping, trading simulations, or general chat.", "left")
 
+        # Load the LLM client, router and tokenizer once the window is up
+        self.root.after(500, self.warm_up)
+
+    def warm_up(self):
+        get_scheduler().warm_up()
+        threading.Thread(target=Intent.get_router, daemon=True).start()
+        threading.Thread(target=Conversation.get_token_counter, daemon=True).start()
+        threading.Thread(target=get_response_cache, daemon=True).start()
+
     def on_frame_configure(self, event):
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         self.canvas.yview_moveto(1.0)
@@ -84,6 +194,7 @@ class LexandChatApp:
 
         self.root.update_idletasks()
         self.canvas.yview_moveto(1.0)
+        return text_label
 
     def send_message(self, event=None):
         user_text = self.user_input.get().strip()
@@ -98,13 +209,22 @@ class LexandChatApp:
             self.root.after(1000, self.root.destroy)
             return
 
-        lower = user_text.lower()
-        if any(k in lower for k in ["scrape", "twitter scraper", "scrapes", "tweets", "news scraping","twitter scraping"]):
-            self.confirm_and_run("Twitter Scraper", "Do you want to run the Twitter Scraper?", self.run_scraper_gui)
-        elif any(k in lower for k in ["technical analysis", "trading simulation", "run trading", "start trading"]):
-            self.confirm_and_run("Trading Simulation", "Do you want to start the Trading Simulation? (MetaTrader 5 required)", self.run_trader_script)
+        # Tools get the details found in the message (keyword, count, ...) and only ask for the rest
+        route = Intent.get_router().route(user_text)
+        slots = route.slots
+        if route.intent == "sentiment_history":
+            self.root.after(100, lambda: self.show_sentiment_history(slots.get("keyword")))
+        elif route.intent == "scrape":
+            # Name what was understood, so a wrongly extracted keyword can be declined
+            details = ", ".join(str(slots[name]) for name in ("keyword", "count", "lang") if name in slots)
+            self.confirm_and_run("Twitter Scraper", "Do you want to run the Twitter Scraper"
+                                 + (f" ({details})?" if details else "?"),
+                                 lambda: self.run_scraper_gui(slots.get("keyword"), slots.get("count"), slots.get("lang")))
+        elif route.intent == "trading":
+            self.confirm_and_run("Trading Simulation", "Do you want to start the Trading Simulation? (MetaTrader 5 required)",
+                                 lambda: self.run_trader_script(slots.get("symbol")))
         else:
-            threading.Thread(target=self.ask_lmstudio, args=(user_text,)).start()
+            self.start_reply(user_text)
 
     def confirm_and_run(self, title, prompt, function_to_run):
         confirm = messagebox.askyesno(title, prompt)
@@ -114,44 +234,132 @@ class LexandChatApp:
         else:
             self.append_bubble("🤖", f"Okay, I won’t run {title.lower()}.", "left")
 
-    def run_scraper_gui(self):
-        keyword = simpledialog.askstring("Twitter Keyword", "Enter keyword:")
-        if not keyword:
+    def run_scraper_gui(self, keyword=None, num=None, lang=None):
+        keyword = keyword or simpledialog.askstring("Twitter Keyword", "Enter keyword (comma-separate several):")
+        keywords = [k.strip() for k in (keyword or "").split(",") if k.strip()]
+        if not keywords:
             return self.append_bubble("🤖", "Cancelled: no keyword entered.", "left")
 
-        num = simpledialog.askinteger("Number of Tweets", "How many tweets?", minvalue=1, maxvalue=5)
+        num = min(num, 1000) if num else simpledialog.askinteger("Number of Tweets", "How many tweets?", minvalue=1, maxvalue=1000)
         if not num:
             return self.append_bubble("🤖", "Cancelled: no tweet number entered.", "left")
 
-        lang = simpledialog.askstring("Language Code", "Enter language code (default: en):") or "en"
+        lang = lang or simpledialog.askstring("Language Code", "Enter language code (default: en):") or "en"
 
-        self.append_bubble("🤖", f"Running Twitter scraper for '{keyword}' ({num} tweets in {lang})...", "left")
+        self.append_bubble("🤖", f"Running Twitter scraper for '{', '.join(keywords)}' ({num} tweets in {lang})...", "left")
 
         def threaded_run():
             try:
-                Scrapper.run_scraper_interactive(keyword, num, lang, self.append_bubble_from_bot)
+                start_sentiment_service()
+                if len(keywords) > 1:
+                    Scrapper.run_keywords_interactive(keywords, num, lang, self.append_bubble_from_bot)
+                else:
+                    Scrapper.run_scraper_interactive(keywords[0], num, lang, self.append_bubble_from_bot)
             except Exception as e:
                 self.append_bubble("🤖", f"Error: {e}", "left")
 
         threading.Thread(target=threaded_run).start()
 
-    def run_trader_script(self):
+    def show_sentiment_history(self, keyword=None):
+        keyword = keyword or simpledialog.askstring("Sentiment History", "Enter keyword:")
+        if not keyword:
+            return self.append_bubble("🤖", "Cancelled: no keyword entered.", "left")
         try:
-            subprocess.run(["python", "Trading.py"])
+            self.append_bubble("🤖", Scrapper.sentiment_history_report(keyword.strip()), "left")
+        except Exception as e:
+            self.append_bubble("🤖", f"Error: {e}", "left")
+
+    def run_trader_script(self, symbol=None):
+        try:
+            subprocess.run(["python", "Trading.py"] + (["--symbol", symbol] if symbol else []))
             self.append_bubble("🤖", "Trading simulation completed.", "left")
         except Exception as e:
             self.append_bubble("🤖", f"Error running trading simulation: {e}", "left")
 
-    def ask_lmstudio(self, user_text):
+    # Stream the reply on the scheduler and draw it from the Tk thread at a fixed frame rate
+    def start_reply(self, user_text):
+        reply = ReplyStream()
+        self.submit_reply(user_text, reply, key="chat")
+        self.root.after(STREAM_FRAME_MS, self.render_reply, reply)
+
+    # With a key, a new message supersedes the reply still being generated for the last one
+    def submit_reply(self, user_text, reply, key=None):
+        future = get_scheduler().submit(lambda client: self.generate_reply(client, user_text, reply), key=key)
+        future.add_done_callback(lambda done: reply.finish(stop_note(done)))
+        return future
+
+    def render_reply(self, reply):
+        text = reply.text
+        if text != reply.shown:
+            if reply.label is None:
+                reply.label = self.append_bubble("🤖", text, "left")
+                reply.time_to_first_token = time.perf_counter() - reply.started
+                self.first_token_times.append(reply.time_to_first_token)
+                print(f"Time to first token: {reply.time_to_first_token * 1000:.0f} ms "
+                      f"(median of last {len(self.first_token_times)}: "
+                      f"{statistics.median(self.first_token_times) * 1000:.0f} ms)")
+            else:
+                reply.label.config(text=text)
+            reply.shown = text
+        if not reply.done or reply.text != reply.shown:
+            self.root.after(STREAM_FRAME_MS, self.render_reply, reply)
+        elif reply.label is None:
+            self.append_bubble("🤖", "(No response)", "left")
+
+    async def generate_reply(self, client, user_text, reply):
+        question = self.conversation.message("user", user_text)
+        messages = self.conversation.context(question)
+        # A standalone question ("explain RSI") is keyed on the system prompt and the question
+        # alone, so it hits whatever was said before; anything else on its whole context
+        standalone = ResponseCache.is_standalone(user_text)
+        key = ResponseCache.cache_key(model, [messages[0], messages[-1]] if standalone else messages)
+        cached = get_response_cache().get(key)
+        if cached is not None:
+            reply.add(cached)
+        else:
+            try:
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        reply.add(chunk.choices[0].delta.content)
+            except Exception as e:
+                reply.add(f"\n\nError: {e}" if reply.text else f"Error: {e}")
+                return
+            if not reply.text:
+                return
+            get_response_cache().put(key, reply.text)
+
+        # Only complete exchanges go into the history; trimming it runs after the reply is shown
+        self.conversation.append(question, self.conversation.message("assistant", reply.text))
+        reply.finish()
+        threading.Thread(target=self.compact_history, daemon=True).start()
+
+    def compact_history(self):
         try:
-            response = client.chat.completions.create(
+            self.conversation.compact()
+        except CancelledError:
+            pass  # a new message came first; the turns are kept and compacted after its reply
+        except Exception as e:
+            print(f"Could not summarize older messages: {e}")
+
+    # Condense turns that no longer fit the context into a short summary (called off the event loop).
+    # It runs in the background, so the next chat message cancels it instead of queueing behind it
+    def summarize_turns(self, summary, messages):
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        prompt = ("Summarize this conversation in a few sentences. Keep names, numbers and decisions.\n"
+                  + (f"Earlier summary: {summary}\n" if summary else "") + f"\n{transcript}")
+
+        async def summarize(client):
+            response = await client.chat.completions.create(
                 model=model,
-                messages=[{"role": "user", "content": user_text}],
+                messages=[{"role": "user", "content": prompt}],
             )
-            message = response.choices[0].message.content
-            self.append_bubble("🤖", message, "left")
-        except Exception as e:
-            self.append_bubble("🤖", f"Error: {e}", "left")
+            return response.choices[0].message.content
+        return get_scheduler().submit(summarize, background=True).result()
 
     def append_bubble_from_bot(self, message):
         self.append_bubble("🤖", message, "left")
@@ -0,0 +1,298 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # Windows-only package - replay and backtests run without it
+    mt5 = None
+
+# Same values as the MetaTrader5.TIMEFRAME_* constants
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+TIMEFRAME_W1 = 32769
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+
+# Same fields as the tick returned by mt5.symbol_info_tick
+Tick = namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+
+
+def timeframe_seconds(timeframe: int) -> int:
+    """Length of an MT5 timeframe in seconds."""
+    if timeframe == TIMEFRAME_W1:
+        return 7 * 24 * 3600
+    if timeframe & 0x4000:  # hour based timeframes carry the hour count in the low bits
+        return (timeframe & 0x3FFF) * 3600
+    return timeframe * 60
+
+
+class MarketDataProvider:
+    """Source of rates and ticks exposing the subset of the MetaTrader5 API the bot uses."""
+
+    def is_connected(self) -> bool:
+        return True
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        raise NotImplementedError
+
+    def last_error(self) -> Tuple[int, str]:
+        return (1, 'Success')
+
+    def shutdown(self) -> None:
+        pass
+
+
+class MT5Provider(MarketDataProvider):
+    """Live data from the MetaTrader 5 terminal."""
+
+    def __init__(self):
+        if mt5 is None:
+            raise ImportError("MetaTrader5 package is not installed - use ReplayProvider instead")
+
+    def is_connected(self) -> bool:
+        return mt5.terminal_info() is not None
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        return mt5.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+    def symbol_info_tick(self, symbol: str):
+        return mt5.symbol_info_tick(symbol)
+
+    def copy_ticks_range(self, symbol: str, date_from: datetime, date_to: datetime) -> Optional[np.ndarray]:
+        return mt5.copy_ticks_range(symbol, date_from, date_to, mt5.COPY_TICKS_ALL)
+
+    def last_error(self) -> Tuple[int, str]:
+        return mt5.last_error()
+
+    def shutdown(self) -> None:
+        mt5.shutdown()
+
+
+def load_ticks(source: Union[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Load recorded ticks from a CSV/Parquet file or DataFrame.
+    Needs bid and ask plus either time_msc (epoch ms) or time (epoch seconds or timestamps).
+    """
+    if isinstance(source, pd.DataFrame):
+        df = source.copy()
+    elif os.path.splitext(source)[1].lower() in ('.parquet', '.pq'):
+        df = pd.read_parquet(source)
+    else:
+        df = pd.read_csv(source)
+    df.columns = [c.strip().lower() for c in df.columns]
+    if 'bid' not in df.columns or 'ask' not in df.columns:
+        raise ValueError("Tick data needs bid and ask columns")
+
+    if 'time_msc' not in df.columns:
+        if 'time' not in df.columns:
+            raise ValueError("Tick data needs a time or time_msc column")
+        if np.issubdtype(df['time'].dtype, np.number):
+            df['time_msc'] = (df['time'] * 1000).round().astype(np.int64)
+        else:
+            df['time_msc'] = pd.to_datetime(df['time']).to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    for column in ('last', 'volume', 'flags', 'volume_real'):
+        if column not in df.columns:
+            df[column] = 0
+    df = df.sort_values('time_msc', kind='stable').reset_index(drop=True)
+    return df[['time_msc', 'bid', 'ask', 'last', 'volume', 'flags', 'volume_real']]
+
+
+def record_ticks(provider: MT5Provider, symbol: str, date_from: datetime, date_to: datetime, path: str) -> int:
+    """Save ticks from the terminal to CSV/Parquet for later replay. Returns the tick count."""
+    ticks = provider.copy_ticks_range(symbol, date_from, date_to)
+    if ticks is None:
+        raise RuntimeError(f"Failed to get ticks: {provider.last_error()}")
+    df = pd.DataFrame(ticks)
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return len(df)
+
+
+class _SymbolTape:
+    """Recorded ticks of one symbol with bars aggregated per timeframe on demand."""
+
+    def __init__(self, ticks: pd.DataFrame):
+        self.time_msc = ticks['time_msc'].to_numpy(dtype=np.int64)
+        self.bid = ticks['bid'].to_numpy(dtype=np.float64)
+        self.ask = ticks['ask'].to_numpy(dtype=np.float64)
+        self.last = ticks['last'].to_numpy(dtype=np.float64)
+        self.volume = ticks['volume'].to_numpy()
+        self.flags = ticks['flags'].to_numpy()
+        self.volume_real = ticks['volume_real'].to_numpy(dtype=np.float64)
+        self._bars = {}
+
+    def tick(self, i: int) -> Tick:
+        return Tick(int(self.time_msc[i] // 1000), float(self.bid[i]), float(self.ask[i]), float(self.last[i]),
+                    int(self.volume[i]), int(self.time_msc[i]), int(self.flags[i]), float(self.volume_real[i]))
+
+    def bars(self, timeframe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Completed-bar rates (bid based, like MT5) and the first tick index of each bar."""
+        if timeframe not in self._bars:
+            seconds = timeframe_seconds(timeframe)
+            bar_time = self.time_msc // 1000 // seconds * seconds
+            starts = np.flatnonzero(np.r_[True, bar_time[1:] != bar_time[:-1]])
+            ends = np.r_[starts[1:], len(bar_time)]
+            rates = np.zeros(len(starts), dtype=RATES_DTYPE)
+            rates['time'] = bar_time[starts]
+            rates['open'] = self.bid[starts]
+            rates['high'] = np.maximum.reduceat(self.bid, starts)
+            rates['low'] = np.minimum.reduceat(self.bid, starts)
+            rates['close'] = self.bid[ends - 1]
+            rates['tick_volume'] = ends - starts
+            self._bars[timeframe] = (rates, starts)
+        return self._bars[timeframe]
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Stand-in for the MT5 terminal that replays recorded ticks.
+    speed=1.0 replays in real time, 100.0 runs 100x faster and None replays as fast
+    as possible: a symbol_info_tick call with no new tick for its symbol then steps the
+    shared clock to the next recorded tick of any symbol, so with several symbols each
+    one still sees its ticks one at a time, in time order across the whole replay.
+    Bars for copy_rates_from_pos are built from the ticks seen up to the replay clock,
+    so the newest bar is still forming exactly as it would be live.
+    """
+
+    def __init__(self, ticks: Dict[str, Union[str, pd.DataFrame]], speed: Optional[float] = None,
+                 start: Optional[datetime] = None):
+        self.speed = speed
+        self._tapes = {symbol: _SymbolTape(load_ticks(source)) for symbol, source in ticks.items()}
+        first = min(tape.time_msc[0] for tape in self._tapes.values())
+        self._start_msc = int(pd.Timestamp(start).value // 1_000_000) if start is not None else int(first)
+        self._end_msc = int(max(tape.time_msc[-1] for tape in self._tapes.values()))
+        self._clock_msc = self._start_msc
+        self._wall_start = time.monotonic()
+        self._delivered = {}  # ticks already returned per symbol
+        self._error = (1, 'Success')
+        self._lock = threading.Lock()
+
+    @property
+    def clock_msc(self) -> int:
+        """Current replay time in epoch milliseconds."""
+        if self.speed is not None:
+            elapsed = (time.monotonic() - self._wall_start) * 1000 * self.speed
+            self._clock_msc = max(self._clock_msc, min(self._start_msc + int(elapsed), self._end_msc))
+        return self._clock_msc
+
+    @property
+    def finished(self) -> bool:
+        return self.clock_msc >= self._end_msc
+
+    def _position(self, tape: _SymbolTape) -> int:
+        """Number of ticks of the tape visible at the replay clock."""
+        return int(np.searchsorted(tape.time_msc, self.clock_msc, side='right'))
+
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        tape = self._tapes.get(symbol)
+        if tape is None:
+            self._error = (-1, f'Unknown symbol {symbol}')
+            return None
+        with self._lock:
+            count = self._position(tape)
+            if self.speed is None and self._delivered.get(symbol) == count:
+                # As fast as possible - step to the earliest tick no symbol can see yet
+                upcoming = [other.time_msc[position] for other in self._tapes.values()
+                            for position in (self._position(other),) if position < len(other.time_msc)]
+                if upcoming:
+                    self._clock_msc = int(min(upcoming))
+                    count = self._position(tape)
+            self._delivered[symbol] = count
+        if count == 0:
+            self._error = (-1, f'No ticks for {symbol} yet')
+            return None
+        return tape.tick(count - 1)
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        tape = self._tapes.get(symbol)
+        if tape is None:
+            self._error = (-1, f'Unknown symbol {symbol}')
+            return None
+        with self._lock:
+            visible = self._position(tape)
+        if visible == 0:
+            self._error = (-1, f'No ticks for {symbol} yet')
+            return None
+
+        rates, starts = tape.bars(timeframe)
+        current = int(np.searchsorted(starts, visible - 1, side='right')) - 1
+        # Rebuild the forming bar from the ticks seen so far
+        forming = rates[current].copy()
+        first = starts[current]
+        forming['high'] = tape.bid[first:visible].max()
+        forming['low'] = tape.bid[first:visible].min()
+        forming['close'] = tape.bid[visible - 1]
+        forming['tick_volume'] = visible - first
+
+        newest = current - start_pos
+        oldest = max(newest - count + 1, 0)
+        if newest < 0:
+            self._error = (-1, 'Start position is beyond the available history')
+            return None
+        result = rates[oldest:newest + 1].copy()
+        if start_pos == 0:
+            result[-1] = forming
+        return result
+
+    def last_error(self) -> Tuple[int, str]:
+        return self._error
+
+
+class TickSubscription:
+    """
+    Single place that polls symbol_info_tick for a symbol at a high rate.
+    Listeners are called only when a new tick arrives (deduplicated by tick
+    time and prices), so everything downstream is driven by price changes.
+    """
+
+    def __init__(self, market: MarketDataProvider, symbol: str, interval: float = 0.05):
+        self.market = market
+        self.symbol = symbol
+        self.interval = interval
+        self.last_tick = None
+        self._listeners = []
+        self._stop = threading.Event()
+
+    def add_listener(self, callback) -> None:
+        self._listeners.append(callback)
+
+    def poll(self):
+        """Poll once. Returns the tick if it is new, otherwise None."""
+        tick = self.market.symbol_info_tick(self.symbol)
+        if tick is None:
+            return None
+        last = self.last_tick
+        if last is not None and (tick.time_msc, tick.bid, tick.ask) == (last.time_msc, last.bid, last.ask):
+            return None
+        self.last_tick = tick
+        for callback in self._listeners:
+            callback(tick)
+        return tick
+
+    def run(self, is_running=None) -> None:
+        """Poll until stop() is called or is_running() turns False."""
+        self._stop.clear()
+        while not self._stop.is_set() and (is_running is None or is_running()):
+            self.poll()
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
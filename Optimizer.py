@@ -0,0 +1,257 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from Backtest import generate_signals, load_bars, prepare_arrays, simulate_trades, summarize
+
+# Search space used when none is given: the weights, threshold and RSI/ATR formula of
+# analyze_signal and the SL/TP multipliers of calculate_optimal_levels
+DEFAULT_SPACE = {
+    'ema_cross_weight': [0.2, 0.4, 0.6],
+    'rsi_weight': [0.1, 0.3, 0.5],
+    'macd_weight': [0.1, 0.2, 0.4],
+    'price_weight': [0.1, 0.2],
+    'signal_threshold': [10, 15, 20, 25, 30],
+    'rsi_buy_base': [35, 40, 45],
+    'rsi_sell_base': [55, 60, 65],
+    'rsi_atr_scale': [500, 1000, 2000],
+    'base_sl_atr': [1.0, 1.5, 2.0],
+    'sl_mult_high_vol': [1.0, 1.2],
+    'sl_mult_low_vol': [1.5, 1.8],
+    'tp_mult_strong': [2.0, 2.5, 3.0],
+    'tp_mult_moderate': [1.5, 2.0],
+    'tp_mult_weak': [1.0, 1.5],
+}
+
+
+def param_grid(space: Dict[str, Sequence]) -> List[Dict[str, float]]:
+    """Every combination of the values in space."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_params(space: Dict[str, Sequence], samples: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Random configurations from space. A list of values is sampled from, a (low, high)
+    tuple is sampled uniformly. Duplicates are dropped, so fewer may be returned.
+    """
+    rng = np.random.default_rng(seed)
+    configs, seen = [], set()
+    for _ in range(samples):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                config[name] = float(rng.uniform(*values))
+            else:
+                config[name] = values[int(rng.integers(len(values)))]
+        key = tuple(config.values())
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def walk_forward_splits(n: int, train_bars: int, test_bars: int,
+                        step: Optional[int] = None) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Rolling (train, test) bar ranges; each test range directly follows its train range."""
+    step = step or test_bars
+    splits = []
+    start = 0
+    while start + train_bars + test_bars <= n:
+        train = (start, start + train_bars)
+        splits.append((train, (train[1], train[1] + test_bars)))
+        start += step
+    return splits
+
+
+class SharedArrays:
+    """
+    The prepared bar arrays in one shared memory block, so pool workers map
+    the same pages instead of each receiving a pickled copy.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.keys = list(arrays)
+        self.length = len(arrays[self.keys[0]])
+        shape = (len(self.keys), self.length)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        for row, key in enumerate(self.keys):
+            matrix[row] = arrays[key]
+
+    @property
+    def spec(self) -> Tuple[str, List[str], int]:
+        """What a worker needs to attach: block name, array names and length."""
+        return self._shm.name, self.keys, self.length
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Worker process state, set once by _attach
+_WORKER = {}
+
+
+def _attach(name: str, keys: List[str], length: int) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    matrix = np.ndarray((len(keys), length), dtype=np.float64, buffer=shm.buf)
+    _WORKER['shm'] = shm  # keep the mapping alive
+    _WORKER['arrays'] = {key: matrix[row] for row, key in enumerate(keys)}
+
+
+def _segment(a: Dict[str, np.ndarray], start: int, end: int) -> Dict[str, np.ndarray]:
+    # Look-back columns were computed on the full history, so slicing keeps them exact
+    return {key: values[start:end] for key, values in a.items()}
+
+
+def evaluate(a: Dict[str, np.ndarray], params: Dict[str, float], segments: List[Tuple[int, int]],
+             risk_per_trade: float = 10.0, one_position: bool = True) -> List[Dict[str, float]]:
+    """Backtest one configuration on each (start, end) bar range. Trades still open at the end are ignored."""
+    results = []
+    for start, end in segments:
+        part = _segment(a, start, end)
+        trades = simulate_trades(part, generate_signals(part, params), risk_per_trade, one_position)
+        results.append(summarize(trades))
+    return results
+
+
+def _evaluate_task(task) -> List[Dict[str, float]]:
+    params, segments, risk_per_trade, one_position = task
+    return evaluate(_WORKER['arrays'], params, segments, risk_per_trade, one_position)
+
+
+def _run_all(a: Dict[str, np.ndarray], configs: List[Dict[str, float]], segments: List[Tuple[int, int]],
+             workers: Optional[int], risk_per_trade: float, one_position: bool) -> List[List[Dict[str, float]]]:
+    """Evaluate every configuration on every segment, in worker processes unless workers is 0."""
+    tasks = [(params, segments, risk_per_trade, one_position) for params in configs]
+    if workers == 0:
+        return [evaluate(a, *task) for task in tasks]
+
+    workers = workers or os.cpu_count() or 1
+    shared = SharedArrays(a)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=shared.spec) as pool:
+            chunksize = max(1, len(tasks) // (workers * 8))
+            return list(pool.map(_evaluate_task, tasks, chunksize=chunksize))
+    finally:
+        shared.close()
+
+
+def _rows(configs: List[Dict[str, float]], stats: List[Dict[str, float]], prefix: str = '') -> pd.DataFrame:
+    table = pd.DataFrame(configs)
+    metrics = pd.DataFrame(stats).add_prefix(prefix)
+    return pd.concat([table.reset_index(drop=True), metrics], axis=1)
+
+
+def sweep(bars, configs: List[Dict[str, float]], objective: str = 'net_profit', workers: Optional[int] = None,
+          risk_per_trade: float = 10.0, one_position: bool = True, min_trades: int = 1) -> pd.DataFrame:
+    """
+    Backtest every configuration over all bars (DataFrame, CSV/Parquet path or prepared arrays).
+    Returns one row per configuration ranked by objective, best first; configurations with
+    fewer than min_trades closed trades rank last.
+    """
+    a = _arrays(bars)
+    results = _run_all(a, configs, [(0, len(a['close']))], workers, risk_per_trade, one_position)
+    table = _rows(configs, [stats[0] for stats in results])
+    return _rank(table, objective, table['trades'] >= min_trades)
+
+
+def walk_forward(bars, configs: List[Dict[str, float]], train_bars: int, test_bars: int,
+                 step: Optional[int] = None, objective: str = 'net_profit', workers: Optional[int] = None,
+                 risk_per_trade: float = 10.0, one_position: bool = True,
+                 min_trades: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Walk-forward optimization: in each fold the configuration with the best in-sample
+    objective is picked on the train range and scored on the following test range.
+    Every configuration is evaluated on all folds in one pool pass.
+    Returns the per-fold table and a ranking of all configurations by their mean
+    out-of-sample objective across folds.
+    """
+    a = _arrays(bars)
+    splits = walk_forward_splits(len(a['close']), train_bars, test_bars, step)
+    if not splits:
+        raise ValueError("Not enough bars for one train/test split")
+    segments = [segment for split in splits for segment in split]  # train0, test0, train1, test1, ...
+    results = _run_all(a, configs, segments, workers, risk_per_trade, one_position)
+
+    times = a['time']
+    folds = []
+    for fold, (train, test) in enumerate(splits):
+        train_stats = [stats[2 * fold] for stats in results]
+        in_sample = pd.DataFrame(train_stats)
+        score = in_sample[objective].where(in_sample['trades'] >= min_trades, -np.inf)
+        best = int(np.argmax(score.to_numpy()))
+        row = {
+            'fold': fold,
+            'train_start': pd.to_datetime(times[train[0]], unit='s'),
+            'test_start': pd.to_datetime(times[test[0]], unit='s'),
+            'test_end': pd.to_datetime(times[test[1] - 1], unit='s'),
+            'config': best,
+        }
+        row.update(configs[best])
+        row.update({f'train_{key}': value for key, value in train_stats[best].items()})
+        row.update({f'test_{key}': value for key, value in results[best][2 * fold + 1].items()})
+        folds.append(row)
+
+    out_of_sample = pd.DataFrame([
+        {'folds_positive': sum(stats[2 * fold + 1][objective] > 0 for fold in range(len(splits))),
+         f'mean_test_{objective}': np.mean([stats[2 * fold + 1][objective] for fold in range(len(splits))]),
+         'test_trades': sum(stats[2 * fold + 1]['trades'] for fold in range(len(splits)))}
+        for stats in results
+    ])
+    ranking = pd.concat([pd.DataFrame(configs), out_of_sample], axis=1)
+    ranking = _rank(ranking, f'mean_test_{objective}', ranking['test_trades'] >= min_trades)
+    return pd.DataFrame(folds), ranking
+
+
+def _arrays(bars) -> Dict[str, np.ndarray]:
+    if isinstance(bars, dict):
+        return bars
+    return prepare_arrays(load_bars(bars) if isinstance(bars, str) else bars)
+
+
+def _rank(table: pd.DataFrame, column: str, eligible: pd.Series) -> pd.DataFrame:
+    key = table[column].where(eligible, -np.inf)
+    order = np.argsort(-key.to_numpy(), kind='stable')
+    ranked = table.iloc[order].reset_index().rename(columns={'index': 'config'})
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parameter sweep and walk-forward optimizer for the trading strategy.")
+    parser.add_argument("bars", help="CSV or Parquet file with time, open, high, low, close columns")
+    parser.add_argument("--samples", type=int, default=2000, help="Random configurations to try (0 = full grid)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --samples")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs, 0 = in-process)")
+    parser.add_argument("--objective", default='net_profit', help="Statistic to maximize, e.g. profit_factor")
+    parser.add_argument("--min-trades", type=int, default=10, help="Ignore configurations with fewer closed trades")
+    parser.add_argument("--walk-forward", metavar="TRAIN:TEST", help="Walk-forward split in bars, e.g. 20000:5000")
+    parser.add_argument("--top", type=int, default=20, help="Rows of the ranking to print")
+    parser.add_argument("--out", help="Optional CSV path for the full ranking")
+    args = parser.parse_args()
+
+    configs = (random_params(DEFAULT_SPACE, args.samples, args.seed) if args.samples
+               else param_grid(DEFAULT_SPACE))
+    arrays = prepare_arrays(load_bars(args.bars))
+    print(f"Evaluating {len(configs)} configurations on {len(arrays['close'])} bars")
+    started = time.perf_counter()
+    if args.walk_forward:
+        train_bars, test_bars = (int(part) for part in args.walk_forward.split(':'))
+        folds, ranking = walk_forward(arrays, configs, train_bars, test_bars, objective=args.objective,
+                                      workers=args.workers, min_trades=args.min_trades)
+        print(folds.to_string(index=False))
+    else:
+        ranking = sweep(arrays, configs, objective=args.objective, workers=args.workers,
+                        min_trades=args.min_trades)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    print(ranking.head(args.top).to_string(index=False))
+    if args.out:
+        ranking.to_csv(args.out, index=False)
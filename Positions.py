@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BUY = 1
+SELL = -1
+
+
+class PositionBook:
+    """
+    Open simulated positions stored as parallel NumPy arrays (struct of arrays).
+    Every position gets an integer ID. Open positions are kept packed at the front
+    of the arrays and an ID -> slot map gives O(1) lookup and removal, so a tick
+    can be checked against all stops and targets in one vectorized operation.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._side = np.zeros(capacity, dtype=np.int8)
+        self._entry = np.zeros(capacity, dtype=np.float64)
+        self._sl = np.zeros(capacity, dtype=np.float64)
+        self._tp = np.zeros(capacity, dtype=np.float64)
+        self._units = np.zeros(capacity, dtype=np.float64)
+        self._entry_time = np.zeros(capacity, dtype='datetime64[us]')
+        self._slots: Dict[int, int] = {}
+        self._count = 0
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self._slots
+
+    def _grow(self) -> None:
+        for name in ('_ids', '_side', '_entry', '_sl', '_tp', '_units', '_entry_time'):
+            array = getattr(self, name)
+            grown = np.zeros(len(array) * 2, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def open(self, position_type: str, entry_price: float, stop_loss: float, take_profit: float,
+             units: float, entry_time: Optional[datetime] = None) -> int:
+        """Add a position and return its ID."""
+        if self._count == len(self._ids):
+            self._grow()
+        slot = self._count
+        position_id = self._next_id
+        self._next_id += 1
+
+        self._ids[slot] = position_id
+        self._side[slot] = BUY if position_type == 'BUY' else SELL
+        self._entry[slot] = entry_price
+        self._sl[slot] = stop_loss
+        self._tp[slot] = take_profit
+        self._units[slot] = units
+        self._entry_time[slot] = np.datetime64(entry_time or datetime.now(), 'us')
+        self._slots[position_id] = slot
+        self._count += 1
+        return position_id
+
+    def _record(self, slot: int) -> dict:
+        return {
+            'id': int(self._ids[slot]),
+            'type': 'BUY' if self._side[slot] == BUY else 'SELL',
+            'entry_price': float(self._entry[slot]),
+            'sl': float(self._sl[slot]),
+            'tp': float(self._tp[slot]),
+            'units': float(self._units[slot]),
+            'entry_time': self._entry_time[slot].item(),
+        }
+
+    def get(self, position_id: int) -> dict:
+        return self._record(self._slots[position_id])
+
+    def latest(self) -> Optional[dict]:
+        """The most recently opened position that is still open."""
+        if not self._count:
+            return None
+        return self._record(int(np.argmax(self._ids[:self._count])))
+
+    def positions(self) -> List[dict]:
+        return [self._record(slot) for slot in range(self._count)]
+
+    def close(self, position_id: int) -> dict:
+        """Remove a position (swapping the last open one into its slot) and return it."""
+        slot = self._slots.pop(position_id)
+        position = self._record(slot)
+        last = self._count - 1
+        if slot != last:
+            for array in (self._ids, self._side, self._entry, self._sl, self._tp, self._units, self._entry_time):
+                array[slot] = array[last]
+            self._slots[int(self._ids[slot])] = slot
+        self._count = last
+        return position
+
+    def exit_prices(self, bid: float, ask: float) -> np.ndarray:
+        """Price each open position is marked at (ask for BUY, bid for SELL, as the bot always did)."""
+        return np.where(self._side[:self._count] == BUY, ask, bid)
+
+    def hits(self, bid: float, ask: float) -> np.ndarray:
+        """IDs of all open positions whose stop loss or take profit is hit at this tick."""
+        n = self._count
+        side, sl, tp = self._side[:n], self._sl[:n], self._tp[:n]
+        price = self.exit_prices(bid, ask)
+        long_hit = (side == BUY) & ((price >= tp) | (price <= sl))
+        short_hit = (side == SELL) & ((price <= tp) | (price >= sl))
+        return self._ids[:n][long_hit | short_hit].copy()
+
+    def unrealized_pnl(self, bid: float, ask: float) -> float:
+        n = self._count
+        price = self.exit_prices(bid, ask)
+        return float(np.sum((price - self._entry[:n]) * self._units[:n] * self._side[:n]))
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def normalize(text: str) -> str:
+    """Case and whitespace don't change the question, so "Explain  RSI" matches "explain rsi"."""
+    return " ".join(text.split()).casefold()
+
+
+# Words that point back at the conversation ("what is my name?", "explain that again")
+_CONTEXT_WORDS = frozenset(
+    "i me my mine we us our you your it its it's this that that's these those they them their "
+    "he him his she her above earlier before previous again more else also same another why".split())
+
+
+def is_standalone(question: str) -> bool:
+    """True if the question doesn't refer to earlier turns, so its answer doesn't depend on them."""
+    return not _CONTEXT_WORDS.intersection(re.findall(r"[a-z']+", question.casefold()))
+
+
+def cache_key(model: str, messages: List[Dict[str, str]], **params) -> str:
+    """Hash of the model, the normalized messages and the request parameters."""
+    payload = {
+        'model': model,
+        'messages': [[message['role'], normalize(message['content'])] for message in messages],
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    LLM replies by cache_key, least recently used first. Entries expire ttl seconds
+    after they were stored and at most max_entries are kept. With a path the cache
+    is loaded from that JSON file and rewritten after every change, so it survives restarts.
+    Thread-safe.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000, ttl: float = 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (stored at, reply)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    entries = json.load(file)
+            except (OSError, ValueError):
+                entries = []  # unreadable cache, start over
+            now = time.time()
+            for key, stored_at, reply in entries[-max_entries:]:
+                if now - stored_at < ttl:
+                    self._entries[key] = (stored_at, reply)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, reply: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                try:
+                    self._save()
+                except OSError:
+                    pass  # still cached in memory
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump([[key, stored_at, reply] for key, (stored_at, reply) in self._entries.items()], file)
+        os.replace(temporary, self.path)  # readers never see a half-written file
@@ -0,0 +1,144 @@
+import argparse
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from MarketData import MarketDataProvider, MT5Provider, timeframe_seconds, TIMEFRAME_M1
+from Trading import GoldTradingBot
+
+
+class SymbolStrategy:
+    """Strategy state for one symbol/timeframe: a headless bot with its own indicators and positions."""
+
+    def __init__(self, bot: GoldTradingBot):
+        self.bot = bot
+        self.bar_seconds = timeframe_seconds(bot.timeframe)
+        self.next_close = 0.0  # server time when the forming bar closes
+        self.future: Optional[Future] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def on_rates(self, rates: np.ndarray) -> None:
+        """Update indicators with the fetched bars and run the strategy (worker thread)."""
+        try:
+            self.bot.indicators.update(rates)
+            df = self.bot.indicators.frame()
+            if len(df) >= 3:
+                # Score the bar that just closed, as on_tick does, not the one still forming
+                self.bot.process_market_data(df.iloc[:-1])
+        except Exception as e:
+            print(f"Strategy error for {self.bot.symbol}: {e}")
+
+
+class TradingScheduler:
+    """
+    Runs the trading strategy for many symbols and timeframes from one data-fetch loop.
+    The loop sleeps until the earliest forming bar closes, fetches every due
+    symbol in batches of batch_size and hands each batch's new bars to a worker pool,
+    so analysis of one batch starts while the next is still being fetched.
+    """
+
+    def __init__(self, market: MarketDataProvider, watchlist: List[Tuple[str, int]],
+                 max_workers: int = 4, batch_size: int = 10, close_delay: float = 0.5,
+                 max_sleep: float = 5.0, **bot_kwargs):
+        self.market = market
+        self.batch_size = batch_size
+        self.close_delay = close_delay  # grace period for the terminal to publish the new bar
+        self.max_sleep = max_sleep
+        self.strategies: Dict[Tuple[str, int], SymbolStrategy] = {}
+        for symbol, timeframe in watchlist:
+            bot = GoldTradingBot(symbol, timeframe, market=market, gui=False, **bot_kwargs)
+            self.strategies[(symbol, timeframe)] = SymbolStrategy(bot)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="strategy")
+        self._offset = None  # server time minus local time
+        self._stop = threading.Event()
+        self._thread = None
+
+    def server_time(self) -> float:
+        """Estimate the trade server clock from the latest tick."""
+        symbol = next(iter(self.strategies))[0]
+        tick = self.market.symbol_info_tick(symbol)
+        if tick is not None:
+            offset = tick.time_msc / 1000 - time.time()
+            # Tick times lag the server clock when quiet, so keep the largest offset seen
+            self._offset = offset if self._offset is None else max(self._offset, offset)
+        return time.time() + (self._offset or 0.0)
+
+    def fetch_batch(self, keys: List[Tuple[str, int]]) -> Dict[Tuple[str, int], np.ndarray]:
+        """
+        Fetch new bars for a batch of strategies, one copy_rates_from_pos call each:
+        MT5 has no call that fetches several symbols at once, so a batch only limits
+        how many fetches run before their bars are dispatched.
+        """
+        fetched = {}
+        for key in keys:
+            rates = self.strategies[key].bot.fetch_rates()
+            if rates is None or len(rates) == 0:
+                print(f"Failed to get rates for {key[0]}:", self.market.last_error())
+                continue
+            fetched[key] = rates
+        return fetched
+
+    def run_once(self) -> int:
+        """Fetch and dispatch every strategy whose bar has closed. Returns the number dispatched."""
+        now = self.server_time()
+        due = [key for key, strategy in self.strategies.items()
+               if strategy.next_close <= now and not strategy.busy]
+        dispatched = 0
+        for start in range(0, len(due), self.batch_size):
+            for key, rates in self.fetch_batch(due[start:start + self.batch_size]).items():
+                strategy = self.strategies[key]
+                strategy.next_close = float(rates['time'][-1]) + strategy.bar_seconds
+                strategy.future = self.executor.submit(strategy.on_rates, rates)
+                dispatched += 1
+        return dispatched
+
+    def seconds_until_next_close(self) -> float:
+        """Time to sleep before the earliest forming bar closes (plus the grace period)."""
+        next_close = min(strategy.next_close for strategy in self.strategies.values())
+        return max(next_close - self.server_time() + self.close_delay, 0.0)
+
+    def run(self) -> None:
+        """Scheduler loop - driven by bar closes instead of a fixed sleep."""
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(min(self.seconds_until_next_close(), self.max_sleep))
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+            print(f"Scheduler started for {len(self.strategies)} strategies")
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self.executor.shutdown(wait=wait)
+        print("Scheduler stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the trading strategy for several symbols at once.")
+    parser.add_argument("symbols", nargs="+", help="Symbols to watch, e.g. XAUUSD EURUSD")
+    parser.add_argument("--timeframe", type=int, default=TIMEFRAME_M1, help="MT5 timeframe constant")
+    parser.add_argument("--workers", type=int, default=4, help="Analysis worker threads")
+    args = parser.parse_args()
+
+    market = MT5Provider()
+    scheduler = TradingScheduler(market, [(symbol, args.timeframe) for symbol in args.symbols],
+                                 max_workers=args.workers, demo_account=True)
+    scheduler.start()
+    try:
+        while True:
+            time.sleep(60)
+            for (symbol, _), strategy in scheduler.strategies.items():
+                print(f"{symbol}: balance ${strategy.bot.simulated_balance:.2f}, trades {strategy.bot.total_trades}")
+    except KeyboardInterrupt:
+        scheduler.stop()
+        market.shutdown()
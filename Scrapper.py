@@ -1,33 +1,73 @@
+import atexit
+import hashlib
 import json
+import os
+import queue
+import re
+import threading
 import time
-import random
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from transformers import pipeline
-import torch
+from Browser import DomainRateLimiter, DriverPool
+from TweetStore import TweetStore
+
+# Site to scrape; point it at a FixtureServer to run offline
+BASE_URL = os.environ.get("LEX_TWITTER_URL", "https://twitter.com")
+CREDENTIALS_PATH = "credentials.json"
 
 # Load Twitter credentials from a JSON file
 def load_credentials():
-    with open("credentials.json", "r") as file:
+    with open(CREDENTIALS_PATH, "r") as file:
         return json.load(file)
 
+# Browser session state kept between runs (login cookies, resolved driver path)
+SESSION_DIR = "browser_session"
+COOKIES_PATH = os.path.join(SESSION_DIR, "twitter_cookies.json")
+DRIVER_PATH_FILE = os.path.join(SESSION_DIR, "chromedriver_path.txt")
+
+BROWSER_SESSIONS = 3  # concurrent browsers for multi-keyword scraping
+TWITTER_RATE = 0.5  # page loads/scrolls per second across all sessions
+TWITTER_BURST = 5
+
+_driver_path = None
+
+# ChromeDriverManager checks for driver updates online, so resolve it once and remember the path
+def get_driver_path():
+    global _driver_path
+    if _driver_path is None:
+        if os.path.exists(DRIVER_PATH_FILE):
+            with open(DRIVER_PATH_FILE, "r") as file:
+                cached = file.read().strip()
+            if os.path.exists(cached):
+                _driver_path = cached
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+            os.makedirs(SESSION_DIR, exist_ok=True)
+            with open(DRIVER_PATH_FILE, "w") as file:
+                file.write(_driver_path)
+    return _driver_path
+
 # Set up the browser driver
 def init_driver():
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")  # Run in headless mode
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_driver_path())
     return webdriver.Chrome(service=service, options=options)
 
 # Login to Twitter, handle extra email verification step
 def login_twitter(driver, username, password):
-    driver.get("https://twitter.com/login")
+    driver.get(f"{BASE_URL}/login")
     wait = WebDriverWait(driver, 20)
     
     # Step 1: Enter username
@@ -50,82 +90,531 @@ def login_twitter(driver, username, password):
     password_input = wait.until(EC.presence_of_element_located((By.NAME, "password")))
     password_input.send_keys(password)
     password_input.send_keys(Keys.RETURN)
-    time.sleep(5)
+    wait.until(is_logged_in)
+
+def is_logged_in(driver):
+    return driver.get_cookie("auth_token") is not None
+
+# Warm, logged-in browsers reused across scrape jobs (created on first use)
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            def login(driver):
+                credentials = load_credentials()
+                login_twitter(driver, credentials["username"], credentials["password"])
+            _driver_pool = DriverPool(init_driver, login, is_logged_in, f"{BASE_URL}/home",
+                                      size=BROWSER_SESSIONS, cookies_path=COOKIES_PATH)
+            atexit.register(_driver_pool.close)
+    return _driver_pool
+
+# One request budget per site shared by every session
+rate_limiter = DomainRateLimiter(TWITTER_RATE, TWITTER_BURST)
+
+# Every scraped tweet and its label, so repeat searches only scrape what's new
+STORE_PATH = os.path.join("history", "tweets.db")
+_tweet_store = None
+_tweet_store_lock = threading.Lock()
 
-# Search for tweets
-def search_tweets(driver, keyword, num_tweets=100, lang="en"):
-    search_url = f"https://twitter.com/search?q={keyword}&lang={lang}&f=live"
+def get_tweet_store():
+    global _tweet_store
+    with _tweet_store_lock:
+        if _tweet_store is None:
+            _tweet_store = TweetStore(STORE_PATH)
+            atexit.register(_tweet_store.close)
+    return _tweet_store
+
+Tweet = namedtuple("Tweet", ["id", "text", "created_at"])
+
+# Articles already extracted are tagged, so each pass only reads the newly added ones.
+# The tweet ID comes from the permalink around the timestamp (falls back to any status link).
+_NEW_ARTICLES_JS = "return document.querySelectorAll('article:not([data-lex-seen])').length > 0;"
+_EXTRACT_NEW_JS = """
+const tweets = [];
+for (const article of document.querySelectorAll('article:not([data-lex-seen])')) {
+    article.setAttribute('data-lex-seen', '1');
+    const time = article.querySelector('time');
+    const link = (time && time.closest('a[href*="/status/"]')) || article.querySelector('a[href*="/status/"]');
+    const text = article.querySelector('div[lang]');
+    const match = link && link.getAttribute('href').match(/status\\/(\\d+)/);
+    if (match && text) {
+        tweets.push([match[1], text.innerText, time ? time.getAttribute('datetime') : null]);
+    }
+}
+return tweets;
+"""
+
+# Search for tweets, yielding each new tweet as soon as it is on the page
+# Latest results come first, so with known IDs given the search stops once it reaches tweets
+# it has seen before (after stop_after_known in a row, as pinned tweets can be old)
+def search_tweets(driver, keyword, num_tweets=100, lang="en", min_wait=1.0, max_wait=10.0, rate_limiter=None,
+                  known=None, stop_after_known=3):
+    search_url = f"{BASE_URL}/search?q={quote(keyword)}&lang={lang}&f=live"
+    if rate_limiter:
+        rate_limiter.acquire(search_url)
     driver.get(search_url)
-    time.sleep(3)
-    
-    tweets = set()
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    
-    while len(tweets) < num_tweets:
-        elements = driver.find_elements(By.XPATH, "//article//div[@lang]")
-        for el in elements:
-            tweets.add(el.text)
-            if len(tweets) >= num_tweets:
-                break
-        
+
+    seen = set()
+    known_in_a_row = 0
+    latency = None  # smoothed time it takes new tweets to show up
+    timeout = max_wait  # the first page load gets the full wait
+    while len(seen) < num_tweets:
+        started = time.monotonic()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_NEW_ARTICLES_JS))
+        except TimeoutException:
+            break  # nothing new within the timeout - end of results
+        elapsed = time.monotonic() - started
+        latency = elapsed if latency is None else 0.7 * latency + 0.3 * elapsed
+        timeout = min(max(4 * latency, min_wait), max_wait)
+
+        for tweet_id, text, created_at in driver.execute_script(_EXTRACT_NEW_JS):
+            if tweet_id in seen:
+                continue
+            seen.add(tweet_id)
+            if known and tweet_id in known:
+                known_in_a_row += 1
+                if known_in_a_row >= stop_after_known:
+                    return
+                continue
+            known_in_a_row = 0
+            yield Tweet(tweet_id, text, created_at)
+            if len(seen) >= num_tweets:
+                return
+
+        if rate_limiter:
+            rate_limiter.acquire(search_url)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(2, 4))
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        
-        if new_height == last_height:
-            break
-        last_height = new_height
-    
-    return list(tweets)
 
 # Sentiment analysis using BERT
-bert_classifier = pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment")
+MODEL_NAME = "nlptown/bert-base-multilingual-uncased-sentiment"
+BATCH_SIZE = 32
+MAX_LENGTH = 512  # BERT's position limit, longer tweets are truncated
+CACHE_SIZE = 10000
+
+# "pipeline" runs the full-precision model, "int8" a dynamically quantized copy and
+# "onnx" an ONNX Runtime export (written to ONNX_PATH on first use)
+BACKENDS = ("pipeline", "int8", "onnx")
+SENTIMENT_BACKEND = os.environ.get("LEX_SENTIMENT_BACKEND", "pipeline")
+ONNX_PATH = os.path.join("models", "sentiment.onnx")
+
+# Set to a SentimentServer.SentimentService to classify in the shared model process
+sentiment_service = None
+
+# (backend, content hash) -> sentiment, least recently used first
+_sentiment_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# torch/transformers and the model are loaded on first use, not at import
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_classifier():
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                from transformers import pipeline
+                _classifier = pipeline("sentiment-analysis", model=MODEL_NAME)
+    return _classifier
+
+# Backend name -> (run, tensor type): run takes tokenized inputs and returns label ids
+_backends = {}
+_backend_lock = threading.Lock()
+
+def get_backend(name=None):
+    name = name or SENTIMENT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{name}', expected one of {BACKENDS}")
+    if name not in _backends:
+        with _backend_lock:
+            if name not in _backends:
+                _backends[name] = _load_backend(name)
+    return _backends[name]
+
+def _load_backend(name):
+    import torch
+    model = get_classifier().model.eval()
+    if name == "onnx":
+        return _load_onnx(model)
+    if name == "int8":
+        # Linear layers hold nearly all of BERT's weights, so they are the ones worth quantizing
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def run(encoded):
+        with torch.inference_mode():
+            return model(**encoded).logits.argmax(dim=-1).tolist()
+    return run, "pt"
+
+def export_onnx(model, path=None):
+    import torch
+    path = path or ONNX_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    sample = get_classifier().tokenizer(["export sample"], return_tensors="pt")
+    axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    axes["logits"] = {0: "batch"}
+    torch.onnx.export(model, tuple(sample[name] for name in names), path, input_names=names,
+                      output_names=["logits"], dynamic_axes=axes, opset_version=17, dynamo=False)
+
+def _load_onnx(model):
+    import onnxruntime
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    if not os.path.exists(ONNX_PATH):
+        # Export in full precision, then store int8 weights for ONNX Runtime's integer kernels
+        full_precision = ONNX_PATH + ".fp32"
+        export_onnx(model, full_precision)
+        quantize_dynamic(full_precision, ONNX_PATH, weight_type=QuantType.QInt8)
+        os.remove(full_precision)
+    session = onnxruntime.InferenceSession(ONNX_PATH, providers=["CPUExecutionProvider"])
+    inputs = [node.name for node in session.get_inputs()]
+
+    def run(encoded):
+        feed = {name: encoded[name].astype("int64") for name in inputs}
+        return session.run(None, feed)[0].argmax(axis=-1).tolist()
+    return run, "np"
+
+# Load the model in the background so the first analysis doesn't wait for it
+def start_warm_up():
+    def warm_up():
+        try:
+            get_backend()
+        except Exception as e:
+            print(f"Sentiment model warm-up failed: {e}")
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
+
+def star_to_sentiment(label):
+    if "1 star" in label or "2 star" in label:
+        return "Negative"
+    elif "4 star" in label or "5 star" in label:
+        return "Positive"
+    return "Neutral"
+
+# Retweets and copies differ only in the "RT @user:" prefix, case and whitespace
+def content_key(tweet):
+    text = re.sub(r"^RT @\w+:\s*", "", tweet.strip())
+    text = " ".join(text.split()).lower()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+# Token IDs of each text, truncated to what the model reads but not padded
+def _encode(texts):
+    return get_classifier().tokenizer(list(texts), truncation=True, max_length=MAX_LENGTH)
+
+# One forward pass for a batch of texts (or their _encode output), padded to the longest text in the batch
+def _predict(texts, backend=None, encoded=None):
+    classifier = get_classifier()
+    run, tensors = get_backend(backend)
+    encoded = classifier.tokenizer.pad(encoded or _encode(texts), padding=True, return_tensors=tensors)
+    return [classifier.model.config.id2label[i] for i in run(encoded)]
+
+# Classify tweets in length-bucketed batches, scoring each distinct text once
+# (hashes are the tweets' content_key values, when the caller already has them)
+def classify_tweets(tweets, batch_size=BATCH_SIZE, backend=None, hashes=None):
+    backend = backend or SENTIMENT_BACKEND
+    keys = [(backend, key) for key in (hashes or map(content_key, tweets))]
+    results = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _sentiment_cache:
+                _sentiment_cache.move_to_end(key)
+                results[key] = _sentiment_cache[key]
 
-def analyze_sentiment(tweets, update_callback=None):
+    pending = {}
+    for key, tweet in zip(keys, tweets):
+        if key not in results and key not in pending:
+            pending[key] = tweet
+    if pending:
+        # Sorting by token count keeps similar lengths together, so batches carry little padding.
+        # Each text is tokenized once here and the batches are padded from these IDs.
+        texts = list(pending.values())
+        encoded = _encode(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+        pending_keys = list(pending)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            labels = _predict([texts[i] for i in batch], backend,
+                              {name: [values[i] for i in batch] for name, values in encoded.items()})
+            for i, label in zip(batch, labels):
+                results[pending_keys[i]] = star_to_sentiment(label)
+
+        with _cache_lock:
+            for key in pending_keys:
+                _sentiment_cache[key] = results[key]
+                _sentiment_cache.move_to_end(key)
+            while len(_sentiment_cache) > CACHE_SIZE:
+                _sentiment_cache.popitem(last=False)
+
+    return [results[key] for key in keys]
+
+# Accuracy parity and speed of each backend against the reference, bypassing the cache
+def compare_backends(texts, backends=("int8", "onnx"), reference="pipeline", batch_size=BATCH_SIZE):
+    def timed_run(backend):
+        get_backend(backend)  # loading/exporting is not part of the timing
+        started = time.perf_counter()
+        labels = []
+        for start in range(0, len(texts), batch_size):
+            labels += _predict(texts[start:start + batch_size], backend)
+        return labels, time.perf_counter() - started
+
+    expected, reference_seconds = timed_run(reference)
+    expected_buckets = [star_to_sentiment(label) for label in expected]
+    report = {reference: {"label_agreement": 1.0, "sentiment_agreement": 1.0, "seconds": reference_seconds}}
+    for backend in backends:
+        labels, seconds = timed_run(backend)
+        report[backend] = {
+            "label_agreement": sum(a == b for a, b in zip(labels, expected)) / len(texts),
+            "sentiment_agreement": sum(star_to_sentiment(a) == b for a, b in zip(labels, expected_buckets)) / len(texts),
+            "seconds": seconds,
+        }
+    return report
+
+def _classify(texts, backend=None, hashes=None):
+    if sentiment_service is not None and backend is None:
+        return sentiment_service.classify(texts)
+    return classify_tweets(texts, backend=backend, hashes=hashes)
+
+def _tweet_line(text, sentiment):
+    return f"📝 {text[:120]}...\n📊 Sentiment: {sentiment}\n"
+
+def _summary(counts, total):
+    return (f"\n✅ Sentiment Summary:\n"
+            f"Positive: {counts['positive'] / total * 100:.1f}%\n"
+            f"Neutral: {counts['neutral'] / total * 100:.1f}%\n"
+            f"Negative: {counts['negative'] / total * 100:.1f}%\n")
+
+def analyze_sentiment(tweets, update_callback=None, backend=None):
     bert_results = {"positive": 0, "neutral": 0, "negative": 0}
-    display = ""
-
-    for i, tweet in enumerate(tweets[:5]):  # Show first 5 tweets
-        bert_prediction = bert_classifier(tweet)[0]['label']
-        if "1 star" in bert_prediction or "2 star" in bert_prediction:
-            sentiment = "Negative"
-        elif "4 star" in bert_prediction or "5 star" in bert_prediction:
-            sentiment = "Positive"
-        else:
-            sentiment = "Neutral"
+
+    sentiments = _classify(tweets, backend)
+    for sentiment in sentiments:
         bert_results[sentiment.lower()] += 1
 
-        line = f"📝 {tweet[:120]}...\n📊 Sentiment: {sentiment}\n"
-        display += line
+    for tweet, sentiment in zip(tweets[:5], sentiments):  # Show first 5 tweets
         if update_callback:
-            update_callback(line)
+            update_callback(_tweet_line(tweet, sentiment))
 
     total = len(tweets)
     if total == 0:
         return "❌ No tweets found."
+    return _summary(bert_results, total)
+
+# Marks the end of a stage's output
+_END = object()
 
-    summary = (f"\n✅ Sentiment Summary:\n"
-               f"Positive: {bert_results['positive'] / total * 100:.1f}%\n"
-               f"Neutral: {bert_results['neutral'] / total * 100:.1f}%\n"
-               f"Negative: {bert_results['negative'] / total * 100:.1f}%\n")
-    return summary
+# put() that gives up when the pipeline is stopped, so a blocked stage can't hang forever
+def _put(stage_queue, item, stop):
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def _scrape_stage(tweets, raw, stop, errors):
+    try:
+        for tweet in tweets:
+            if not _put(raw, tweet, stop):
+                return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        _put(raw, _END, stop)
+
+# Labels of tweets the store already has (same text under another ID) skip the model
+def _classify_with_store(texts, keys, backend, store):
+    stored = store.labels_for_hashes(keys)
+    missing = [(text, key) for text, key in zip(texts, keys) if key not in stored]
+    labels = iter(_classify([text for text, _ in missing], backend, hashes=[key for _, key in missing])
+                  if missing else [])
+    return [stored[key] if key in stored else next(labels) for key in keys]
+
+# Take whatever is queued (up to batch_size) so the model gets full batches while tweets stream in
+def _classify_stage(raw, classified, stop, errors, batch_size, backend, store=None):
+    try:
+        done = False
+        while not done and not stop.is_set():
+            try:
+                batch = [raw.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            while len(batch) < batch_size and batch[-1] is not _END:
+                try:
+                    batch.append(raw.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _END:
+                batch.pop()
+                done = True
+            if batch:
+                texts = [getattr(tweet, "text", tweet) for tweet in batch]
+                if store:
+                    # Hashed once here, then reused for the stored labels, the cache and the store
+                    keys = [content_key(text) for text in texts]
+                    sentiments = _classify_with_store(texts, keys, backend, store)
+                else:
+                    keys, sentiments = None, _classify(texts, backend)
+                if not _put(classified, (batch, sentiments, keys), stop):
+                    return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        _put(classified, _END, stop)
+
+def run_sentiment_pipeline(tweets, update_callback=None, batch_size=BATCH_SIZE, queue_size=256,
+                           report_every=1.0, backend=None):
+    counts, total = sentiment_pipeline_counts(tweets, update_callback, batch_size, queue_size, report_every, backend)
+    if total == 0:
+        return "❌ No tweets found."
+    return _summary(counts, total)
+
+def sentiment_pipeline_counts(tweets, update_callback=None, batch_size=BATCH_SIZE, queue_size=256,
+                              report_every=1.0, backend=None, store=None, query=None):
+    """
+    Scrape -> classify -> aggregate, each stage on its own thread joined by bounded
+    queues. Scrolling pauses while the queues are full and the model classifies
+    while the browser loads more, and only running totals are kept in memory.
+    tweets is any iterable of Tweet or text (e.g. the search_tweets generator).
+    Running totals go to update_callback at most every report_every seconds.
+    With a TweetStore, stored labels are reused and each Tweet is recorded under
+    query, a (keyword, lang) pair.
+    Returns the sentiment counts and the number of tweets.
+    """
+    raw, classified = queue.Queue(queue_size), queue.Queue(queue_size)
+    stop = threading.Event()
+    errors = []
+    workers = [
+        threading.Thread(target=_scrape_stage, args=(tweets, raw, stop, errors), daemon=True),
+        threading.Thread(target=_classify_stage, args=(raw, classified, stop, errors, batch_size, backend, store),
+                         daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Aggregation stage
+    counts = {"positive": 0, "neutral": 0, "negative": 0}
+    total = 0
+    last_report = time.monotonic()
+    try:
+        while True:
+            item = classified.get()
+            if item is _END:
+                break
+            batch, sentiments, keys = item
+            if store:
+                store.add(*query, [(tweet.id, tweet.created_at, key) for tweet, key in zip(batch, keys)], sentiments)
+            for tweet, sentiment in zip(batch, sentiments):
+                if total < 5 and update_callback:  # Show first 5 tweets
+                    update_callback(_tweet_line(getattr(tweet, "text", tweet), sentiment))
+                counts[sentiment.lower()] += 1
+                total += 1
+            if update_callback and time.monotonic() - last_report >= report_every:
+                last_report = time.monotonic()
+                update_callback(f"📊 {total} tweets so far: "
+                                f"Positive {counts['positive'] / total * 100:.0f}% | "
+                                f"Neutral {counts['neutral'] / total * 100:.0f}% | "
+                                f"Negative {counts['negative'] / total * 100:.0f}%")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+    if errors:
+        raise errors[0]
+    return counts, total
+
+def format_keyword_report(results):
+    lines = ["\n✅ Sentiment by keyword:"]
+    for (keyword, lang), outcome in results.items():
+        if isinstance(outcome, Exception):
+            lines.append(f"{keyword} ({lang}): ❌ {outcome}")
+            continue
+        counts, total = outcome
+        if total == 0:
+            lines.append(f"{keyword} ({lang}): no tweets found")
+            continue
+        lines.append(f"{keyword} ({lang}): {total} tweets | "
+                     f"Positive {counts['positive'] / total * 100:.1f}% | "
+                     f"Neutral {counts['neutral'] / total * 100:.1f}% | "
+                     f"Negative {counts['negative'] / total * 100:.1f}%")
+    return "\n".join(lines) + "\n"
+
+# Scrape only tweets newer than the stored ones, then top up to num_tweets from the store
+def scrape_incremental(driver, keyword, num_tweets, lang, update_callback=None, store=None, rate_limiter=None):
+    store = store or get_tweet_store()
+    query = (keyword, lang)
+    known = store.known_ids(*query)
+    tweets = search_tweets(driver, keyword, num_tweets, lang, rate_limiter=rate_limiter, known=known)
+    counts, total = sentiment_pipeline_counts(tweets, update_callback, store=store, query=query)
+    if total < num_tweets and known:
+        # The newest num_tweets stored include at most total new ones
+        stored = [label for tweet_id, label in store.recent(*query, num_tweets) if tweet_id in known]
+        stored = stored[:num_tweets - total]
+        for label in stored:
+            counts[label.lower()] += 1
+        if update_callback and stored:
+            update_callback(f"♻️ {total} new tweets, {len(stored)} stored labels reused.")
+        total += len(stored)
+    return counts, total
+
+# Concurrent sessions share the site's request budget; a single session only waits on the page
+def _scrape_counts(query, num_tweets):
+    keyword, lang = query
+    with get_driver_pool().session() as driver:
+        return scrape_incremental(driver, keyword, num_tweets, lang, rate_limiter=rate_limiter)
+
+# Scrape several (keyword, lang) queries at once, one pooled browser per query in flight
+def scrape_keywords(queries, num_tweets=100, update_callback=None, workers=None):
+    queries = list(dict.fromkeys(queries))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers or BROWSER_SESSIONS) as executor:
+        futures = {executor.submit(_scrape_counts, query, num_tweets): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                results[query] = future.result()
+                message = f"✅ {query[0]} ({query[1]}): {results[query][1]} tweets analyzed."
+            except Exception as e:
+                results[query] = e
+                message = f"❌ {query[0]} ({query[1]}): {e}"
+            if update_callback:
+                update_callback(message)
+    return {query: results[query] for query in queries}
 
 # ✅ Entry point for GUI chatbot
 def run_scraper_interactive(keyword, num_tweets, lang, update_callback):
-    credentials = load_credentials()
-    driver = init_driver()
     try:
-        update_callback("🔐 Logging into Twitter...")
-        login_twitter(driver, credentials["username"], credentials["password"])
-        
-        update_callback(f"🔍 Scraping tweets for '{keyword}' in '{lang}'...")
-        tweets = search_tweets(driver, keyword, num_tweets, lang)
-        update_callback(f"✅ Fetched {len(tweets)} tweets.")
-        
-        update_callback("📊 Analyzing sentiment with BERT...")
-        result = analyze_sentiment(tweets, update_callback)
-        update_callback(result)
+        update_callback("🔐 Getting a logged-in Twitter session...")
+        with get_driver_pool().session() as driver:
+            update_callback(f"🔍 Scraping tweets for '{keyword}' in '{lang}' and analyzing sentiment with BERT...")
+            counts, total = scrape_incremental(driver, keyword, num_tweets, lang, update_callback)
+        update_callback(_summary(counts, total) if total else "❌ No tweets found.")
     except Exception as e:
         update_callback(f"❌ Error: {e}")
-    finally:
-        driver.quit()
+
+# ✅ Several keywords at once, e.g. "gold, XAUUSD, silver"
+def run_keywords_interactive(keywords, num_tweets, lang, update_callback):
+    try:
+        queries = [(keyword, lang) for keyword in keywords]
+        update_callback(f"🔍 Scraping {len(queries)} keywords with up to {BROWSER_SESSIONS} browsers...")
+        results = scrape_keywords(queries, num_tweets, update_callback)
+        update_callback(format_keyword_report(results))
+    except Exception as e:
+        update_callback(f"❌ Error: {e}")
+
+# ✅ Daily sentiment for a keyword from the store, no scraping
+def sentiment_history_report(keyword, lang=None, period="day"):
+    rows = get_tweet_store().sentiment_over_time(keyword, lang, period)
+    if not rows:
+        return f"❌ No stored tweets for '{keyword}'."
+    lines = [f"📈 Sentiment over time for '{keyword}' (per {period}):"]
+    for bucket, positive, neutral, negative in rows:
+        total = positive + neutral + negative
+        lines.append(f"{bucket}: {total} tweets | Positive {positive / total * 100:.0f}% | "
+                     f"Neutral {neutral / total * 100:.0f}% | Negative {negative / total * 100:.0f}%")
+    return "\n".join(lines)
@@ -0,0 +1,155 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional, Tuple
+
+
+def collect_batch(requests: queue.Queue, max_batch: int, max_wait: float) -> list:
+    """
+    Block for one request, then keep taking requests until max_batch texts are
+    gathered or max_wait seconds have passed. Requests are (connection, id, texts).
+    """
+    batch = [requests.get()]
+    size = len(batch[0][2])
+    deadline = time.monotonic() + max_wait
+    while size < max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            request = requests.get(timeout=remaining)
+        except queue.Empty:
+            break
+        batch.append(request)
+        size += len(request[2])
+    return batch
+
+
+def _read_requests(connection, requests: queue.Queue) -> None:
+    try:
+        while True:
+            request_id, texts = connection.recv()
+            requests.put((connection, request_id, texts))
+    except (EOFError, OSError):
+        connection.close()
+
+
+def _accept(listener: Listener, requests: queue.Queue) -> None:
+    while True:
+        connection = listener.accept()
+        threading.Thread(target=_read_requests, args=(connection, requests), daemon=True).start()
+
+
+def _serve(addresses, authkey: bytes, backend: Optional[str], max_batch: int, max_wait: float) -> None:
+    """Server process: load the model once and answer micro-batched requests from every client."""
+    import Scrapper
+    listener = Listener(('127.0.0.1', 0), authkey=authkey)
+    requests = queue.Queue()
+    threading.Thread(target=_accept, args=(listener, requests), daemon=True).start()
+    Scrapper.get_backend(backend)
+    addresses.put(listener.address)
+
+    while True:
+        batch = collect_batch(requests, max_batch, max_wait)
+        texts = [text for _, _, request_texts in batch for text in request_texts]
+        try:
+            # One call for the whole batch, so duplicates across requests are scored once too
+            sentiments, error = Scrapper.classify_tweets(texts, backend=backend), None
+        except Exception as e:
+            sentiments, error = None, str(e)
+
+        start = 0
+        for connection, request_id, request_texts in batch:
+            end = start + len(request_texts)
+            try:
+                connection.send((request_id, sentiments[start:end] if error is None else None, error))
+            except OSError:
+                pass  # client went away
+            start = end
+
+
+class SentimentClient:
+    """Connection to a sentiment server. Thread-safe: concurrent calls share the connection."""
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes):
+        self._connection = Client(address, authkey=authkey)
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._receiver = threading.Thread(target=self._receive, daemon=True)
+        self._receiver.start()
+
+    def classify(self, texts: List[str], timeout: Optional[float] = None) -> List[str]:
+        """Positive/Neutral/Negative for each text."""
+        if not texts:
+            return []
+        request_id = next(self._ids)
+        future = Future()
+        self._pending[request_id] = future
+        try:
+            with self._send_lock:
+                self._connection.send((request_id, list(texts)))
+            return future.result(timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _receive(self) -> None:
+        try:
+            while True:
+                request_id, sentiments, error = self._connection.recv()
+                future = self._pending.get(request_id)
+                if future is None:
+                    continue
+                if error is None:
+                    future.set_result(sentiments)
+                else:
+                    future.set_exception(RuntimeError(f"Sentiment server error: {error}"))
+        except (EOFError, OSError):
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("Sentiment server connection closed"))
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SentimentService:
+    """
+    Sentiment model in its own long-lived process, shared by every scrape job.
+    Requests arriving within max_wait seconds of each other are classified as one
+    micro-batch of up to max_batch texts, so concurrent jobs share forward passes
+    and none of them runs the model under the GUI process's GIL.
+    """
+
+    def __init__(self, backend: Optional[str] = None, max_batch: int = 64, max_wait: float = 0.01,
+                 start_timeout: float = 300.0):
+        self.authkey = os.urandom(16)
+        # spawn avoids forking a process that holds Tk and running threads
+        context = multiprocessing.get_context('spawn')
+        addresses = context.Queue()
+        self.process = context.Process(target=_serve, args=(addresses, self.authkey, backend, max_batch, max_wait),
+                                       daemon=True)
+        self.process.start()
+        try:
+            self.address = addresses.get(timeout=start_timeout)  # sent once the model is loaded
+        except queue.Empty:
+            self.process.terminate()
+            raise RuntimeError("Sentiment server did not start")
+        self.client = SentimentClient(self.address, self.authkey)
+
+    def connect(self) -> SentimentClient:
+        """Extra connection, e.g. for another thread pool or process given the address and key."""
+        return SentimentClient(self.address, self.authkey)
+
+    def classify(self, texts: List[str], timeout: Optional[float] = None) -> List[str]:
+        return self.client.classify(texts, timeout)
+
+    def close(self) -> None:
+        self.client.close()
+        self.process.terminate()
+        self.process.join()
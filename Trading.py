@@ -1,6 +1,5 @@
-import MetaTrader5 as mt5
+import argparse
 import pandas as pd
-import pandas_ta as ta
 from datetime import datetime, timedelta
 import time
 import numpy as np
@@ -11,23 +10,41 @@ import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import ttk
 import threading
+from collections import deque, namedtuple
 from typing import Tuple, Optional, List
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.gridspec import GridSpec
+from Backtest import strategy_params
+from Charts import ChartRenderer
+from Indicators import IndicatorEngine
+from History import TimeRing
+from Positions import PositionBook
+from MarketData import mt5, MarketDataProvider, MT5Provider, ReplayProvider, TickSubscription, TIMEFRAME_M1, timeframe_seconds
 
 plt.style.use('dark_background')
 
+# Everything the GUI needs to draw one frame, built on the bot thread and never mutated afterwards
+DisplaySnapshot = namedtuple('DisplaySnapshot', ['stats_text', 'df', 'signals'])
+
 class GoldTradingBot:
-    def __init__(self, symbol: str = "XAUUSD", timeframe: int = mt5.TIMEFRAME_M1,
+    def __init__(self, symbol: str = "XAUUSD", timeframe: int = TIMEFRAME_M1,
                  risk_per_trade: float = 10.0, tp_factor: float = 1.5, 
-                 demo_account: bool = True, mt5_path: str = None):
+                 demo_account: bool = True, mt5_path: str = None,
+                 market: Optional[MarketDataProvider] = None, gui: bool = True,
+                 max_positions: int = 1, history_dir: Optional[str] = None,
+                 params: Optional[dict] = None):
         """
         Initialize the Gold Trading Bot with MT5 connection and parameters.
+        Pass a market provider (e.g. ReplayProvider) to run without the MT5 terminal
+        and gui=False to run headless. With history_dir set, equity and signal
+        records that fall out of the in-memory buffers are kept there as CSV.
+        params overrides the strategy constants in Backtest.DEFAULT_PARAMS
+        (e.g. values picked by Optimizer.py).
         """
         self.symbol = symbol
         self.timeframe = timeframe
         self.risk_per_trade = risk_per_trade  # Fixed $10 risk per trade
         self.tp_factor = tp_factor
+        self.params = strategy_params(params)
         self.in_position = False
         self.position_type = None
         self.entry_price = 0
@@ -35,21 +52,57 @@ class GoldTradingBot:
         self.win_count = 0
         self.loss_count = 0
         self.total_trades = 0
-        self.equity = []
+        
+        # Bounded in-memory history, older records spill to history_dir
+        equity_spill = signals_spill = None
+        if history_dir:
+            os.makedirs(history_dir, exist_ok=True)
+            equity_spill = os.path.join(history_dir, f"{symbol}_equity.csv")
+            signals_spill = os.path.join(history_dir, f"{symbol}_signals.csv")
+        self.equity = TimeRing(10080, {'balance': np.float64}, equity_spill)  # a week of M1 bars
         self.mt5_path = mt5_path or self.detect_mt5_path()
         self.demo_account = demo_account
         
         # For simulation
         self.simulated_balance = 10000  # Starting with $10,000
-        self.simulated_positions = []
-        self.signal_history = []
-        
-        self.launch_mt5()
-        self.connect_mt5()
-        self.ensure_chart_open()
+        self.positions = PositionBook()
+        self.max_positions = max_positions  # concurrent positions before new signals are ignored
+        self.signal_history = TimeRing(1000, {
+            'signal': 'U4', 'price': np.float64, 'sl': np.float64, 'tp': np.float64,
+            'position_id': np.int64, 'result': 'U4'
+        }, signals_spill)
+        self.signals_by_position = {}  # position ID -> signal_history sequence number
+        
+        # Streaming indicators - only new or updated bars are processed
+        self.indicators = IndicatorEngine(window=500)
+        
+        # Event-driven loop state
+        self.tick_interval = 0.05  # seconds between symbol_info_tick polls
+        self.display_interval = 1.0  # seconds between stats refreshes within a bar
+        self.bar_seconds = timeframe_seconds(timeframe)
+        self.bar_time = None
+        self.last_tick = None
+        self.last_df = None
+        self.last_display = 0.0
+        
+        # Bot thread -> Tk loop bridge. Only the newest snapshot is kept, so publishing
+        # never blocks and a slow render just skips the frames it could not show
+        self.snapshots = deque(maxlen=1)
+        self.render_interval = 100  # ms between checks for a new snapshot
+        self._render_job = None
+        
+        # Market data comes from the MT5 terminal unless another provider is given
+        self.market = market if market is not None else MT5Provider()
+        if not self.market.is_connected():
+            self.launch_mt5()
+            self.connect_mt5()
+            self.ensure_chart_open()
         
         # Initialize GUI
-        self.setup_gui()
+        self.root = None
+        self.running = False
+        if gui:
+            self.setup_gui()
         
     def detect_mt5_path(self) -> str:
         """Try to automatically detect MT5 installation path."""
@@ -137,30 +190,27 @@ class GoldTradingBot:
         
         print(f"Connected to MT5, account #{mt5.account_info().login}")
         
+    def fetch_rates(self, bars: int = 500) -> Optional[np.ndarray]:
+        """Fetch only the bars the indicator engine has not seen (full window on first call or after a gap)."""
+        if self.indicators.last_time is None:
+            return self.market.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
+        
+        # Previous (now closed) bar plus the forming one
+        rates = self.market.copy_rates_from_pos(self.symbol, self.timeframe, 0, 2)
+        if rates is not None and len(rates) and rates['time'][0] > self.indicators.last_time:
+            # Missed bars since the last poll - fetch enough to close the gap
+            rates = self.market.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
+        return rates
+    
     def get_market_data(self, bars: int = 500) -> pd.DataFrame:
-        """Fetch market data and calculate indicators."""
-        rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
+        """Fetch new bars and update the streaming indicators."""
+        rates = self.fetch_rates(bars)
         if rates is None:
-            print("Failed to get rates:", mt5.last_error())
+            print("Failed to get rates:", self.market.last_error())
             return None
             
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        
-        # Calculate indicators - Only MA, RSI, and MACD
-        df['EMA50'] = ta.ema(df['close'], length=50)
-        df['EMA100'] = ta.ema(df['close'], length=100)
-        df['RSI'] = ta.rsi(df['close'], length=14)
-        
-        # MACD
-        macd = ta.macd(df['close'], fast=12, slow=26, signal=9)
-        df = pd.concat([df, macd], axis=1)
-        
-        # ATR for stop loss calculation
-        atr = ta.atr(df['high'], df['low'], df['close'], length=14)
-        df['ATR'] = atr
-        
-        return df.dropna()
+        self.indicators.update(rates)
+        return self.indicators.frame()
     
     def analyze_signal(self, df: pd.DataFrame) -> Tuple[str, float, float]:
         """
@@ -168,7 +218,6 @@ class GoldTradingBot:
         Improved trading logic with dynamic TP/SL optimization.
         """
         last = df.iloc[-1]
-        prev = df.iloc[-2]
         signal = 'HOLD'
         stop_loss = 0
         take_profit = 0
@@ -177,13 +226,32 @@ class GoldTradingBot:
         atr_multiplier = self.optimize_atr_multiplier(df)
         atr_stop = last['ATR'] * atr_multiplier
         
-        # Weighted MCDM scoring system (0-100 scale)
+        buy_score, sell_score = self.calculate_scores(df)
+            
+        # Generate signal only if score exceeds threshold (60/100 by default)
+        signal_threshold = self.params['signal_threshold']
+        if buy_score >= signal_threshold and buy_score > sell_score:
+            signal = 'BUY'
+            stop_loss, take_profit = self.calculate_optimal_levels(df, 'BUY')
+            
+        elif sell_score >= signal_threshold and sell_score > buy_score:
+            signal = 'SELL'
+            stop_loss, take_profit = self.calculate_optimal_levels(df, 'SELL')
+            
+        return signal, stop_loss, take_profit
+    
+    def calculate_scores(self, df: pd.DataFrame) -> Tuple[float, float]:
+        """Weighted MCDM buy and sell scores (0-100 scale) for the last bar."""
+        last = df.iloc[-1]
+        prev = df.iloc[-2]
+        p = self.params
+        
         buy_score = 0
         sell_score = 0
         
         # 1. Trend Strength (40% weight)
         # - EMA crossover confirmation
-        ema_cross_weight = 0.4
+        ema_cross_weight = p['ema_cross_weight']
         if last['EMA50'] > last['EMA100'] and prev['EMA50'] <= prev['EMA100']:
             buy_score += 40 * ema_cross_weight  # Strong bullish crossover
         elif last['EMA50'] < last['EMA100'] and prev['EMA50'] >= prev['EMA100']:
@@ -195,9 +263,9 @@ class GoldTradingBot:
             
         # 2. Momentum (30% weight)
         # - RSI with dynamic thresholds based on recent volatility
-        rsi_weight = 0.3
-        rsi_buy_threshold = 40 - (last['ATR'] / last['close'] * 1000)  # Dynamic threshold
-        rsi_sell_threshold = 60 + (last['ATR'] / last['close'] * 1000)
+        rsi_weight = p['rsi_weight']
+        rsi_buy_threshold = p['rsi_buy_base'] - (last['ATR'] / last['close'] * p['rsi_atr_scale'])  # Dynamic threshold
+        rsi_sell_threshold = p['rsi_sell_base'] + (last['ATR'] / last['close'] * p['rsi_atr_scale'])
         
         if last['RSI'] > rsi_buy_threshold and last['RSI'] < 70:
             buy_score += (last['RSI'] - rsi_buy_threshold) / (70 - rsi_buy_threshold) * 30 * rsi_weight
@@ -205,7 +273,7 @@ class GoldTradingBot:
             sell_score += (rsi_sell_threshold - last['RSI']) / (rsi_sell_threshold - 30) * 30 * rsi_weight
             
         # 3. MACD Confirmation (20% weight)
-        macd_weight = 0.2
+        macd_weight = p['macd_weight']
         macd_buy_signal = (
             last['MACD_12_26_9'] > last['MACDs_12_26_9'] and 
             prev['MACD_12_26_9'] <= prev['MACDs_12_26_9'] and
@@ -223,7 +291,7 @@ class GoldTradingBot:
             sell_score += 20 * macd_weight
             
         # 4. Price Action (10% weight)
-        price_weight = 0.1
+        price_weight = p['price_weight']
         # Bullish candle patterns
         if last['close'] > last['open'] and (last['close'] - last['open']) > (0.5 * last['ATR']):
             buy_score += 10 * price_weight
@@ -231,17 +299,7 @@ class GoldTradingBot:
         elif last['close'] < last['open'] and (last['open'] - last['close']) > (0.5 * last['ATR']):
             sell_score += 10 * price_weight
             
-        # Generate signal only if score exceeds threshold (60/100)
-        signal_threshold = 60
-        if buy_score >= signal_threshold and buy_score > sell_score:
-            signal = 'BUY'
-            stop_loss, take_profit = self.calculate_optimal_levels(df, 'BUY')
-            
-        elif sell_score >= signal_threshold and sell_score > buy_score:
-            signal = 'SELL'
-            stop_loss, take_profit = self.calculate_optimal_levels(df, 'SELL')
-            
-        return signal, stop_loss, take_profit
+        return buy_score, sell_score
     
     def calculate_optimal_levels(self, df: pd.DataFrame, signal_type: str) -> Tuple[float, float]:
         """
@@ -253,27 +311,28 @@ class GoldTradingBot:
         last = df.iloc[-1]
         atr = last['ATR']
         close = last['close']
+        p = self.params
         
         # Dynamic risk-reward ratio based on market conditions
         volatility_factor = atr / close
         recent_trend_strength = self.calculate_trend_strength(df)
         
         # Base values
-        base_sl_distance = atr * 1.5  # Start with 1.5 ATR
+        base_sl_distance = atr * p['base_sl_atr']  # Start with 1.5 ATR
         
         # Adjust SL based on recent volatility
-        if volatility_factor > 0.005:  # High volatility
-            sl_multiplier = 1.2
+        if volatility_factor > p['high_volatility']:  # High volatility
+            sl_multiplier = p['sl_mult_high_vol']
         else:  # Low volatility
-            sl_multiplier = 1.8
+            sl_multiplier = p['sl_mult_low_vol']
             
         # Adjust TP based on trend strength
-        if recent_trend_strength > 0.7:  # Strong trend
-            tp_multiplier = 2.5
-        elif recent_trend_strength > 0.3:  # Moderate trend
-            tp_multiplier = 2.0
+        if recent_trend_strength > p['strong_trend']:  # Strong trend
+            tp_multiplier = p['tp_mult_strong']
+        elif recent_trend_strength > p['moderate_trend']:  # Moderate trend
+            tp_multiplier = p['tp_mult_moderate']
         else:  # Weak trend
-            tp_multiplier = 1.5
+            tp_multiplier = p['tp_mult_weak']
             
         # Calculate final levels
         if signal_type == 'BUY':
@@ -283,11 +342,11 @@ class GoldTradingBot:
             # Adjust to nearest support/resistance
             recent_lows = df['low'].rolling(20).min().iloc[-1]
             if stop_loss < recent_lows:
-                stop_loss = recent_lows - (0.2 * atr)  # Give some buffer
+                stop_loss = recent_lows - (p['sr_buffer_atr'] * atr)  # Give some buffer
                 
             recent_highs = df['high'].rolling(20).max().iloc[-1]
             if take_profit > recent_highs:
-                take_profit = recent_highs + (0.2 * atr)
+                take_profit = recent_highs + (p['sr_buffer_atr'] * atr)
                 
         else:  # SELL
             stop_loss = close + (base_sl_distance * sl_multiplier)
@@ -296,11 +355,11 @@ class GoldTradingBot:
             # Adjust to nearest support/resistance
             recent_highs = df['high'].rolling(20).max().iloc[-1]
             if stop_loss > recent_highs:
-                stop_loss = recent_highs + (0.2 * atr)
+                stop_loss = recent_highs + (p['sr_buffer_atr'] * atr)
                 
             recent_lows = df['low'].rolling(20).min().iloc[-1]
             if take_profit < recent_lows:
-                take_profit = recent_lows - (0.2 * atr)
+                take_profit = recent_lows - (p['sr_buffer_atr'] * atr)
                 
         return stop_loss, take_profit
     
@@ -342,7 +401,7 @@ class GoldTradingBot:
             return 1.5  # Default value
             
         # Calculate recent win rate
-        recent_trades = [t for t in self.signal_history[-5:] if 'result' in t]
+        recent_trades = [t for t in self.signal_history.tail(5) if t['result']]
         if not recent_trades:
             return 1.5
             
@@ -357,8 +416,8 @@ class GoldTradingBot:
             return 1.5
     
     def execute_simulated_trade(self, signal: str, price: float, 
-                              stop_loss: float, take_profit: float) -> bool:
-        """Simulate a trade with fixed $10 risk."""
+                              stop_loss: float, take_profit: float) -> Optional[int]:
+        """Simulate a trade with fixed $10 risk. Returns the position ID, or None if not executed."""
         # Calculate position size based on stop distance
         if signal == 'BUY':
             risk_per_unit = price - stop_loss
@@ -367,49 +426,39 @@ class GoldTradingBot:
             
         if risk_per_unit <= 0:
             print("Invalid stop loss - trade not executed")
-            return False
+            return None
             
         # Calculate units to risk exactly $10
         units = self.risk_per_trade / risk_per_unit
         
         # In simulation, we just record the trade
-        self.simulated_positions.append({
-            'type': signal,
-            'entry_price': price,
-            'sl': stop_loss,
-            'tp': take_profit,
-            'entry_time': datetime.now(),
-            'units': units
-        })
+        position_id = self.positions.open(signal, price, stop_loss, take_profit, units, datetime.now())
         
         print(f"SIMULATED TRADE: {signal} {self.symbol} at {price:.2f}")
         print(f"Units: {units:.2f} | Stop Loss: {stop_loss:.2f} | Take Profit: {take_profit:.2f}")
-        return True
+        return position_id
     
     def check_open_positions(self) -> Optional[dict]:
-        """Check for open simulated positions."""
-        return self.simulated_positions[-1] if self.simulated_positions else None
+        """Return the most recent open simulated position."""
+        return self.positions.latest()
     
-    def monitor_simulated_trades(self) -> None:
-        """Monitor simulated trades."""
-        if not self.simulated_positions:
-            self.in_position = False
-            return
+    def monitor_simulated_trades(self, tick=None) -> None:
+        """Check every open simulated position against the given tick (or the latest one)."""
+        if len(self.positions):
+            if tick is None:
+                tick = self.market.symbol_info_tick(self.symbol)
             
-        position = self.simulated_positions[-1]
-        current_price = mt5.symbol_info_tick(self.symbol).ask if position['type'] == 'BUY' else mt5.symbol_info_tick(self.symbol).bid
+            # Check for TP/SL hit on all positions at once
+            for position_id in self.positions.hits(tick.bid, tick.ask):
+                position = self.positions.get(position_id)
+                current_price = tick.ask if position['type'] == 'BUY' else tick.bid
+                self._close_simulated_position(position_id, current_price)
         
-        # Check for TP/SL hit
-        if (position['type'] == 'BUY' and 
-            (current_price >= position['tp'] or current_price <= position['sl'])):
-            self._close_simulated_position(position, current_price)
-            
-        elif (position['type'] == 'SELL' and 
-              (current_price <= position['tp'] or current_price >= position['sl'])):
-            self._close_simulated_position(position, current_price)
+        self.in_position = len(self.positions) >= self.max_positions
     
-    def _close_simulated_position(self, position, current_price: float) -> None:
+    def _close_simulated_position(self, position_id: int, current_price: float) -> None:
         """Close a simulated position."""
+        position = self.positions.close(position_id)
         if position['type'] == 'BUY':
             profit = (current_price - position['entry_price']) * position['units']
         else:
@@ -424,22 +473,18 @@ class GoldTradingBot:
             self.loss_count += 1
             result = 'loss'
         self.total_trades += 1
-        self.in_position = False
+        self.in_position = len(self.positions) >= self.max_positions
         
         # Record trade result in signal history
-        for signal in reversed(self.signal_history):
-            if signal.get('price') == position['entry_price'] and signal.get('time') == position['entry_time']:
-                signal['result'] = result
-                break
+        seq = self.signals_by_position.pop(position_id, None)
+        if seq is not None:
+            self.signal_history.update(seq, result=result)
         
         print(f"SIMULATED POSITION CLOSED: {'Profit' if profit > 0 else 'Loss'} of ${abs(profit):.2f}")
         print(f"New simulated balance: ${self.simulated_balance:.2f}")
-        
-        # Remove the closed position
-        self.simulated_positions.pop()
     
     def display_stats(self, df: pd.DataFrame) -> None:
-        """Display trading statistics and current market info."""
+        """Publish trading statistics and current market info for the GUI to display."""
         last = df.iloc[-1]
         position = self.check_open_positions()
         
@@ -456,8 +501,10 @@ class GoldTradingBot:
         if position:
             stats_text += f"SIMULATED POSITION: {position['type']} at {position['entry_price']:.2f}\n"
             stats_text += f"Units: {position['units']:.2f} | SL: {position['sl']:.2f} | TP: {position['tp']:.2f}\n"
-            current_price = mt5.symbol_info_tick(self.symbol).ask if position['type'] == 'BUY' else mt5.symbol_info_tick(self.symbol).bid
-            pnl = (current_price - position['entry_price']) * position['units'] * (1 if position['type'] == 'BUY' else -1)
+            if len(self.positions) > 1:
+                stats_text += f"Open Positions: {len(self.positions)}\n"
+            tick = self.last_tick or self.market.symbol_info_tick(self.symbol)
+            pnl = self.positions.unrealized_pnl(tick.bid, tick.ask)
             stats_text += f"Current PnL: ${pnl:.2f}\n"
         
         if self.total_trades > 0:
@@ -468,14 +515,36 @@ class GoldTradingBot:
         
         stats_text += f"SIMULATED BALANCE: ${self.simulated_balance:.2f}\n"
         
+        if self.root is None:
+            return
+        
+        # Hand over to the Tk loop - rendering never runs on the bot thread.
+        # The frame is a view of the indicator buffers, which keep changing, so publish a copy
+        last_24h = datetime.now() - timedelta(hours=24)
+        self.snapshots.append(DisplaySnapshot(stats_text, df.copy(), self.signal_history.since(last_24h)))
+    
+    def render_snapshots(self) -> None:
+        """Draw the latest published snapshot, if any (Tk thread)."""
+        try:
+            snapshot = self.snapshots.pop()
+        except IndexError:
+            return
+        
         # Update GUI
         self.stats_text.config(state=tk.NORMAL)
         self.stats_text.delete(1.0, tk.END)
-        self.stats_text.insert(tk.END, stats_text)
+        self.stats_text.insert(tk.END, snapshot.stats_text)
         self.stats_text.config(state=tk.DISABLED)
         
         # Update chart
-        self.update_chart(df)
+        self.update_chart(snapshot.df, snapshot.signals)
+    
+    def _poll_snapshots(self) -> None:
+        try:
+            self.render_snapshots()
+        except Exception as e:
+            print(f"Error updating display: {e}")
+        self._render_job = self.root.after(self.render_interval, self._poll_snapshots)
     
     def setup_gui(self) -> None:
         """Set up the graphical user interface."""
@@ -504,112 +573,56 @@ class GoldTradingBot:
         self.stats_text = tk.Text(stats_frame, height=30, width=60, state=tk.DISABLED)
         self.stats_text.pack(fill=tk.BOTH, expand=True)
         
-        # Chart panel - Using GridSpec for multiple plots
+        # Chart panel - artists are created once and redrawn by blitting
         self.fig = plt.figure(figsize=(10, 8))
-        self.gs = GridSpec(3, 1, height_ratios=[2, 1, 1])
-        
-        # Price chart
-        self.ax_price = self.fig.add_subplot(self.gs[0])
-        self.ax_price.set_title(f"{self.symbol} Price and Moving Averages")
-        self.price_line, = self.ax_price.plot([], [], label='Price', color='yellow')
-        self.ema50_line, = self.ax_price.plot([], [], label='EMA50', color='cyan')
-        self.ema100_line, = self.ax_price.plot([], [], label='EMA100', color='magenta')
-        self.ax_price.legend(loc='upper left')
-        self.ax_price.grid(True, alpha=0.3)
-        
-        # RSI chart
-        self.ax_rsi = self.fig.add_subplot(self.gs[1], sharex=self.ax_price)
-        self.ax_rsi.set_title("RSI (14)")
-        self.rsi_line, = self.ax_rsi.plot([], [], label='RSI', color='white')
-        self.ax_rsi.axhline(70, color='red', linestyle='--', alpha=0.5)
-        self.ax_rsi.axhline(30, color='green', linestyle='--', alpha=0.5)
-        self.ax_rsi.axhline(50, color='gray', linestyle='--', alpha=0.3)
-        self.ax_rsi.set_ylim(0, 100)
-        self.ax_rsi.grid(True, alpha=0.3)
-        
-        # MACD chart
-        self.ax_macd = self.fig.add_subplot(self.gs[2], sharex=self.ax_price)
-        self.ax_macd.set_title("MACD (12,26,9)")
-        self.macd_line, = self.ax_macd.plot([], [], label='MACD', color='white')
-        self.signal_line, = self.ax_macd.plot([], [], label='Signal', color='orange')
-        self.ax_macd.axhline(0, color='gray', linestyle='--', alpha=0.3)
-        self.ax_macd.legend(loc='upper left')
-        self.ax_macd.grid(True, alpha=0.3)
-        
-        # Trading signal markers
-        self.buy_signals = self.ax_price.scatter([], [], color='green', marker='^', s=100, label='Buy')
-        self.sell_signals = self.ax_price.scatter([], [], color='red', marker='v', s=100, label='Sell')
-        
         self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
+        self.chart = ChartRenderer(self.fig, self.canvas, self.symbol)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # Status flag
         self.running = False
         
-    def update_chart(self, df: pd.DataFrame) -> None:
+        # Render whatever the bot thread publishes from the Tk event loop
+        self._render_job = self.root.after(self.render_interval, self._poll_snapshots)
+        
+    def update_chart(self, df: pd.DataFrame, signals: Optional[dict] = None) -> None:
         """Update the price chart with new data."""
-        # Filter data for the last 24 hours
-        now = datetime.now()
-        last_24h = now - timedelta(hours=24)
-        df_filtered = df[df['time'] >= last_24h]
-        if df_filtered.empty:
-            df_filtered = df  # fallback to full data if filtered empty
-        
-        # Clear and update price chart
-        self.ax_price.clear()
-        self.ax_price.plot(df_filtered['time'], df_filtered['close'], label='Price', color='yellow')
-        self.ax_price.plot(df_filtered['time'], df_filtered['EMA50'], label='EMA50', color='cyan')
-        self.ax_price.plot(df_filtered['time'], df_filtered['EMA100'], label='EMA100', color='magenta')
-        
-        # Update RSI chart
-        self.ax_rsi.clear()
-        self.ax_rsi.plot(df_filtered['time'], df_filtered['RSI'], label='RSI', color='white')
-        self.ax_rsi.axhline(70, color='red', linestyle='--', alpha=0.5)
-        self.ax_rsi.axhline(30, color='green', linestyle='--', alpha=0.5)
-        self.ax_rsi.axhline(50, color='gray', linestyle='--', alpha=0.3)
-        self.ax_rsi.set_ylim(0, 100)
-        self.ax_rsi.set_title("RSI (14)")
-        self.ax_rsi.grid(True, alpha=0.3)
-        
-        # Update MACD chart
-        self.ax_macd.clear()
-        self.ax_macd.plot(df_filtered['time'], df_filtered['MACD_12_26_9'], label='MACD', color='white')
-        self.ax_macd.plot(df_filtered['time'], df_filtered['MACDs_12_26_9'], label='Signal', color='orange')
-        self.ax_macd.bar(df_filtered['time'], df_filtered['MACDh_12_26_9'], 
-                        color=np.where(df_filtered['MACDh_12_26_9'] > 0, 'green', 'red'), 
-                        alpha=0.5, width=0.0005)
-        self.ax_macd.axhline(0, color='gray', linestyle='--', alpha=0.3)
-        self.ax_macd.set_title("MACD (12,26,9)")
-        self.ax_macd.legend(loc='upper left')
-        self.ax_macd.grid(True, alpha=0.3)
-        
-        # Plot signals that fall in the last 24h window
-        buy_signals = [signal for signal in self.signal_history if signal['signal'] == 'BUY' and signal['time'] >= last_24h]
-        sell_signals = [signal for signal in self.signal_history if signal['signal'] == 'SELL' and signal['time'] >= last_24h]
-        
-        if buy_signals:
-            buy_times = [signal['time'] for signal in buy_signals]
-            buy_prices = [signal['price'] for signal in buy_signals]
-            self.ax_price.scatter(buy_times, buy_prices, color='green', marker='^', s=100, label='Buy Signal')
-        
-        if sell_signals:
-            sell_times = [signal['time'] for signal in sell_signals]
-            sell_prices = [signal['price'] for signal in sell_signals]
-            self.ax_price.scatter(sell_times, sell_prices, color='red', marker='v', s=100, label='Sell Signal')
-        
-        # Formatting
-        self.ax_price.set_title(f"{self.symbol} Price and Moving Averages (Last 24 Hours)")
-        self.ax_price.legend(loc='upper left')
-        self.ax_price.grid(True, alpha=0.3)
-        
-        # Rotate x-axis labels for better readability
-        for ax in [self.ax_price, self.ax_rsi, self.ax_macd]:
-            for label in ax.get_xticklabels():
-                label.set_rotation(45)
-                label.set_horizontalalignment('right')
-        
-        self.fig.tight_layout()
-        self.canvas.draw()
+        if signals is None:
+            signals = self.signal_history.since(datetime.now() - timedelta(hours=24))
+        self.chart.update(df, signals)
+    
+    def process_market_data(self, df: pd.DataFrame, tick=None) -> None:
+        """Manage the open position and act on a new signal for the latest market data."""
+        if tick is None:
+            tick = self.market.symbol_info_tick(self.symbol)
+        
+        # Check for open positions
+        self.monitor_simulated_trades(tick)
+        
+        # Generate signal if not in position
+        if not self.in_position:
+            signal, sl, tp = self.analyze_signal(df)
+            if signal in ['BUY', 'SELL']:
+                current_price = tick.ask if signal == 'BUY' else tick.bid
+                position_id = self.execute_simulated_trade(signal, current_price, sl, tp)
+                if position_id is not None:
+                    self.in_position = len(self.positions) >= self.max_positions
+                    self.position_type = signal
+                    self.entry_price = current_price
+                    self.entry_time = datetime.now()
+                    
+                    # Record signal for chart
+                    self.signals_by_position[position_id] = self.signal_history.append(
+                        datetime.now(),
+                        signal=signal,
+                        price=current_price,
+                        sl=sl,
+                        tp=tp,
+                        position_id=position_id
+                    )
+        
+        # Update equity curve
+        self.equity.append(datetime.now(), balance=self.simulated_balance)
     
     def start_bot(self) -> None:
         """Start the trading bot in a separate thread."""
@@ -625,63 +638,69 @@ class GoldTradingBot:
         self.running = False
         print("Bot stopped")
     
-    def run_bot_loop(self) -> None:
-        """Main trading loop for the bot thread."""
-        while self.running:
+    def on_tick(self, tick) -> None:
+        """Check stops on every price change and rerun the strategy when a bar closes."""
+        self.last_tick = tick
+        self.monitor_simulated_trades(tick)
+        
+        bar_time = tick.time // self.bar_seconds * self.bar_seconds
+        if bar_time != self.bar_time:
+            # A new bar opened, so the previous one just closed
+            self.bar_time = bar_time
             df = self.get_market_data()
-            if df is None:
-                time.sleep(10)
-                continue
-            
-            # Check for open positions
-            self.monitor_simulated_trades()
-            
-            # Generate signal if not in position
-            if not self.in_position:
-                signal, sl, tp = self.analyze_signal(df)
-                if signal in ['BUY', 'SELL']:
-                    current_price = mt5.symbol_info_tick(self.symbol).ask if signal == 'BUY' else mt5.symbol_info_tick(self.symbol).bid
-                    if self.execute_simulated_trade(signal, current_price, sl, tp):
-                        self.in_position = True
-                        self.position_type = signal
-                        self.entry_price = current_price
-                        self.entry_time = datetime.now()
-                        
-                        # Record signal for chart
-                        self.signal_history.append({
-                            'signal': signal,
-                            'price': current_price,
-                            'time': datetime.now(),
-                            'sl': sl,
-                            'tp': tp
-                        })
-            
-            # Display stats
+            if df is None or len(df) < 3:
+                return
+            self.last_df = df
+            self.process_market_data(df.iloc[:-1], tick)
             self.display_stats(df)
-            
-            # Update equity curve
-            self.equity.append((datetime.now(), self.simulated_balance))
-            
-            time.sleep(10)  # Change refresh rate to 10 seconds
+            self.last_display = time.monotonic()
+        elif self.last_df is not None and time.monotonic() - self.last_display >= self.display_interval:
+            # Keep the PnL readout fresh between bar closes
+            self.display_stats(self.last_df)
+            self.last_display = time.monotonic()
+    
+    def run_bot_loop(self) -> None:
+        """Main trading loop for the bot thread, driven by new ticks instead of a fixed sleep."""
+        self.bar_time = None
+        ticks = TickSubscription(self.market, self.symbol, interval=self.tick_interval)
+        ticks.add_listener(self.on_tick)
+        ticks.run(lambda: self.running)
     
     def shutdown(self) -> None:
         """Clean up and shut down the application."""
         self.running = False
-        mt5.shutdown()
-        self.root.quit()
-        self.root.destroy()
+        self.equity.flush()
+        self.signal_history.flush()
+        self.market.shutdown()
+        if self.root is not None:
+            if self._render_job is not None:
+                self.root.after_cancel(self._render_job)
+            self.root.quit()
+            self.root.destroy()
         print("Application shut down")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gold Trading Bot - Simulation Mode")
+    parser.add_argument("--symbol", default="XAUUSD", help="Symbol to trade")
+    parser.add_argument("--replay", help="Replay recorded ticks (CSV/Parquet) instead of connecting to MT5")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed, 0 = as fast as possible")
+    args = parser.parse_args()
+    
     try:
+        market = None
+        if args.replay:
+            market = ReplayProvider({args.symbol: args.replay}, speed=args.speed or None)
+        
         # Initialize and run the bot
         bot = GoldTradingBot(
-            symbol="XAUUSD",
-            timeframe=mt5.TIMEFRAME_M1,
+            symbol=args.symbol,
+            timeframe=TIMEFRAME_M1,
             risk_per_trade=10.0,  # Fixed $10 risk per trade
             tp_factor=1.5,
             demo_account=True,
-            mt5_path=None  # Add path if MT5 not in default location
+            mt5_path=None,  # Add path if MT5 not in default location
+            market=market,
+            history_dir="history"
         )
         
         # Start the GUI main loop
@@ -689,4 +708,5 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"Error in main: {e}")
-        mt5.shutdown()
\ No newline at end of file
+        if mt5 is not None:
+            mt5.shutdown()
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# strftime formats for sentiment_over_time periods
+PERIODS = {
+    'hour': '%Y-%m-%d %H:00',
+    'day': '%Y-%m-%d',
+    'week': '%Y-W%W',
+    'month': '%Y-%m',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY,
+    created_at TEXT,
+    scraped_at TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    label TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tweet_id TEXT NOT NULL REFERENCES tweets(id),
+    keyword TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    PRIMARY KEY (keyword, lang, tweet_id)
+);
+CREATE INDEX IF NOT EXISTS tweets_text_hash ON tweets(text_hash);
+"""
+
+
+class TweetStore:
+    """
+    SQLite store of scraped tweets and their sentiment labels, keyed by tweet ID.
+    A tweet is stored once with its label and linked to every (keyword, lang)
+    search that returned it, so repeat searches can stop at tweets they have
+    already seen and sentiment over time can be queried without scraping.
+    Thread-safe: concurrent scrape jobs share one connection behind a lock.
+    """
+
+    def __init__(self, path: str):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, keyword: str, lang: str, tweets: Sequence[Tuple[str, Optional[str], str]],
+            labels: Sequence[str]) -> None:
+        """Record (id, created_at, text_hash) tweets with their labels as results of one search."""
+        scraped_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        rows = [(tweet_id, created_at, scraped_at, text_hash, label)
+                for (tweet_id, created_at, text_hash), label in zip(tweets, labels)]
+        with self._lock, self._connection:
+            # A tweet scraped again keeps its first label and timestamps
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO tweets (id, created_at, scraped_at, text_hash, label) VALUES (?, ?, ?, ?, ?)',
+                rows)
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO matches (tweet_id, keyword, lang) VALUES (?, ?, ?)',
+                [(row[0], keyword, lang) for row in rows])
+
+    def known_ids(self, keyword: str, lang: str) -> Set[str]:
+        """IDs of every tweet a (keyword, lang) search has returned before."""
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT tweet_id FROM matches WHERE keyword = ? AND lang = ?', (keyword, lang))
+            return {row[0] for row in cursor}
+
+    def labels_for_hashes(self, text_hashes: Iterable[str]) -> Dict[str, str]:
+        """Stored labels of tweets with these text hashes (e.g. retweets of stored tweets)."""
+        text_hashes = list(set(text_hashes))
+        labels = {}
+        with self._lock:
+            for start in range(0, len(text_hashes), 500):  # stay under SQLite's variable limit
+                chunk = text_hashes[start:start + 500]
+                cursor = self._connection.execute(
+                    f'SELECT text_hash, label FROM tweets WHERE text_hash IN ({",".join("?" * len(chunk))})', chunk)
+                labels.update(cursor)
+        return labels
+
+    def recent(self, keyword: str, lang: str, limit: int) -> List[Tuple[str, str]]:
+        """(id, label) of the newest limit tweets stored for a search, newest first."""
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT t.id, t.label FROM tweets t JOIN matches m ON m.tweet_id = t.id '
+                'WHERE m.keyword = ? AND m.lang = ? '
+                'ORDER BY COALESCE(t.created_at, t.scraped_at) DESC LIMIT ?', (keyword, lang, limit))
+            return cursor.fetchall()
+
+    def sentiment_over_time(self, keyword: str, lang: Optional[str] = None,
+                            period: str = 'day') -> List[Tuple[str, int, int, int]]:
+        """
+        (period, positive, neutral, negative) counts for a keyword, oldest period first.
+        Tweets are bucketed by their posting time, or by when they were scraped if unknown.
+        """
+        query = (f"SELECT strftime('{PERIODS[period]}', COALESCE(t.created_at, t.scraped_at)) AS bucket, "
+                 "SUM(t.label = 'Positive'), SUM(t.label = 'Neutral'), SUM(t.label = 'Negative') "
+                 "FROM tweets t JOIN (SELECT DISTINCT tweet_id FROM matches WHERE keyword = ?"
+                 + (" AND lang = ?" if lang else "") +
+                 ") m ON m.tweet_id = t.id GROUP BY bucket ORDER BY bucket")
+        with self._lock:
+            return self._connection.execute(query, (keyword, lang) if lang else (keyword,)).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import pandas as pd
+import Backtest
+import Trading
+
+
+def make_bars(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.8, n)
+    return pd.DataFrame({
+        'time': pd.to_datetime(1_600_000_000 + 60 * np.arange(n), unit='s'),
+        'open': open_,
+        'high': np.maximum(close, open_) + rng.random(n),
+        'low': np.minimum(close, open_) - rng.random(n),
+        'close': close,
+    })
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.df = Backtest.add_indicators(make_bars(1500)).dropna().reset_index(drop=True)
+        self.arrays = Backtest.prepare_arrays(self.df)
+        self.bot = Trading.GoldTradingBot.__new__(Trading.GoldTradingBot)
+        self.bot.signal_history = []
+        self.bot.params = Backtest.DEFAULT_PARAMS
+
+    def test_scores_match_live_bot(self):
+        signals = Backtest.generate_signals(self.arrays)
+        for i in range(25, len(self.df), 37):
+            buy_score, sell_score = self.bot.calculate_scores(self.df.iloc[:i + 1])
+            self.assertEqual(buy_score, signals['buy_score'][i])
+            self.assertEqual(sell_score, signals['sell_score'][i])
+
+    def test_levels_match_live_bot(self):
+        levels = Backtest.levels_arrays(self.arrays)
+        for i in range(25, len(self.df), 37):
+            sl, tp = self.bot.calculate_optimal_levels(self.df.iloc[:i + 1], 'BUY')
+            self.assertEqual((sl, tp), (levels['buy_sl'][i], levels['buy_tp'][i]))
+            sl, tp = self.bot.calculate_optimal_levels(self.df.iloc[:i + 1], 'SELL')
+            self.assertEqual((sl, tp), (levels['sell_sl'][i], levels['sell_tp'][i]))
+
+    def test_simulate_trades_finds_first_exit(self):
+        a = self.arrays
+        n = len(a['close'])
+        signals = {'signal': np.zeros(n, dtype=np.int8), 'sl': np.zeros(n), 'tp': np.zeros(n)}
+        entry = 50
+        signals['signal'][entry] = 1
+        signals['sl'][entry] = a['close'][entry] - 5
+        signals['tp'][entry] = a['close'][entry] + 5
+
+        trades = Backtest.simulate_trades(a, signals)
+        self.assertEqual(len(trades), 1)
+        exit_index = trades['exit_index'][0]
+        hits = (a['low'][entry + 1:] <= a['close'][entry] - 5) | (a['high'][entry + 1:] >= a['close'][entry] + 5)
+        self.assertEqual(exit_index, entry + 1 + np.argmax(hits))
+        self.assertAlmostEqual(abs(trades['profit'][0]), 10.0)
+
+    def test_custom_params_match_live_bot(self):
+        params = {'signal_threshold': 10, 'rsi_weight': 0.5, 'rsi_atr_scale': 500, 'tp_mult_weak': 1.0}
+        self.bot.params = Backtest.strategy_params(params)
+        signals = Backtest.generate_signals(self.arrays, params)
+        self.assertTrue(signals['signal'].any())
+        for i in range(25, len(self.df), 37):
+            signal, sl, tp = self.bot.analyze_signal(self.df.iloc[:i + 1])
+            self.assertEqual(signal, {1: 'BUY', -1: 'SELL', 0: 'HOLD'}[signals['signal'][i]])
+            if signal != 'HOLD':
+                self.assertEqual((sl, tp), (signals['sl'][i], signals['tp'][i]))
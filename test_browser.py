@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import Browser
+
+
+class FakeDriver:
+    def __init__(self):
+        self.cookies = []
+        self.quit_called = False
+        self.alive = True
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return "https://example.com/home"
+
+    def get(self, url):
+        pass
+
+    def refresh(self):
+        pass
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get_cookies(self):
+        return self.cookies
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_login(driver):
+    driver.cookies.append({'name': 'auth_token', 'value': 'secret', 'expiry': 1.9e9})
+
+def logged_in(driver):
+    return any(cookie['name'] == 'auth_token' for cookie in driver.cookies)
+
+class TestDriverPool(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cookies_path = os.path.join(self.folder.name, "cookies.json")
+        self.create = MagicMock(side_effect=FakeDriver)
+        self.login = MagicMock(side_effect=fake_login)
+        self.pool = Browser.DriverPool(self.create, self.login, logged_in, "https://example.com/home",
+                                       size=2, max_uses=3, cookies_path=self.cookies_path)
+
+    def tearDown(self):
+        self.pool.close()
+        self.folder.cleanup()
+
+    def test_back_to_back_sessions_reuse_driver(self):
+        with self.pool.session() as first:
+            pass
+        with self.pool.session() as second:
+            pass
+        self.assertIs(first, second)
+        self.create.assert_called_once()
+        self.login.assert_called_once()
+
+    def test_new_driver_restores_saved_cookies(self):
+        with self.pool.session():
+            pass
+        other = Browser.DriverPool(self.create, self.login, logged_in, "https://example.com/home",
+                                   cookies_path=self.cookies_path)
+        with other.session() as driver:
+            self.assertTrue(logged_in(driver))
+        other.close()
+        self.login.assert_called_once()
+        self.assertEqual(driver.cookies[0]['expiry'], 1900000000)
+
+    def test_broken_or_worn_out_drivers_are_recycled(self):
+        with self.pool.session() as first:
+            pass
+        first.alive = False
+        with self.pool.session() as second:
+            pass
+        self.assertTrue(first.quit_called)
+        self.assertIsNot(first, second)
+
+        with self.assertRaises(ValueError):
+            with self.pool.session():
+                raise ValueError("scrape failed")
+        self.assertTrue(second.quit_called)
+
+        drivers = set()
+        for _ in range(4):
+            with self.pool.session() as driver:
+                drivers.add(driver)
+        self.assertEqual(len(drivers), 2)  # max_uses=3
+
+
+class TestDomainRateLimiter(unittest.TestCase):
+
+    def test_burst_then_rate_per_domain(self):
+        limiter = Browser.DomainRateLimiter(rate=20.0, burst=2)
+        self.assertEqual(limiter.acquire("https://twitter.com/search?q=a"), 0.0)
+        self.assertEqual(limiter.acquire("https://twitter.com/search?q=b"), 0.0)
+        self.assertAlmostEqual(limiter.acquire("https://twitter.com/home"), 0.05, delta=0.01)
+        # Other domains have their own bucket
+        self.assertEqual(limiter.acquire("https://example.com/"), 0.0)
+        self.assertAlmostEqual(limiter.waited, 0.05, delta=0.01)
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import Charts
+import Indicators
+from test_indicators import make_rates
+
+
+def make_signals(times, prices, kinds):
+    return {
+        'time': np.array(times, dtype='datetime64[us]'),
+        'price': np.array(prices, dtype=np.float64),
+        'signal': np.array(kinds, dtype='U4'),
+    }
+
+class TestChartRenderer(unittest.TestCase):
+
+    def setUp(self):
+        engine = Indicators.IndicatorEngine(window=500)
+        engine.update(make_rates(400))
+        self.df = engine.frame()
+        self.now = self.df['time'].iloc[-1].to_pydatetime()
+        self.fig = Figure(figsize=(10, 8))
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.chart = Charts.ChartRenderer(self.fig, self.canvas, "XAUUSD")
+        self.no_signals = make_signals([], [], [])
+
+    def test_artists_are_reused_and_updated_in_place(self):
+        artists = list(self.chart.ax_price.get_children())
+        self.chart.update(self.df.iloc[:200], self.no_signals, now=self.now)
+        self.chart.update(self.df, self.no_signals, now=self.now)
+        self.assertEqual(list(self.chart.ax_price.get_children()), artists)
+        np.testing.assert_array_equal(self.chart.price_line.get_ydata(), self.df['close'].values)
+        self.assertEqual(len(self.chart.macd_hist.get_paths()), len(self.df))
+
+    def test_relayout_only_when_data_leaves_limits(self):
+        self.assertTrue(self.chart.update(self.df.iloc[:200], self.no_signals, now=self.now))
+        # A couple more bars fit inside the headroom - blitted
+        self.assertFalse(self.chart.update(self.df.iloc[:202], self.no_signals, now=self.now))
+        xlim = self.chart.ax_price.get_xlim()
+        # The full window runs past the right edge - full redraw with new limits
+        self.assertTrue(self.chart.update(self.df, self.no_signals, now=self.now))
+        self.assertGreater(self.chart.ax_price.get_xlim()[1], xlim[1])
+
+    def test_signal_markers(self):
+        times = self.df['time'].iloc[[-50, -20, -5]].tolist()
+        signals = make_signals(times, [2000.0, 2001.0, 2002.0], ['BUY', 'SELL', 'BUY'])
+        self.chart.update(self.df, signals, now=self.now)
+        self.assertEqual(len(self.chart.buy_signals.get_offsets()), 2)
+        np.testing.assert_array_equal(self.chart.sell_signals.get_offsets()[:, 1], [2001.0])
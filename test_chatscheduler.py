@@ -0,0 +1,68 @@
+import asyncio
+import time
+import unittest
+import ChatScheduler
+
+
+class TestChatScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.client = object()
+        self.scheduler = ChatScheduler.ChatScheduler(lambda: self.client, max_concurrent=2, timeout=1.0)
+
+    def tearDown(self):
+        self.scheduler.close()
+
+    def test_concurrency_is_capped_and_client_shared(self):
+        running, peak, clients = [0], [0], set()
+        async def job(client):
+            clients.add(id(client))
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.05)
+            running[0] -= 1
+            return "ok"
+        futures = [self.scheduler.submit(job) for _ in range(6)]
+        self.assertEqual([future.result() for future in futures], ["ok"] * 6)
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(clients, {id(self.client)})
+
+    def test_same_key_supersedes_queued_and_running(self):
+        stopped = []
+        async def slow(client):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                stopped.append(True)
+                raise
+        async def fast(client):
+            return "latest"
+        first = self.scheduler.submit(slow, key="chat")
+        time.sleep(0.05)  # let it start
+        latest = self.scheduler.submit(fast, key="chat")
+        self.assertEqual(latest.result(), "latest")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(stopped, [True])
+        self.assertFalse(self.scheduler.cancel("chat"))  # nothing left under the key
+
+    def test_background_request_yields_to_any_other(self):
+        scheduler = ChatScheduler.ChatScheduler(lambda: self.client, max_concurrent=1, timeout=5.0)
+        self.addCleanup(scheduler.close)
+        async def summary(client):
+            await asyncio.sleep(5)
+        async def chat(client):
+            return "reply"
+        background = scheduler.submit(summary, background=True)
+        time.sleep(0.05)  # let it take the only slot
+        started = time.perf_counter()
+        self.assertEqual(scheduler.submit(chat, key="chat").result(), "reply")
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertTrue(background.cancelled())
+
+    def test_timeout(self):
+        async def hang(client):
+            await asyncio.sleep(5)
+        started = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            self.scheduler.submit(hang, timeout=0.1).result()
+        self.assertLess(time.perf_counter() - started, 1.0)
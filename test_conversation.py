@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+import Conversation
+
+
+def count_words(text):
+    return len(text.split())
+
+class TestConversation(unittest.TestCase):
+
+    def setUp(self):
+        self.counter = MagicMock(side_effect=count_words)
+        self.chat = Conversation.Conversation(max_tokens=100, system_prompt="You are Lex", count_tokens=self.counter)
+
+    def exchange(self, i, words=10):
+        question = self.chat.message("user", f"question {i} " + "word " * (words - 2))
+        self.chat.append(question, self.chat.message("assistant", f"answer {i} " + "word " * (words - 2)))
+
+    def test_context_window_stays_within_budget(self):
+        for i in range(20):
+            self.exchange(i)
+        pending = self.chat.message("user", "latest question")
+        messages = self.chat.context(pending)
+        tokens = sum(count_words(m["content"]) + Conversation.MESSAGE_OVERHEAD for m in messages)
+        self.assertLessEqual(tokens, 100)
+        self.assertEqual(messages[0], {"role": "system", "content": "You are Lex"})
+        self.assertEqual(messages[-1]["content"], "latest question")
+        self.assertTrue(messages[1]["content"].startswith("question 17"))  # latest whole exchanges
+        self.assertEqual([m["role"] for m in messages[1:]], ["user", "assistant"] * 3 + ["user"])
+
+    def test_token_counts_are_cached_per_message(self):
+        for i in range(5):
+            self.exchange(i)
+        counted = self.counter.call_count
+        for _ in range(3):
+            self.chat.context(self.chat.message("user", "again"))
+        self.assertEqual(self.counter.call_count, counted + 3)  # only the new messages
+
+    def test_compact_summarizes_old_turns(self):
+        summarize = MagicMock(side_effect=lambda summary, messages: f"{len(messages)} messages")
+        self.chat.summarize = summarize
+        for i in range(3):
+            self.exchange(i)
+        self.assertFalse(self.chat.compact())  # 7 + 3 * 28 tokens still fit
+        self.exchange(3)
+        self.assertTrue(self.chat.compact())
+        self.assertLessEqual(self.chat.tokens, 50 + self.chat.summary.tokens)
+        self.assertEqual(self.chat.turns[0].role, "user")
+        previous, evicted = summarize.call_args.args
+        self.assertIsNone(previous)
+        self.assertEqual(self.chat.context()[1]["content"],
+                         f"Summary of the earlier conversation: {len(evicted)} messages")
+
+    def test_compact_without_summarize_drops_old_turns(self):
+        for i in range(10):
+            self.exchange(i)
+        self.chat.compact()
+        self.assertIsNone(self.chat.summary)
+        self.assertLessEqual(self.chat.tokens, 50)
+        self.assertTrue(self.chat.turns[-1].content.startswith("answer 9"))
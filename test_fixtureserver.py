@@ -0,0 +1,66 @@
+import http.client
+import json
+import re
+import unittest
+from unittest.mock import patch
+from urllib.request import urlopen
+import FixtureServer
+import Scrapper
+
+
+class TestFixtureServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FixtureServer.FixtureServer(total=50, page_size=20, latency=0).start()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_search_page_then_scroll_pages(self):
+        page = urlopen(f"{self.server.base_url}/search?q=gold%20price&lang=en&f=live").read().decode()
+        ids = re.findall(r'<article><a href="/trader/status/(\d+)"><time datetime="[^"]+">', page)
+        self.assertEqual(len(ids), 20)
+        self.assertIn('data-next="20"', page)
+        self.assertIn('<div lang="en">gold price ', page)
+
+        cursor = 20
+        while cursor is not None:
+            result = json.loads(urlopen(f"{self.server.base_url}/api/search?q=gold%20price&cursor={cursor}").read())
+            ids += re.findall(r'/status/(\d+)', result['html'])
+            cursor = result['next']
+        self.assertEqual(len(set(ids)), 50)
+        self.assertEqual(ids, sorted(ids, reverse=True))  # newest first, like the live timeline
+
+    def test_login_flow_sets_auth_cookie(self):
+        steps = []
+        for step in ("username", "verify", "password"):
+            page = urlopen(f"{self.server.base_url}/login?step={step}").read().decode()
+            steps.append(re.search(r'<input name="(\w+)"', page).group(1))
+        self.assertEqual(steps, ["text", "text", "password"])
+
+        host, port = self.server._httpd.server_address[:2]
+        connection = http.client.HTTPConnection(host, port)
+        connection.request("GET", "/login?step=done&password=secret")
+        response = connection.getresponse()
+        self.assertEqual(response.status, 302)
+        self.assertEqual(response.getheader("Location"), "/home")
+        self.assertIn("auth_token=", response.getheader("Set-Cookie"))
+        connection.close()
+
+    def test_scraper_urls_follow_base_url(self):
+        class Driver:
+            def get(self, url):
+                self.url = url
+            def execute_script(self, script):
+                return False
+        driver = Driver()
+        with patch.object(Scrapper, "BASE_URL", self.server.base_url):
+            list(Scrapper.search_tweets(driver, "gold", 10, min_wait=0.05, max_wait=0.05))
+        self.assertTrue(driver.url.startswith(f"{self.server.base_url}/search?q=gold"))
+        self.assertEqual(urlopen(driver.url).status, 200)
+
+    def test_generated_results_are_deterministic(self):
+        first = FixtureServer.generate_tweets("gold", 200)
+        self.assertEqual(first, FixtureServer.generate_tweets("gold", 200))
+        self.assertNotEqual(first, FixtureServer.generate_tweets("silver", 200))
+        self.assertTrue(any(tweet['text'].startswith("RT @") for tweet in first))
@@ -0,0 +1,42 @@
+import csv
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from History import TimeRing
+
+START = datetime(2024, 1, 1)
+
+class TestTimeRing(unittest.TestCase):
+
+    def test_capacity_and_spill(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "equity.csv")
+            ring = TimeRing(4, {'balance': np.float64}, path)
+            for i in range(10):
+                ring.append(START + timedelta(minutes=i), balance=1000 + i)
+            self.assertEqual(len(ring), 4)
+            self.assertEqual(ring.column('balance').tolist(), [1006, 1007, 1008, 1009])
+
+            ring.flush()
+            with open(path) as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual([float(row['balance']) for row in rows], [1000 + i for i in range(10)])
+
+    def test_since_across_wrap(self):
+        ring = TimeRing(5, {'price': np.float64})
+        for i in range(8):
+            ring.append(START + timedelta(hours=i), price=i)
+        self.assertEqual(ring.since(START + timedelta(hours=4)).get('price').tolist(), [4, 5, 6, 7])
+        self.assertEqual(ring.since(START + timedelta(hours=6, minutes=30))['price'].tolist(), [7])
+        self.assertEqual(len(ring.since(START + timedelta(hours=9))['time']), 0)
+
+    def test_update_by_sequence(self):
+        ring = TimeRing(2, {'signal': 'U4', 'result': 'U4'})
+        first = ring.append(START, signal='BUY')
+        second = ring.append(START + timedelta(minutes=1), signal='SELL')
+        self.assertTrue(ring.update(second, result='win'))
+        ring.append(START + timedelta(minutes=2), signal='BUY')
+        self.assertFalse(ring.update(first, result='loss'))
+        self.assertEqual([r['result'] for r in ring.tail(5)], ['win', ''])
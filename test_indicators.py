@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+import pandas as pd
+import Indicators
+
+RATES_DTYPE = [('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+               ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')]
+
+
+def make_rates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1_700_000_000 + 60 * np.arange(n)
+    rates['open'] = open_
+    rates['close'] = close
+    rates['high'] = np.maximum(close, open_) + rng.random(n)
+    rates['low'] = np.minimum(close, open_) - rng.random(n)
+    return rates
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    def test_streaming_matches_pandas_ta(self):
+        rates = make_rates(700)
+        engine = Indicators.IndicatorEngine(window=500)
+        engine.update(rates[:300])
+        for i in range(300, len(rates)):
+            engine.update(rates[i - 1:i + 1])
+
+        expected = Indicators.add_indicators(pd.DataFrame(rates)).dropna().tail(500)
+        result = engine.frame()
+        self.assertEqual(len(result), 500)
+        for column in Indicators.INDICATOR_COLUMNS:
+            np.testing.assert_allclose(result[column].values, expected[column].values, rtol=1e-10)
+
+    def test_window_wraps_around_buffers(self):
+        rates = make_rates(1000, seed=1)
+        engine = Indicators.IndicatorEngine(window=150)
+        engine.update(rates[:200])
+        for i in range(200, len(rates)):
+            engine.update(rates[i - 1:i + 1])
+
+        expected = Indicators.add_indicators(pd.DataFrame(rates)).dropna().tail(150)
+        result = engine.frame()
+        self.assertEqual(len(result), 150)
+        self.assertTrue((result['time'].values == pd.to_datetime(expected['time'], unit='s').values).all())
+        for column in Indicators.INDICATOR_COLUMNS:
+            np.testing.assert_allclose(result[column].values, expected[column].values, rtol=1e-10)
+
+    def test_forming_bar_is_recomputed(self):
+        rates = make_rates(200)
+        engine = Indicators.IndicatorEngine()
+        forming = rates[-1:].copy()
+        forming['close'] += 5
+        forming['high'] += 5
+        engine.update(rates[:-1])
+        engine.update(forming)
+        engine.update(rates[-2:])
+
+        expected = Indicators.add_indicators(pd.DataFrame(rates)).dropna()
+        np.testing.assert_allclose(engine.frame()['RSI'].values, expected['RSI'].values, rtol=1e-10)
+        self.assertEqual(engine.last_time, int(rates['time'][-1]))
+
+    def test_old_bars_are_ignored(self):
+        rates = make_rates(150)
+        engine = Indicators.IndicatorEngine()
+        engine.update(rates)
+        self.assertEqual(engine.update(rates[:-1]), 0)
+        self.assertEqual(len(engine.frame()), 150 - 99)
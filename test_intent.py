@@ -0,0 +1,48 @@
+import time
+import unittest
+import Intent
+
+
+class TestIntentRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Intent.get_router()
+
+    def test_routes_paraphrases(self):
+        cases = {
+            "scrape 200 tweets about gold in english": "scrape",
+            "I want to see what people tweet about silver": "scrape",
+            "scrap tweets abt oil": "scrape",
+            "start trading XAUUSD": "trading",
+            "run the trading sim": "trading",
+            "what's the sentiment history for gold": "sentiment_history",
+            "explain the RSI indicator": "chat",
+            "what do you think about gold prices?": "chat",
+        }
+        for text, intent in cases.items():
+            self.assertEqual(self.router.route(text).intent, intent, text)
+
+    def test_low_confidence_falls_back_to_chat(self):
+        route = self.router.route("xyzzy plugh")
+        self.assertEqual(route, Intent.Route("chat", route.confidence, {}))
+        self.assertLess(route.confidence, self.router.threshold)
+
+    def test_slots(self):
+        self.assertEqual(Intent.extract_slots("scrape 200 tweets about gold in english"),
+                         {"count": 200, "lang": "en", "keyword": "gold", "symbol": "XAUUSD"})
+        self.assertEqual(Intent.extract_slots("get tweets on 'federal reserve' lang=es"),
+                         {"lang": "es", "keyword": "federal reserve"})
+        self.assertEqual(Intent.extract_slots("scrape twitter for bitcoin, ethereum please")["keyword"],
+                         "bitcoin, ethereum")
+        self.assertEqual(Intent.extract_slots("start trading EURUSD"), {"symbol": "EURUSD"})
+        for text, keyword in [("what is the sentiment on twitter about bitcoin today", "bitcoin"),
+                              ("tell me about tweets regarding gold", "gold"),
+                              ("how do people feel about gold on twitter", "gold"),
+                              ("check sentiment on twitter for the fed", "the fed")]:
+            self.assertEqual(Intent.extract_slots(text)["keyword"], keyword, text)
+
+    def test_routing_is_fast(self):
+        started = time.perf_counter()
+        for _ in range(200):
+            self.router.route("could you scrape 300 tweets about the federal reserve in spanish?")
+        self.assertLess((time.perf_counter() - started) / 200, 0.005)
@@ -1,9 +1,52 @@
+import asyncio
+import subprocess
+import sys
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
+import ChatScheduler
 import Main
+import ResponseCache
+
+
+class FakeLLM:
+    """Async client stand-in: streams each queued reply word by word."""
+
+    def __init__(self, *replies, delay=0.0):
+        self.replies = list(replies)
+        self.delay = delay
+        self.calls = []
+        self.chat = MagicMock()
+        self.chat.completions.create = self.create
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        text = self.replies.pop(0)
+        async def chunks():
+            for i, word in enumerate(text.split(" ")):
+                await asyncio.sleep(self.delay)
+                yield MagicMock(choices=[MagicMock(delta=MagicMock(content=word if i == 0 else " " + word))])
+        return chunks()
 
 class TestMainApp(unittest.TestCase):
 
+    def setUp(self):
+        cache = patch.object(Main, "_response_cache", ResponseCache.ResponseCache())  # in memory only
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def use_llm(self, llm):
+        scheduler = ChatScheduler.ChatScheduler(lambda: llm, timeout=5)
+        patcher = patch.object(Main, "_scheduler", scheduler)
+        patcher.start()
+        self.addCleanup(scheduler.close)
+        self.addCleanup(patcher.stop)
+
+    def ask(self, app, question):
+        reply = Main.ReplyStream()
+        app.submit_reply(question, reply).result()
+        return reply.text
+
     @patch("tkinter.Tk")
     def test_confirm_and_run_yes(self, mock_tk):
         app = Main.LexandChatApp(mock_tk)
@@ -34,16 +77,91 @@ class TestMainApp(unittest.TestCase):
         app.root.after.assert_called()
 
     @patch("tkinter.Tk")
-    def test_ask_lmstudio_response(self, mock_tk):
+    def test_submit_reply_response(self, mock_tk):
         app = Main.LexandChatApp(mock_tk)
-        app.append_bubble = MagicMock()
+        llm = FakeLLM("Test response")
+        self.use_llm(llm)
+
+        self.assertEqual(self.ask(app, "Hi"), "Test response")
+        self.assertTrue(llm.calls[0]["stream"])
+
+    @patch("tkinter.Tk")
+    def test_submit_reply_sends_history(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        llm = FakeLLM("Hi Chris", "Chris")
+        self.use_llm(llm)
+
+        self.ask(app, "My name is Chris")
+        self.ask(app, "What is my name?")
+        self.assertEqual(llm.calls[-1]["messages"], [
+            {"role": "system", "content": Main.SYSTEM_PROMPT},
+            {"role": "user", "content": "My name is Chris"},
+            {"role": "assistant", "content": "Hi Chris"},
+            {"role": "user", "content": "What is my name?"},
+        ])
+
+    @patch("tkinter.Tk")
+    def test_repeat_question_is_answered_from_cache(self, mock_tk):
+        llm = FakeLLM("RSI measures momentum.")
+        self.use_llm(llm)
+        for question in ("Explain RSI", "explain  rsi"):
+            app = Main.LexandChatApp(mock_tk)  # new chat, same prompt
+            self.assertEqual(self.ask(app, question), "RSI measures momentum.")
+        self.assertEqual(len(llm.calls), 1)
+
+    @patch("tkinter.Tk")
+    def test_repeat_question_in_one_chat_is_answered_from_cache(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        llm = FakeLLM("RSI measures momentum.", "Hi Chris", "Chris", "You are Chris.")
+        self.use_llm(llm)
+        replies = [self.ask(app, question) for question in
+                   ("Explain RSI", "My name is Chris", "What is my name?", "explain  rsi", "What is my name?")]
+        self.assertEqual(replies[3], "RSI measures momentum.")
+        self.assertEqual(replies[4], "You are Chris.")  # depends on the history, which has changed
+        self.assertEqual(len(llm.calls), 4)
+
+    @patch("tkinter.Tk")
+    def test_new_message_supersedes_running_reply(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        app.root = MagicMock()
+        self.use_llm(FakeLLM("one two three four five six", "Sure", delay=0.05))
+
+        first, second = Main.ReplyStream(), Main.ReplyStream()
+        app.submit_reply("Tell me a story", first, key="chat")
+        while not first.text:
+            threading.Event().wait(0.01)
+        app.submit_reply("Never mind, hi", second, key="chat").result()
+        self.assertTrue(first.done)
+        self.assertTrue(first.text.startswith("one"))
+        self.assertTrue(first.text.endswith("(Stopped)"))
+        self.assertEqual(second.text, "Sure")
+        # Only the completed exchange is remembered
+        self.assertEqual([turn.content for turn in app.conversation.turns], ["Never mind, hi", "Sure"])
+
+    @patch("tkinter.Tk")
+    def test_streamed_reply_renders_per_frame(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        label = MagicMock()
+        app.append_bubble = MagicMock(return_value=label)
+        app.root = MagicMock()
+        reply = Main.ReplyStream()
 
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Test response"))]
+        app.render_reply(reply)  # no token yet: no bubble, check again next frame
+        app.append_bubble.assert_not_called()
+        for token in ("Hel", "lo", " there"):
+            reply.add(token)
+        with patch("builtins.print") as log:
+            app.render_reply(reply)  # several tokens in one frame open the bubble once
+        app.append_bubble.assert_called_once_with("🤖", "Hello there", "left")
+        self.assertEqual(list(app.first_token_times), [reply.time_to_first_token])
+        self.assertTrue(log.call_args.args[0].startswith("Time to first token: "))
 
-        with patch.object(Main.client.chat.completions, 'create', return_value=mock_response):
-            app.ask_lmstudio("Hi")
-            app.append_bubble.assert_called_with("🤖", "Test response", "left")
+        reply.add("!")
+        reply.done = True
+        app.root.after.reset_mock()
+        app.render_reply(reply)
+        label.config.assert_called_once_with(text="Hello there!")
+        app.root.after.assert_not_called()  # finished and fully drawn
 
     @patch("tkinter.Tk")
     def test_run_scraper_gui_cancelled(self, mock_tk):
@@ -53,4 +171,50 @@ class TestMainApp(unittest.TestCase):
             app.run_scraper_gui()
             app.append_bubble.assert_called()
 
+    @patch("tkinter.Tk")
+    def test_send_message_routes_with_slots(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        app.user_input = MagicMock()
+        app.user_input.get.return_value = "scrape 200 tweets about gold in english"
+        app.append_bubble = MagicMock()
+        app.root = MagicMock()
+        app.run_scraper_gui = MagicMock()
+        with patch("tkinter.messagebox.askyesno", return_value=True) as confirm:
+            app.send_message()
+        self.assertEqual(confirm.call_args.args[1], "Do you want to run the Twitter Scraper (gold, 200, en)?")
+        app.root.after.call_args.args[1]()  # the scheduled tool
+        app.run_scraper_gui.assert_called_once_with("gold", 200, "en")
+
+    @patch("tkinter.Tk")
+    def test_run_scraper_gui_skips_dialogs_for_slots(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        app.append_bubble = MagicMock()
+        with patch("tkinter.simpledialog.askstring") as askstring, patch("tkinter.simpledialog.askinteger") as askinteger, \
+                patch("threading.Thread") as thread:
+            app.run_scraper_gui("gold", 200, "en")
+        askstring.assert_not_called()
+        askinteger.assert_not_called()
+        thread.return_value.start.assert_called_once()
+
+    @patch("tkinter.Tk")
+    def test_sentiment_service_starts_with_first_scrape(self, mock_tk):
+        app = Main.LexandChatApp(mock_tk)
+        app.append_bubble = MagicMock()
+        self.use_llm(FakeLLM())
+        with patch("SentimentServer.SentimentService") as service, patch.object(Main, "_sentiment_started", False), \
+                patch("Scrapper.sentiment_service", None), patch("Scrapper.run_scraper_interactive") as scrape, \
+                patch("threading.Thread") as thread:
+            app.warm_up()
+            service.assert_not_called()
+            for _ in range(2):
+                app.run_scraper_gui("gold", 10, "en")
+                thread.call_args.kwargs["target"]()
+        service.assert_called_once()
+        self.assertEqual(scrape.call_count, 2)
+
+    def test_import_skips_heavy_packages(self):
+        code = "import sys, Main; print(sorted(m for m in ('openai', 'torch', 'transformers') if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
 # python -m unittest discover -s tests -v
@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+import pandas as pd
+import MarketData
+from MarketData import ReplayProvider
+
+START = 1_700_000_040  # minute aligned
+
+def make_ticks(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    bid = 2000 + np.cumsum(rng.normal(0, 0.2, n))
+    return pd.DataFrame({'time_msc': START * 1000 + 1_000 * np.arange(n), 'bid': bid, 'ask': bid + 0.3})
+
+class TestReplayProvider(unittest.TestCase):
+
+    def test_timeframe_seconds(self):
+        self.assertEqual(MarketData.timeframe_seconds(MarketData.TIMEFRAME_M1), 60)
+        self.assertEqual(MarketData.timeframe_seconds(MarketData.TIMEFRAME_H4), 4 * 3600)
+        self.assertEqual(MarketData.timeframe_seconds(MarketData.TIMEFRAME_D1), 24 * 3600)
+
+    def test_step_mode_advances_one_tick_per_poll(self):
+        ticks = make_ticks()
+        market = ReplayProvider({"XAUUSD": ticks})
+        first = market.symbol_info_tick("XAUUSD")
+        second = market.symbol_info_tick("XAUUSD")
+        self.assertEqual(first.time_msc, ticks['time_msc'][0])
+        self.assertEqual(second.time_msc, ticks['time_msc'][1])
+        self.assertAlmostEqual(second.ask, ticks['ask'][1])
+
+    def test_step_mode_delivers_every_tick_of_each_symbol(self):
+        gold = make_ticks(50)
+        silver = make_ticks(150, seed=1)
+        silver['time_msc'] = START * 1000 + 300 + 300 * np.arange(150)  # three ticks per gold tick
+        market = ReplayProvider({"XAUUSD": gold, "XAGUSD": silver})
+        seen = {"XAUUSD": [], "XAGUSD": []}
+        subscriptions = [MarketData.TickSubscription(market, symbol) for symbol in seen]
+        for subscription in subscriptions:
+            subscription.add_listener(lambda tick, symbol=subscription.symbol: seen[symbol].append(tick.time_msc))
+        while not market.finished:
+            for subscription in subscriptions:
+                subscription.poll()
+        for subscription in subscriptions:
+            subscription.poll()
+        self.assertEqual(seen["XAUUSD"], gold['time_msc'].tolist())
+        self.assertEqual(seen["XAGUSD"], silver['time_msc'].tolist())
+
+    def test_rates_match_ticks_up_to_clock(self):
+        ticks = make_ticks()
+        market = ReplayProvider({"XAUUSD": ticks}, start=pd.to_datetime(START + 150, unit='s'))
+        rates = market.copy_rates_from_pos("XAUUSD", MarketData.TIMEFRAME_M1, 0, 10)
+        self.assertEqual(len(rates), 3)
+        self.assertEqual(rates['time'][-1], START + 120)
+
+        seen = ticks[ticks['time_msc'] <= (START + 150) * 1000]
+        forming = seen[seen['time_msc'] >= (START + 120) * 1000]['bid']
+        self.assertAlmostEqual(rates['high'][-1], forming.max())
+        self.assertAlmostEqual(rates['low'][-1], forming.min())
+        self.assertAlmostEqual(rates['close'][-1], forming.iloc[-1])
+        self.assertEqual(rates['tick_volume'][-1], len(forming))
+
+        closed = market.copy_rates_from_pos("XAUUSD", MarketData.TIMEFRAME_M1, 1, 1)
+        self.assertEqual(closed['time'][0], START + 60)
+        self.assertEqual(closed['tick_volume'][0], 60)
+
+    def test_unknown_symbol(self):
+        market = ReplayProvider({"XAUUSD": make_ticks()})
+        self.assertIsNone(market.symbol_info_tick("EURUSD"))
+        self.assertEqual(market.last_error()[0], -1)
+
+
+class TestTickSubscription(unittest.TestCase):
+
+    def test_listeners_only_see_new_ticks(self):
+        ticks = [MarketData.Tick(START, 2000.0, 2000.3, 0, 0, START * 1000, 0, 0),
+                 MarketData.Tick(START, 2000.0, 2000.3, 0, 0, START * 1000, 0, 0),
+                 MarketData.Tick(START, 2000.1, 2000.4, 0, 0, START * 1000 + 250, 0, 0)]
+
+        class StubMarket(MarketData.MarketDataProvider):
+            def symbol_info_tick(self, symbol):
+                return ticks.pop(0)
+
+        seen = []
+        subscription = MarketData.TickSubscription(StubMarket(), "XAUUSD")
+        subscription.add_listener(seen.append)
+        for _ in range(3):
+            subscription.poll()
+        self.assertEqual([tick.time_msc for tick in seen], [START * 1000, START * 1000 + 250])
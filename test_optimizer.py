@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+import Backtest
+import Optimizer
+from test_backtest import make_bars
+
+
+class TestOptimizer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.arrays = Backtest.prepare_arrays(make_bars(3000))
+        cls.configs = Optimizer.random_params(Optimizer.DEFAULT_SPACE, 12, seed=3) + [{}]
+
+    def test_pool_matches_in_process_and_backtest(self):
+        pooled = Optimizer.sweep(self.arrays, self.configs, workers=2, min_trades=0)
+        local = Optimizer.sweep(self.arrays, self.configs, workers=0, min_trades=0)
+        pd.testing.assert_frame_equal(pooled, local)
+        self.assertTrue((np.diff(local['net_profit']) <= 0).all())
+
+        _, _, stats = Backtest.run_backtest(make_bars(3000), params=self.configs[0])
+        row = local[local['config'] == 0].iloc[0]
+        self.assertAlmostEqual(row['net_profit'], stats['net_profit'])
+        self.assertEqual(row['trades'], stats['trades'])
+
+    def test_walk_forward_splits(self):
+        splits = Optimizer.walk_forward_splits(100, 50, 20)
+        self.assertEqual(splits, [((0, 50), (50, 70)), ((20, 70), (70, 90))])
+        self.assertEqual(Optimizer.walk_forward_splits(60, 50, 20), [])
+
+    def test_walk_forward_picks_best_in_sample(self):
+        folds, ranking = Optimizer.walk_forward(self.arrays, self.configs, 1000, 500, workers=0, min_trades=0)
+        self.assertEqual(len(folds), len(Optimizer.walk_forward_splits(len(self.arrays['close']), 1000, 500)))
+        for _, fold in folds.iterrows():
+            train = Optimizer.walk_forward_splits(len(self.arrays['close']), 1000, 500)[fold['fold']][0]
+            best = max(Optimizer.evaluate(self.arrays, config, [train])[0]['net_profit'] for config in self.configs)
+            self.assertAlmostEqual(fold['train_net_profit'], best)
+        self.assertEqual(sorted(ranking['config']), list(range(len(self.configs))))
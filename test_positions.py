@@ -0,0 +1,33 @@
+import unittest
+from Positions import PositionBook
+
+class TestPositionBook(unittest.TestCase):
+
+    def test_open_and_close_by_id(self):
+        book = PositionBook(capacity=2)
+        first = book.open('BUY', 100, 95, 110, 2)
+        second = book.open('SELL', 100, 105, 90, 2)
+        third = book.open('BUY', 101, 96, 111, 2)
+        self.assertEqual(len(book), 3)
+        self.assertEqual(book.close(first)['entry_price'], 100)
+        self.assertNotIn(first, book)
+        self.assertEqual(book.get(third)['entry_price'], 101)
+        self.assertEqual(book.latest()['id'], third)
+        self.assertEqual(book.get(second)['type'], 'SELL')
+
+    def test_hits_checks_all_positions(self):
+        book = PositionBook()
+        long_tp = book.open('BUY', 100, 95, 105, 1)
+        long_open = book.open('BUY', 100, 90, 120, 1)
+        short_sl = book.open('SELL', 100, 104, 90, 1)
+        short_open = book.open('SELL', 110, 120, 100, 1)
+        hit = book.hits(bid=104.8, ask=105.0)
+        self.assertEqual(sorted(hit.tolist()), [long_tp, short_sl])
+        self.assertNotIn(long_open, hit)
+        self.assertNotIn(short_open, hit)
+
+    def test_unrealized_pnl(self):
+        book = PositionBook()
+        book.open('BUY', 100, 95, 110, 2)
+        book.open('SELL', 100, 105, 90, 1)
+        self.assertAlmostEqual(book.unrealized_pnl(bid=101, ask=102), (102 - 100) * 2 + (100 - 101) * 1)
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_key_ignores_case_and_spacing_but_not_context(self):
+        key = ResponseCache.cache_key("qwen", [{"role": "user", "content": "Explain RSI"}])
+        self.assertEqual(key, ResponseCache.cache_key("qwen", [{"role": "user", "content": " explain   rsi "}]))
+        self.assertNotEqual(key, ResponseCache.cache_key("llama", [{"role": "user", "content": "Explain RSI"}]))
+        self.assertNotEqual(key, ResponseCache.cache_key("qwen", [{"role": "system", "content": "Be brief"},
+                                                                  {"role": "user", "content": "Explain RSI"}]))
+        self.assertNotEqual(key, ResponseCache.cache_key("qwen", [{"role": "user", "content": "Explain RSI"}],
+                                                         temperature=0.2))
+
+    def test_standalone_questions(self):
+        for question in ("Explain RSI", "what is a moving average?", "Explain stop loss and take profit"):
+            self.assertTrue(ResponseCache.is_standalone(question), question)
+        for question in ("What is my name?", "Explain that again", "why?", "Can you say more"):
+            self.assertFalse(ResponseCache.is_standalone(question), question)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ResponseCache.ResponseCache(max_entries=2, ttl=60)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")  # b is now the least recently used
+        cache.put("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("A", "C"))
+        with patch("time.time", return_value=ResponseCache.time.time() + 61):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 1)
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache", "responses.json")
+            cache = ResponseCache.ResponseCache(path, ttl=60)
+            cache.put("a", "A")
+            cache.put("b", "B")
+            self.assertEqual(ResponseCache.ResponseCache(path, ttl=60).get("b"), "B")
+            with patch("time.time", return_value=ResponseCache.time.time() + 61):
+                self.assertEqual(len(ResponseCache.ResponseCache(path, ttl=60)), 0)  # expired on load
+            self.assertEqual(len(ResponseCache.ResponseCache(path, max_entries=1)), 1)
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from MarketData import ReplayProvider, TIMEFRAME_M1, TIMEFRAME_M5
+from Scheduler import TradingScheduler
+
+START = 1_700_000_100  # five-minute aligned
+
+def make_ticks(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    bid = 2000 + np.cumsum(rng.normal(0, 0.2, n))
+    return pd.DataFrame({'time_msc': START * 1000 + 5_000 * np.arange(n), 'bid': bid, 'ask': bid + 0.3})
+
+class TestTradingScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.market = ReplayProvider({"XAUUSD": make_ticks(seed=0), "XAGUSD": make_ticks(seed=1)},
+                                     start=pd.to_datetime(START + 200 * 60, unit='s'))
+        self.scheduler = TradingScheduler(self.market, [("XAUUSD", TIMEFRAME_M1), ("XAGUSD", TIMEFRAME_M1),
+                                                        ("XAUUSD", TIMEFRAME_M5)], max_workers=2, batch_size=2)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def wait_for_workers(self):
+        for strategy in self.scheduler.strategies.values():
+            if strategy.future is not None:
+                strategy.future.result()
+
+    def test_first_run_dispatches_every_strategy(self):
+        self.assertEqual(self.scheduler.run_once(), 3)
+        self.wait_for_workers()
+        for (symbol, timeframe), strategy in self.scheduler.strategies.items():
+            self.assertIsNotNone(strategy.bot.indicators.last_time)
+            self.assertEqual(strategy.next_close, strategy.bot.indicators.last_time + strategy.bar_seconds)
+
+    def test_only_closed_bars_are_dispatched(self):
+        self.scheduler.run_once()
+        self.wait_for_workers()
+        self.assertEqual(self.scheduler.run_once(), 0)
+
+        # Step the replay past the next M1 close but not the M5 one
+        while self.market.clock_msc < (START + 201 * 60) * 1000:
+            self.market.symbol_info_tick("XAUUSD")
+        self.assertEqual(self.scheduler.run_once(), 2)
+        self.wait_for_workers()
+        m1 = self.scheduler.strategies[("XAUUSD", TIMEFRAME_M1)]
+        self.assertEqual(m1.bot.indicators.last_time, START + 201 * 60)
+
+    def test_forming_bar_is_not_analysed(self):
+        strategy = self.scheduler.strategies[("XAUUSD", TIMEFRAME_M1)]
+        with patch.object(strategy.bot, "process_market_data") as process:
+            strategy.on_rates(strategy.bot.fetch_rates())
+        df = process.call_args[0][0]
+        forming = pd.to_datetime(strategy.bot.indicators.last_time, unit='s')
+        self.assertEqual(df['time'].iloc[-1], forming - pd.Timedelta(minutes=1))
@@ -1,6 +1,13 @@
+import importlib.util
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
+import Browser
 import Scrapper
+import TweetStore
 
 class TestScrapper(unittest.TestCase):
 
@@ -20,3 +27,157 @@ class TestScrapper(unittest.TestCase):
     def test_analyze_sentiment_empty(self):
         result = Scrapper.analyze_sentiment([])
         self.assertEqual(result, "❌ No tweets found.")
+
+    def test_classify_tweets_scores_duplicates_once(self):
+        Scrapper._sentiment_cache.clear()
+        tweets = ["Gold is great", "RT @trader: Gold is great", "gold  is GREAT", "Gold is awful"]
+        with patch("Scrapper._predict", side_effect=lambda texts, backend=None, encoded=None: ["5 stars" if "great" in t else "1 star" for t in texts]) as predict:
+            self.assertEqual(Scrapper.classify_tweets(tweets), ["Positive", "Positive", "Positive", "Negative"])
+            Scrapper.classify_tweets(tweets)
+        self.assertEqual(sum(len(call.args[0]) for call in predict.call_args_list), 2)
+
+    def test_analyze_sentiment_counts_every_tweet(self):
+        tweets = [f"tweet {i}" for i in range(10)]
+        with patch("Scrapper.classify_tweets", return_value=["Positive"] * 8 + ["Negative"] * 2):
+            summary = Scrapper.analyze_sentiment(tweets)
+        self.assertIn("Positive: 80.0%", summary)
+        self.assertIn("Negative: 20.0%", summary)
+
+    def test_classifier_loads_once_across_threads(self):
+        def slow_pipeline(*args, **kwargs):
+            time.sleep(0.1)
+            return MagicMock()
+        with patch.object(Scrapper, "_classifier", None), patch("transformers.pipeline", side_effect=slow_pipeline) as pipeline:
+            threads = [threading.Thread(target=Scrapper.get_classifier) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pipeline.assert_called_once()
+
+    @unittest.skipUnless(importlib.util.find_spec("onnxruntime"), "onnxruntime not installed")
+    def test_backends_match_reference(self):
+        tweets = ["I love gold", "This is terrible", "It's okay I guess", "Best trade ever!", "Awful, sold everything"]
+        with tempfile.TemporaryDirectory() as folder, patch.object(Scrapper, "_backends", {}), \
+                patch.object(Scrapper, "ONNX_PATH", os.path.join(folder, "sentiment.onnx")):
+            report = Scrapper.compare_backends(tweets)
+        self.assertEqual(set(report), {"pipeline", "int8", "onnx"})
+        for backend in ("int8", "onnx"):
+            self.assertGreaterEqual(report[backend]["sentiment_agreement"], 0.8)
+
+    def test_search_tweets_streams_new_tweets_once(self):
+        class FeedDriver:
+            # Each scroll reveals the next page; the last page repeats a tweet already seen
+            pages = [[("1", "first", None), ("2", "second", None)], [("2", "second", None), ("3", "third", None)]]
+            def __init__(self):
+                self.loaded, self.extracted = 1, 0
+            def get(self, url):
+                self.url = url
+            def execute_script(self, script):
+                if script == Scrapper._NEW_ARTICLES_JS:
+                    return self.extracted < self.loaded
+                if script == Scrapper._EXTRACT_NEW_JS:
+                    new = [tweet for page in self.pages[self.extracted:self.loaded] for tweet in page]
+                    self.extracted = self.loaded
+                    return new
+                self.loaded = min(self.loaded + 1, len(self.pages))  # scroll
+
+        driver = FeedDriver()
+        tweets = Scrapper.search_tweets(driver, "gold price", num_tweets=10, min_wait=0.05, max_wait=0.2)
+        self.assertEqual(next(tweets).text, "first")
+        self.assertEqual(driver.loaded, 1)  # yielded before scrolling
+        self.assertEqual([tweet.id for tweet in tweets], ["2", "3"])
+        self.assertIn("q=gold%20price", driver.url)
+
+    def test_pipeline_reports_running_totals(self):
+        tweets = (Scrapper.Tweet(str(i), f"tweet {i}", None) for i in range(100))
+        messages = []
+        fake = lambda texts, backend=None: ["Positive" if int(t.split()[1]) % 4 else "Negative" for t in texts]
+        with patch("Scrapper._classify", side_effect=fake):
+            summary = Scrapper.run_sentiment_pipeline(tweets, messages.append, batch_size=16, report_every=0)
+        self.assertIn("Positive: 75.0%", summary)
+        self.assertIn("Negative: 25.0%", summary)
+        self.assertEqual(sum(m.startswith("📝") for m in messages), 5)
+        self.assertTrue(any(m.startswith("📊 100 tweets so far") for m in messages))
+
+    def test_pipeline_applies_backpressure(self):
+        produced = []
+        def tweets():
+            for i in range(1000):
+                produced.append(i)
+                yield f"tweet {i}"
+        release = threading.Event()
+        def slow_classify(texts, backend=None):
+            release.wait(5)
+            return ["Neutral"] * len(texts)
+        with patch("Scrapper._classify", side_effect=slow_classify):
+            worker = threading.Thread(target=Scrapper.run_sentiment_pipeline, args=(tweets(),),
+                                      kwargs={"batch_size": 8, "queue_size": 10})
+            worker.start()
+            time.sleep(0.3)
+            self.assertLessEqual(len(produced), 8 + 10 + 1)  # one batch in the model, one full queue
+            release.set()
+            worker.join()
+        self.assertEqual(len(produced), 1000)
+
+    def test_scrape_keywords_runs_queries_concurrently(self):
+        class Driver:
+            current_url = "https://twitter.com/home"
+            def quit(self):
+                pass
+        pool = Browser.DriverPool(Driver, lambda driver: None, lambda driver: True, "https://twitter.com/home", size=3)
+        running, peak = [0], [0]
+        lock = threading.Lock()
+        limiters = []
+        def fake_search(driver, keyword, num_tweets, lang, rate_limiter=None, **kwargs):
+            limiters.append(rate_limiter)
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.2)
+            with lock:
+                running[0] -= 1
+            for i in range(4):
+                yield Scrapper.Tweet(f"{keyword}{i}", f"{keyword} {i}", None)
+        fake = lambda texts, backend=None, hashes=None: ["Positive" if t.startswith("gold") else "Negative" for t in texts]
+        queries = [("gold", "en"), ("silver", "en"), ("oil", "de"), ("gold", "en")]
+        messages = []
+        with patch("Scrapper.get_driver_pool", return_value=pool), patch("Scrapper.search_tweets", side_effect=fake_search), \
+                patch("Scrapper._classify", side_effect=fake), \
+                patch("Scrapper.get_tweet_store", return_value=TweetStore.TweetStore(":memory:")):
+            results = Scrapper.scrape_keywords(queries, 4, messages.append)
+        pool.close()
+        self.assertEqual(peak[0], 3)  # all three queries were scraping at once
+        self.assertEqual(limiters, [Scrapper.rate_limiter] * 3)  # sharing one request budget
+        self.assertEqual(list(results), [("gold", "en"), ("silver", "en"), ("oil", "de")])
+        self.assertEqual(len(messages), 3)
+        report = Scrapper.format_keyword_report(results)
+        self.assertIn("gold (en): 4 tweets | Positive 100.0%", report)
+        self.assertIn("oil (de): 4 tweets | Positive 0.0% | Neutral 0.0% | Negative 100.0%", report)
+
+    def test_repeat_search_scrapes_only_new_tweets(self):
+        class FeedDriver:
+            def __init__(self, feed):
+                self.feed, self.done = feed, False
+            def get(self, url):
+                pass
+            def execute_script(self, script):
+                if script == Scrapper._NEW_ARTICLES_JS:
+                    return not self.done
+                if script == Scrapper._EXTRACT_NEW_JS:
+                    self.done = True
+                    return self.feed
+        feed = lambda ids: [(str(i), f"tweet {i}", f"2024-05-01T10:{i:02d}:00Z") for i in ids]
+        store = TweetStore.TweetStore(":memory:")
+        classified = []
+        def fake(texts, backend=None, hashes=None):
+            classified.extend(texts)
+            return ["Positive"] * len(texts)
+        with patch("Scrapper._classify", side_effect=fake):
+            Scrapper.scrape_incremental(FeedDriver(feed(range(10, 0, -1))), "gold", 10, "en", store=store)
+            # Two new tweets on top, then the ones already stored
+            counts, total = Scrapper.scrape_incremental(FeedDriver(feed(range(12, 0, -1))), "gold", 10, "en",
+                                                        store=store)
+        self.assertEqual(len(classified), 12)
+        self.assertEqual((counts["positive"], total), (10, 10))
+        self.assertEqual(len(store.known_ids("gold", "en")), 12)
@@ -0,0 +1,41 @@
+import queue
+import threading
+import unittest
+import Scrapper
+import SentimentServer
+
+
+class TestSentimentServer(unittest.TestCase):
+
+    def test_collect_batch_merges_waiting_requests(self):
+        requests = queue.Queue()
+        for i in range(5):
+            requests.put((None, i, ["text"] * 10))
+        batch = SentimentServer.collect_batch(requests, max_batch=30, max_wait=0.05)
+        self.assertEqual([request_id for _, request_id, _ in batch], [0, 1, 2])
+        self.assertEqual(requests.qsize(), 2)
+
+    def test_collect_batch_stops_after_max_wait(self):
+        requests = queue.Queue()
+        requests.put((None, 0, ["text"]))
+        batch = SentimentServer.collect_batch(requests, max_batch=64, max_wait=0.01)
+        self.assertEqual(len(batch), 1)
+
+    def test_concurrent_clients_match_local_model(self):
+        tweets = [["I love gold", "This is terrible"], ["It's okay"], ["Best trade ever!", "I love gold"]] * 3
+        service = SentimentServer.SentimentService()
+        try:
+            results = [None] * len(tweets)
+            def run(i):
+                results[i] = service.classify(tweets[i], timeout=60)
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(len(tweets))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            other = service.connect()
+            self.assertEqual(other.classify(["It's okay"], timeout=60), Scrapper.classify_tweets(["It's okay"]))
+            other.close()
+        finally:
+            service.close()
+        self.assertEqual(results, [Scrapper.classify_tweets(texts) for texts in tweets])
@@ -1,15 +1,24 @@
 import unittest
-from unittest.mock import patch
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+import numpy as np
+import Indicators
 import Trading
 import pandas as pd
+from MarketData import ReplayProvider, Tick
+
+START = 1_700_000_040  # minute aligned
+
+def make_ticks(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    bid = 2000 + np.cumsum(rng.normal(0, 0.2, n))
+    return pd.DataFrame({'time_msc': START * 1000 + 5_000 * np.arange(n), 'bid': bid, 'ask': bid + 0.3})
 
 class TestTradingBot(unittest.TestCase):
     def setUp(self):
-        self.bot = Trading.GoldTradingBot(demo_account=False)
-        self.bot.connect_mt5 = lambda: None
-        self.bot.launch_mt5 = lambda: None
-        self.bot.setup_gui = lambda: None
-        self.bot.ensure_chart_open = lambda: None
+        # Start 200 bars into the recording so the indicators have history
+        self.market = ReplayProvider({"XAUUSD": make_ticks()}, start=pd.to_datetime(START + 200 * 60, unit='s'))
+        self.bot = Trading.GoldTradingBot(demo_account=False, market=self.market, gui=False)
 
     def test_analyze_signal_buy(self):
         df = pd.DataFrame([
@@ -30,6 +39,53 @@ class TestTradingBot(unittest.TestCase):
 
 
     def test_check_open_positions(self):
-        self.bot.simulated_positions = [{'type': 'BUY', 'entry_price': 100}]
+        self.bot.positions.open('BUY', 100, 95, 110, 2)
         pos = self.bot.check_open_positions()
         self.assertEqual(pos['type'], 'BUY')
+        self.assertEqual(pos['entry_price'], 100)
+
+    def test_replay_market_data(self):
+        df = self.bot.get_market_data()
+        self.assertIsNotNone(df)
+        self.assertEqual(df['time'].iloc[-1], pd.to_datetime(START + 200 * 60, unit='s'))
+        # One poll for the current tick, then 12 ticks of 5 seconds into the next bar
+        for _ in range(13):
+            self.market.symbol_info_tick("XAUUSD")
+        df = self.bot.get_market_data()
+        self.assertEqual(df['time'].iloc[-1], pd.to_datetime(START + 201 * 60, unit='s'))
+
+    def test_on_tick_closes_position_at_take_profit(self):
+        position_id = self.bot.execute_simulated_trade('BUY', 100, 95, 110)
+        self.bot.signals_by_position[position_id] = self.bot.signal_history.append(
+            datetime.now(), signal='BUY', price=100, position_id=position_id)
+        self.bot.in_position = True
+        tick = Tick(START, 110.5, 110.6, 0, 0, START * 1000, 0, 0)
+        self.bot.bar_time = tick.time // self.bot.bar_seconds * self.bot.bar_seconds
+        self.bot.on_tick(tick)
+        self.assertFalse(self.bot.in_position)
+        self.assertEqual(self.bot.win_count, 1)
+        self.assertEqual(self.bot.signal_history.tail(1)[0]['result'], 'win')
+
+    def test_display_publishes_latest_snapshot_only(self):
+        self.bot.root, self.bot.stats_text, self.bot.chart = MagicMock(), MagicMock(), MagicMock()
+        df = self.bot.get_market_data()
+        self.bot.display_stats(df.iloc[:-1])
+        self.bot.display_stats(df)
+        self.bot.chart.update.assert_not_called()  # nothing is drawn on the bot thread
+
+        self.bot.render_snapshots()
+        self.bot.render_snapshots()
+        self.bot.chart.update.assert_called_once()
+        pd.testing.assert_frame_equal(self.bot.chart.update.call_args[0][0], df)
+
+    def test_published_frame_is_not_changed_by_later_bars(self):
+        self.bot.root, self.bot.stats_text, self.bot.chart = MagicMock(), MagicMock(), MagicMock()
+        self.bot.indicators = Indicators.IndicatorEngine(window=50)  # buffers wrap after 50 bars
+        df = self.bot.get_market_data()
+        self.bot.display_stats(df)
+        published = df.copy()
+        for _ in range(60 * 12):  # 60 more bars of 5 second ticks
+            self.market.symbol_info_tick("XAUUSD")
+            self.bot.get_market_data()
+        self.bot.render_snapshots()
+        pd.testing.assert_frame_equal(self.bot.chart.update.call_args[0][0], published)
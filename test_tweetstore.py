@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+import TweetStore
+
+
+class TestTweetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = TweetStore.TweetStore(os.path.join(self.folder.name, "tweets.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_tweets_are_keyed_by_id_per_search(self):
+        self.store.add("gold", "en", [("1", "2024-05-01T10:00:00.000Z", "h1"), ("2", None, "h2")],
+                       ["Positive", "Negative"])
+        self.store.add("xauusd", "en", [("1", "2024-05-01T10:00:00.000Z", "h1")], ["Negative"])
+        self.assertEqual(self.store.known_ids("gold", "en"), {"1", "2"})
+        self.assertEqual(self.store.known_ids("gold", "de"), set())
+        self.assertEqual(self.store.known_ids("xauusd", "en"), {"1"})
+        # The first label is kept
+        self.assertEqual(self.store.labels_for_hashes(["h1", "h3"]), {"h1": "Positive"})
+
+    def test_recent_is_newest_first(self):
+        self.store.add("gold", "en", [("1", "2024-05-01T10:00:00Z", "a"), ("2", "2024-05-03T10:00:00Z", "b"),
+                                      ("3", "2024-05-02T10:00:00Z", "c")], ["Positive", "Neutral", "Negative"])
+        self.assertEqual(self.store.recent("gold", "en", 2), [("2", "Neutral"), ("3", "Negative")])
+
+    def test_sentiment_over_time(self):
+        tweets = [("1", "2024-05-01T10:00:00.000Z", "a"), ("2", "2024-05-01T23:59:00.000Z", "b"),
+                  ("3", "2024-05-02T08:00:00.000Z", "c")]
+        self.store.add("gold", "en", tweets, ["Positive", "Negative", "Positive"])
+        self.store.add("gold", "de", [("1", "2024-05-01T10:00:00.000Z", "a")], ["Positive"])
+        self.assertEqual(self.store.sentiment_over_time("gold"),
+                         [("2024-05-01", 1, 0, 1), ("2024-05-02", 1, 0, 0)])
+        self.assertEqual(self.store.sentiment_over_time("gold", "de", period="month"), [("2024-05", 1, 0, 0)])
+        self.assertEqual(self.store.sentiment_over_time("silver"), [])